@@ -1,11 +1,399 @@
+import re
+import heapq
+import functools
+import threading
+import numpy as np
 import pandas as pd
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
 from difflib import get_close_matches
+from scimago_data import category_mask, normalize_issn, normalize_title
+
+# Colunas de título aceitas (importação do Scholar / saída do conversor)
+TITLE_COLUMNS = ['TITULO-DO-ARTIGO', 'TITULO']
+
+_TERMOS_CONSULTA = re.compile(r'"([^"]*)"|(\S+)')
+_PREFIXO_DOI = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+
+def doi_key(doi):
+    """Chave de um DOI: sem o prefixo https://doi.org/ (ou doi:) e em minúsculas (None se vazio)"""
+    if not isinstance(doi, str):
+        return None
+    return _PREFIXO_DOI.sub('', doi.strip()).strip().lower() or None
+
+def key_index(chaves, inicio=0):
+    """Mapeia cada chave (ignorando None) para o vetor de posições em que aparece"""
+    chaves = pd.Series(chaves, dtype=object).reset_index(drop=True).dropna()
+    posicoes = chaves.index.to_numpy() + inicio
+    return {chave: posicoes[idx] for chave, idx in chaves.groupby(chaves, sort=False).indices.items()}
+
+def add_keys(index, chaves, inicio):
+    """Acrescenta ao índice as chaves de linhas novas (posições a partir de inicio)"""
+    for chave, posicoes in key_index(chaves, inicio).items():
+        atuais = index.get(chave)
+        index[chave] = posicoes if atuais is None else np.concatenate([atuais, posicoes])
+
+def remove_keys(index, chaves, posicoes):
+    """Retira do índice as posições removidas (chaves são as das linhas removidas)"""
+    for chave in set(chaves.dropna()):
+        restantes = index[chave][~np.isin(index[chave], posicoes)]
+        if len(restantes):
+            index[chave] = restantes
+        else:
+            del index[chave]
+
+def append_array(buffer, usados, valores):
+    """Grava valores após as usados primeiras posições de buffer; retorna o buffer.
+
+    A capacidade dobra quando falta espaço, de modo que acrescentar poucas
+    linhas não copia o vetor inteiro a cada vez.
+    """
+    fim = usados + len(valores)
+    if fim > len(buffer):
+        novo = np.empty(max(fim, 2 * len(buffer)), dtype=buffer.dtype)
+        novo[:usados] = buffer[:usados]
+        buffer = novo
+    buffer[usados:fim] = valores
+    return buffer
+
+def year_mask(anos, ano):
+    """Máscara dos valores de ANO iguais a ano (ANO pode estar como número ou texto)"""
+    ano = str(ano).strip()
+    try:
+        return (pd.to_numeric(anos, errors='coerce').astype('float64') == float(ano)).to_numpy()
+    except ValueError:
+        return (anos.fillna('').astype(str).str.strip() == ano).to_numpy()
+
+def article_titles(df):
+    """Título de cada artigo, da primeira coluna de TITLE_COLUMNS preenchida"""
+    colunas = [col for col in TITLE_COLUMNS if col in df.columns]
+    if not colunas:
+        return pd.Series(None, index=df.index, dtype=object)
+    titulos = df[colunas[0]]
+    for col in colunas[1:]:
+        titulos = titulos.fillna(df[col])
+    return titulos
+
+class TitleIndex:
+    """Índice invertido de palavras dos títulos dos artigos.
+
+    Consultas: termos separados por espaço são combinados com E, trechos entre
+    aspas são buscados como frase e um termo terminado em * (ou o último termo
+    digitado) casa por prefixo. rank() ordena os resultados por BM25.
+    """
+    # Parâmetros do BM25
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, titles=()):
+        # Título normalizado entre espaços, para conferir frases por substring
+        self.texts = []
+        # Listas de posições em ordem crescente e a frequência do termo em cada título
+        self.postings = {}
+        self.frequencies = {}
+        self.vocabulary = []
+        # Tamanho (em palavras) de cada título; vetor com folga (ver append_array)
+        self._lengths = np.empty(0, dtype=np.int32)
+        self.doc_count = 0
+        self._total_tokens = 0
+        self.add(titles)
+
+    @property
+    def lengths(self):
+        return self._lengths[:len(self.texts)]
+
+    @property
+    def avg_length(self):
+        return self._total_tokens / self.doc_count if self.doc_count else 0.0
+
+    def add(self, titles):
+        """Indexa novos títulos nas posições seguintes às já existentes"""
+        inicio = len(self.texts)
+        novos = [f' {normalize_title(titulo)} ' for titulo in titles]
+        postings = defaultdict(list)
+        frequencias = defaultdict(list)
+        tamanhos = []
+        for pos, texto in enumerate(novos, inicio):
+            tokens = texto.split()
+            tamanhos.append(len(tokens))
+            for token, tf in Counter(tokens).items():
+                postings[token].append(pos)
+                frequencias[token].append(tf)
+        
+        # As novas posições são maiores que as existentes: as listas continuam ordenadas
+        novas_palavras = []
+        for token, lista in postings.items():
+            lista = np.array(lista, dtype=np.int64)
+            frequencia = np.array(frequencias[token], dtype=np.int32)
+            if token in self.postings:
+                self.postings[token] = np.concatenate([self.postings[token], lista])
+                self.frequencies[token] = np.concatenate([self.frequencies[token], frequencia])
+            else:
+                self.postings[token] = lista
+                self.frequencies[token] = frequencia
+                novas_palavras.append(token)
+        if len(novas_palavras) > len(self.vocabulary) // 64:
+            self.vocabulary = list(heapq.merge(self.vocabulary, sorted(novas_palavras)))
+        else:
+            # Poucas palavras novas (ex.: um currículo): inserção ordenada
+            for token in novas_palavras:
+                insort(self.vocabulary, token)
+        
+        self._lengths = append_array(self._lengths, inicio, np.array(tamanhos, dtype=np.int32))
+        self.texts.extend(novos)
+        self.doc_count += len(novos)
+        self._total_tokens += sum(tamanhos)
+
+    def remove(self, posicoes):
+        """Retira títulos do índice (as posições ficam vazias)"""
+        posicoes = np.asarray(posicoes, dtype=np.int64)
+        afetados = set()
+        for pos in posicoes.tolist():
+            afetados.update(self.texts[pos].split())
+            self.texts[pos] = ''
+        for token in afetados:
+            manter = ~np.isin(self.postings[token], posicoes)
+            if manter.any():
+                self.postings[token] = self.postings[token][manter]
+                self.frequencies[token] = self.frequencies[token][manter]
+            else:
+                del self.postings[token]
+                del self.frequencies[token]
+                del self.vocabulary[bisect_left(self.vocabulary, token)]
+        self.doc_count -= len(posicoes)
+        self._total_tokens -= int(self.lengths[posicoes].sum())
+        self.lengths[posicoes] = 0
+
+    def _expand(self, prefixo):
+        """Palavras do vocabulário iniciadas por prefixo"""
+        inicio = bisect_left(self.vocabulary, prefixo)
+        tokens = []
+        for token in self.vocabulary[inicio:]:
+            if not token.startswith(prefixo):
+                break
+            tokens.append(token)
+        return tokens
+
+    def _prefix(self, prefixo):
+        """Posições dos títulos com alguma palavra iniciada por prefixo"""
+        listas = [self.postings[token] for token in self._expand(prefixo)]
+        if not listas:
+            return np.empty(0, dtype=np.int64)
+        return listas[0] if len(listas) == 1 else np.unique(np.concatenate(listas))
+    
+    def _phrase(self, tokens, candidatos, prefixo):
+        """Filtra os candidatos que contêm os tokens em sequência"""
+        trecho = ' ' + ' '.join(tokens) + ('' if prefixo else ' ')
+        texts = self.texts
+        return np.array([pos for pos in candidatos.tolist() if trecho in texts[pos]], dtype=np.int64)
+
+    @staticmethod
+    def _parse(query):
+        """Separa a consulta em termos [tokens, prefixo, frase]"""
+        termos = []
+        for frase, palavra in _TERMOS_CONSULTA.findall(query):
+            texto = frase or palavra
+            prefixo = bool(palavra) and texto.endswith('*')
+            tokens = tuple(normalize_title(texto).split())
+            if tokens:
+                termos.append([tokens, prefixo, bool(frase)])
+        # O último termo digitado fora de aspas casa por prefixo
+        if termos and not termos[-1][2]:
+            termos[-1][1] = True
+        return termos
+    
+    def estimate(self, query):
+        """Limite superior barato do número de títulos que atendem a consulta (None se vazia)"""
+        termos = self._parse(query)
+        if not termos:
+            return None
+        estimativa = len(self.texts)
+        for tokens, prefixo, _ in termos:
+            for i, token in enumerate(tokens):
+                if prefixo and i == len(tokens) - 1:
+                    tamanho = sum(len(self.postings[t]) for t in self._expand(token))
+                else:
+                    tamanho = len(self.postings.get(token, ()))
+                estimativa = min(estimativa, tamanho)
+        return estimativa
+
+    def search(self, query, candidatos=None):
+        """Retorna as posições (ordenadas) dos títulos que atendem a consulta, ou None se ela for vazia.
+
+        candidatos (posições ordenadas) restringe a busca a um subconjunto.
+        """
+        termos = self._parse(query)
+        if not termos:
+            return None
+        
+        listas = [] if candidatos is None else [np.asarray(candidatos, dtype=np.int64)]
+        frases = []
+        for tokens, prefixo, _ in termos:
+            for i, token in enumerate(tokens):
+                if prefixo and i == len(tokens) - 1:
+                    listas.append(self._prefix(token))
+                else:
+                    listas.append(self.postings.get(token, np.empty(0, dtype=np.int64)))
+            if len(tokens) > 1:
+                frases.append((tokens, prefixo))
+        
+        # Interseção começando pela lista mais curta
+        listas.sort(key=len)
+        posicoes = listas[0]
+        for lista in listas[1:]:
+            if not len(posicoes):
+                break
+            posicoes = np.intersect1d(posicoes, lista, assume_unique=True)
+        for tokens, prefixo in frases:
+            posicoes = self._phrase(tokens, posicoes, prefixo)
+        return posicoes
+
+    def rank(self, query, k=None, posicoes=None):
+        """Retorna (posições, escores) dos k títulos mais relevantes (BM25), do maior para o menor.
+
+        Só os títulos que atendem a consulta (ou as posições já encontradas por
+        search) são pontuados; os k melhores saem de um heap, sem ordenar todo
+        o resultado.
+        """
+        if posicoes is None:
+            posicoes = self.search(query)
+        if posicoes is None:
+            return None, None
+        if not len(posicoes):
+            return posicoes, np.empty(0)
+        
+        # Termos pontuados (prefixos expandidos para as palavras do vocabulário)
+        pontuados = set()
+        for tokens, prefixo, _ in self._parse(query):
+            pontuados.update(tokens[:-1])
+            pontuados.update(self._expand(tokens[-1]) if prefixo else tokens[-1:])
+        
+        n_docs = self.doc_count
+        normalizacao = self.k1 * (1 - self.b + self.b * self.lengths[posicoes] / (self.avg_length or 1))
+        escores = np.zeros(len(posicoes))
+        for token in pontuados:
+            lista = self.postings.get(token)
+            if lista is None:
+                continue
+            idf = np.log(1 + (n_docs - len(lista) + 0.5) / (len(lista) + 0.5))
+            # Frequência do termo nos candidatos (0 quando ausente)
+            idx = np.searchsorted(lista, posicoes).clip(max=len(lista) - 1)
+            tf = np.where(lista[idx] == posicoes, self.frequencies[token][idx], 0)
+            escores += idf * tf * (self.k1 + 1) / (tf + normalizacao)
+        
+        k = len(posicoes) if k is None else min(k, len(posicoes))
+        melhores = heapq.nlargest(k, range(len(posicoes)), key=escores.__getitem__)
+        return posicoes[melhores], escores[melhores]
+
+class ResultSet:
+    """Resultado de uma busca: posições das linhas no DataFrame de origem.
+
+    Filtros e interseções trabalham só com os vetores de posições; as linhas
+    (apenas das colunas pedidas) são copiadas em to_frame().
+    """
+    def __init__(self, source, positions, columns=None, total=None, matches=None):
+        self.source = source
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.columns = columns
+        # Total de encontrados (pode ser maior que len quando há limite)
+        self.total = len(self.positions) if total is None else total
+        # Todas as posições encontradas, em ordem crescente (antes do ranking/limite)
+        self.matches = np.sort(self.positions) if matches is None else matches
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def empty(self):
+        return len(self.positions) == 0
+
+    def column(self, col):
+        """Valores de uma coluna nas linhas do resultado"""
+        return self.source[col].iloc[self.positions]
+
+    def where(self, mask):
+        """Mantém as linhas em que mask (alinhada ao resultado) é verdadeira"""
+        mask = np.asarray(mask, dtype=bool)
+        return ResultSet(self.source, self.positions[mask], self.columns)
+
+    def intersect(self, other):
+        """Linhas presentes nos dois resultados, na ordem deste"""
+        posicoes = other.positions if isinstance(other, ResultSet) else np.asarray(other)
+        return self.where(np.isin(self.positions, posicoes))
+
+    def to_frame(self, columns=None):
+        """Materializa as linhas do resultado (só as colunas pedidas)"""
+        columns = columns or self.columns
+        if columns:
+            columns = [col for col in columns if col in self.source.columns]
+            return self.source.iloc[self.positions, [self.source.columns.get_loc(col) for col in columns]]
+        return self.source.iloc[self.positions]
+
+def parse_range(texto):
+    """Converte 'min-max', 'min-', '-max' ou um valor único em (min, max).
+
+    Retorna None para texto vazio e levanta ValueError se não for numérico.
+    """
+    texto = str(texto or '').strip()
+    if not texto:
+        return None
+    partes = [parte.strip().replace(',', '.') for parte in texto.split('-', 1)]
+    try:
+        valores = [float(parte) if parte else None for parte in partes]
+    except ValueError:
+        raise ValueError(f"intervalo inválido: '{texto}'")
+    if len(valores) == 1:
+        return valores[0], valores[0]
+    if valores[0] is not None and valores[1] is not None and valores[0] > valores[1]:
+        raise ValueError(f"intervalo invertido: '{texto}'")
+    return valores[0], valores[1]
+
+# Colunas numéricas com índice ordenado para consultas por intervalo
+SORTED_COLUMNS = ['ANO', 'SCIMAGO_SJR', 'SCIMAGO_H_index']
+
+def _synchronized(metodo):
+    """Serializa o acesso ao ArticleSearch (buscas em segundo plano x atualizações)"""
+    @functools.wraps(metodo)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return metodo(self, *args, **kwargs)
+    return wrapper
 
 class ArticleSearch:
     def __init__(self, scimago_data):
         self.scimago_data = scimago_data
-        self.all_articles = None  # Armazenará todos os artigos concatenados
+        self.lock = threading.RLock()
+        # Incrementada a cada alteração dos artigos (invalida resultados guardados)
+        self.version = 0
+        self._articles = None  # Todos os artigos concatenados (ver all_articles)
+        # Artigos acrescentados depois da última consolidação, em ordem
+        self._pendentes = []
+        self._n_linhas = 0
+        # Linhas ativas; vetor com folga (ver append_array)
+        self._ativos_buffer = np.ones(0, dtype=bool)
+        self._inativos = 0
+        self.title_column = None
+        self.title_index = None
+        self.issn_index = {}
+        self.doi_index = {}
+        self._ordenados = {}
+
+    @property
+    def all_articles(self):
+        """DataFrame com todos os artigos (consolida os blocos acrescentados por add_curriculo)"""
+        with self.lock:
+            if self._pendentes:
+                blocos = ([self._articles] if self._articles is not None and len(self._articles) else [])
+                self._articles = pd.concat(blocos + self._pendentes, ignore_index=True)
+                self._pendentes = []
+            return self._articles
+
+    @property
+    def _ativos(self):
+        """Máscara das linhas ativas (as de currículos removidos ficam até a próxima reconstrução)"""
+        return self._ativos_buffer[:self._n_linhas]
 
+    @_synchronized
     def set_articles_data(self, curriculos_data):
         """Concatena todos os artigos de todos os docentes em um único DataFrame"""
         articles_list = []
@@ -17,12 +405,220 @@ class ArticleSearch:
                 articles_list.append(df)
         
         if articles_list:
-            self.all_articles = pd.concat(articles_list, ignore_index=True)
+            self._build(pd.concat(articles_list, ignore_index=True))
+        else:
+            self._build(pd.DataFrame())
+
+    def _build(self, all_articles):
+        """Reconstrói o DataFrame concatenado e todos os índices"""
+        self.version += 1
+        self._articles = all_articles.reset_index(drop=True)
+        self._pendentes = []
+        self._n_linhas = len(self._articles)
+        self._ativos_buffer = np.ones(self._n_linhas, dtype=bool)
+        self._inativos = 0
+        self._posicoes = {}
+        if 'CURRICULO_ID' in self.all_articles.columns:
+            self._posicoes = dict(self.all_articles.groupby('CURRICULO_ID', sort=False).indices)
+        
+        # Índice invertido dos títulos, construído uma vez por carga
+        self.title_column = next((col for col in TITLE_COLUMNS if col in self.all_articles.columns), None)
+        self.title_index = TitleIndex(article_titles(self.all_articles))
+        
+        # Índices ISSN/DOI normalizados -> posições (busca exata e duplicatas)
+        self.issn_index = key_index(self.all_articles['ISSN'].map(normalize_issn)) if 'ISSN' in self.all_articles.columns else {}
+        self.doi_index = key_index(self.all_articles['DOI'].map(doi_key)) if 'DOI' in self.all_articles.columns else {}
+        
+        # Índices ordenados por coluna numérica, construídos na primeira consulta
+        self._ordenados = {}
+
+    def _sorted_index(self, col):
+        """(valores ordenados, posições) de uma coluna numérica, sem os valores ausentes"""
+        if col not in self._ordenados:
+            valores = pd.to_numeric(self.all_articles[col], errors='coerce').astype('float64').to_numpy()
+            posicoes = np.flatnonzero(~np.isnan(valores))
+            ordem = posicoes[np.argsort(valores[posicoes], kind='stable')]
+            self._ordenados[col] = (valores[ordem], ordem, valores)
+        return self._ordenados[col]
+
+    def _range_bounds(self, col, intervalo):
+        """Fatia do índice ordenado de col que cai no intervalo (min, max)"""
+        ordenados = self._sorted_index(col)[0]
+        minimo, maximo = intervalo
+        inicio = 0 if minimo is None else np.searchsorted(ordenados, minimo, side='left')
+        fim = len(ordenados) if maximo is None else np.searchsorted(ordenados, maximo, side='right')
+        return inicio, max(inicio, fim)
+
+    @_synchronized
+    def query(self, title=None, issn=None, doi=None, anos=None, sjr=None, h_index=None,
+              categoria=None, curriculos=None, within=None, ranked=True, limit=None, columns=None):
+        """Consulta combinada sobre todos os artigos; retorna um ResultSet (ou None).
+
+        anos, sjr e h_index são intervalos (min, max) com extremos opcionais;
+        curriculos restringe a um subconjunto de CURRICULO_ID e within a
+        posições já conhecidas (ex.: ResultSet.matches de uma consulta mais
+        ampla). Os predicados com índice são ordenados pela seletividade
+        estimada: o mais seletivo gera os candidatos e os demais são
+        avaliados de uma vez sobre eles.
+        """
+        if self.all_articles is None or self.all_articles.empty:
+            return None
+        
+        # Predicados com índice: (estimativa, nome, gerar posições, filtrar candidatos)
+        predicados = []
+        texto = str(title).strip() if title else ''
+        estimativa = self.title_index.estimate(texto) if texto else None
+        if estimativa is not None:
+            predicados.append((
+                estimativa, 'title',
+                lambda: self.title_index.search(texto),
+                lambda candidatos: self.title_index.search(texto, candidatos)
+            ))
+        for index, valor, normalizar in [(self.issn_index, issn, normalize_issn),
+                                         (self.doi_index, doi, doi_key)]:
+            if valor:
+                # Valor inválido (ex.: ISSN com dígito verificador errado) não casa com nada
+                chave = normalizar(valor)
+                posicoes_chave = np.sort(index.get(chave, np.empty(0, dtype=np.int64)))
+                predicados.append((
+                    len(posicoes_chave), 'chave',
+                    lambda p=posicoes_chave: p,
+                    lambda candidatos, p=posicoes_chave: candidatos[np.isin(candidatos, p)]
+                ))
+        for col, intervalo in [('ANO', anos), ('SCIMAGO_SJR', sjr), ('SCIMAGO_H_index', h_index)]:
+            if intervalo is None or col not in self.all_articles.columns:
+                continue
+            _, ordem, valores = self._sorted_index(col)
+            inicio, fim = self._range_bounds(col, intervalo)
+            minimo = -np.inf if intervalo[0] is None else intervalo[0]
+            maximo = np.inf if intervalo[1] is None else intervalo[1]
+            predicados.append((
+                fim - inicio, col,
+                lambda ordem=ordem, inicio=inicio, fim=fim: np.sort(ordem[inicio:fim]),
+                lambda candidatos, valores=valores, minimo=minimo, maximo=maximo: candidatos[
+                    (valores[candidatos] >= minimo) & (valores[candidatos] <= maximo)]
+            ))
+        if curriculos is not None:
+            listas = [self._posicoes[c] for c in curriculos if c in self._posicoes]
+            posicoes_cv = np.sort(np.concatenate(listas)) if listas else np.empty(0, dtype=np.int64)
+            predicados.append((
+                len(posicoes_cv), 'curriculos',
+                lambda p=posicoes_cv: p,
+                lambda candidatos, p=posicoes_cv: candidatos[np.isin(candidatos, p)]
+            ))
+        if within is not None:
+            within = np.asarray(within, dtype=np.int64)
+            predicados.append((
+                len(within), 'within',
+                lambda: within,
+                lambda candidatos: candidatos[np.isin(candidatos, within)]
+            ))
+        
+        # Candidatos pelo predicado mais seletivo (ou todos os artigos ativos)
+        predicados.sort(key=lambda predicado: predicado[0])
+        if predicados:
+            candidatos = predicados[0][2]()
+            if candidatos is None:
+                return None
+            candidatos = candidatos[self._ativos[candidatos]]
         else:
-            self.all_articles = pd.DataFrame()
+            candidatos = np.flatnonzero(self._ativos)
+        for _, _, _, filtrar in predicados[1:]:
+            if not len(candidatos):
+                break
+            candidatos = filtrar(candidatos)
+        
+        # Categoria (sem índice): avaliada uma vez por conjunto distinto de categorias
+        if categoria and len(candidatos) and 'SCIMAGO_Categories' in self.all_articles.columns:
+            candidatos = candidatos[category_mask(self.all_articles['SCIMAGO_Categories'].iloc[candidatos], categoria)]
+        
+        if not len(candidatos):
+            return None
+        encontrados = candidatos
+        if texto and ranked:
+            candidatos, _ = self.title_index.rank(texto, limit, candidatos)
+        elif limit is not None:
+            candidatos = candidatos[:limit]
+        return ResultSet(self.all_articles, candidatos, columns, len(encontrados), encontrados)
+
+    @_synchronized
+    def add_curriculo(self, curriculo_id, articles_df):
+        """Acrescenta os artigos de um currículo, atualizando os índices só com as novas linhas.
+
+        As linhas ficam em um bloco pendente, concatenado ao DataFrame
+        completo só no próximo acesso a all_articles (uma vez para vários
+        currículos acrescentados em seguida).
+        """
+        if self._articles is None:
+            self._build(pd.DataFrame())
+        if curriculo_id in self._posicoes:
+            self.remove_curriculo(curriculo_id)
+        if articles_df is None or articles_df.empty:
+            return
+        
+        df = articles_df.copy()
+        df['CURRICULO_ID'] = curriculo_id
+        inicio = self._n_linhas
+        df.index = pd.RangeIndex(inicio, inicio + len(df))
+        self._pendentes.append(df)
+        self._ativos_buffer = append_array(self._ativos_buffer, inicio, np.ones(len(df), dtype=bool))
+        self._n_linhas += len(df)
+        self._ordenados = {}
+        self.version += 1
+        self._posicoes[curriculo_id] = np.arange(inicio, inicio + len(df))
+        
+        if self.title_column is None:
+            self.title_column = next((col for col in TITLE_COLUMNS if col in df.columns), None)
+        self.title_index.add(article_titles(df))
+        if 'ISSN' in df.columns:
+            add_keys(self.issn_index, df['ISSN'].map(normalize_issn), inicio)
+        if 'DOI' in df.columns:
+            add_keys(self.doi_index, df['DOI'].map(doi_key), inicio)
+
+    @_synchronized
+    def remove_curriculo(self, curriculo_id):
+        """Retira os artigos de um currículo dos índices"""
+        posicoes = self._posicoes.pop(curriculo_id, None) if self._articles is not None else None
+        if posicoes is None:
+            return
+        
+        linhas = self._rows(posicoes)
+        self.title_index.remove(posicoes)
+        if 'ISSN' in linhas.columns:
+            remove_keys(self.issn_index, linhas['ISSN'].map(normalize_issn), posicoes)
+        if 'DOI' in linhas.columns:
+            remove_keys(self.doi_index, linhas['DOI'].map(doi_key), posicoes)
+        self._ativos[posicoes] = False
+        self.version += 1
+        
+        # Muitas linhas inativas: reconstrói para liberar memória
+        self._inativos += len(posicoes)
+        if self._inativos > self._n_linhas // 2:
+            self._build(self.all_articles[self._ativos])
+
+    def _rows(self, posicoes):
+        """Linhas nas posições (crescentes) de um currículo, sem consolidar os blocos pendentes"""
+        if not len(posicoes) or posicoes[-1] < len(self._articles):
+            return self._articles.iloc[posicoes]
+        for bloco in self._pendentes:
+            if bloco.index[0] <= posicoes[0] <= bloco.index[-1]:
+                return bloco.loc[posicoes]
+        return self.all_articles.iloc[posicoes]
 
-    def search_by_criteria(self, query, field, threshold=0.6):
-        """Busca artigos usando diferentes critérios"""
+    @_synchronized
+    def replace_curriculo(self, curriculo_id, articles_df):
+        """Substitui os artigos de um currículo (ex.: após importação do Google Scholar)"""
+        self.remove_curriculo(curriculo_id)
+        self.add_curriculo(curriculo_id, articles_df)
+
+    @_synchronized
+    def search_by_criteria(self, query, field, threshold=0.6, ranked=False, limit=None, columns=None):
+        """Busca artigos usando diferentes critérios e retorna um ResultSet (ou None).
+
+        Com ranked=True, a busca por título retorna os limit artigos mais
+        relevantes (BM25) em ordem; o total de encontrados fica em
+        ResultSet.total.
+        """
         if not query or self.all_articles is None or self.all_articles.empty:
             return None
 
@@ -30,7 +626,7 @@ class ArticleSearch:
         
         # Mapeamento de campos
         field_map = {
-            'title': 'TITULO-DO-ARTIGO',
+            'title': self.title_column,
             'issn': 'ISSN',
             'doi': 'DOI',
             'year': 'ANO'  # Adicionar ano como campo de busca
@@ -40,70 +636,80 @@ class ArticleSearch:
         if not search_field or search_field not in self.all_articles.columns:
             return None
 
-        # Busca nos artigos
-        try:
-            # Tratar valores nulos primeiro
-            df = self.all_articles.copy()
-            df[search_field] = df[search_field].fillna('').astype(str)
-            
-            if field in ['issn', 'doi']:
-                # Remove hífens e espaços para ISSN/DOI
-                clean_query = query.replace('-', '').replace(' ', '')
-                mask = df[search_field].str.lower().str.replace('-', '').str.replace(' ', '') == clean_query
-            elif field == 'year':
-                # Busca exata por ano
-                mask = df[search_field].str.strip() == query
-            else:
-                # Busca por contém para títulos
-                mask = df[search_field].str.lower().str.contains(query, regex=False)
-
-            results = df[mask]
-            return results if not results.empty else None
-            
-        except Exception as e:
-            print(f"Erro na busca: {e}")
+        total = None
+        if field == 'title':
+            # Títulos: consulta ao índice invertido
+            posicoes = self.title_index.search(query)
+            if posicoes is not None and len(posicoes):
+                total = len(posicoes)
+                if ranked:
+                    posicoes, _ = self.title_index.rank(query, limit, posicoes)
+        elif field == 'issn':
+            # ISSN/DOI: consulta O(1) aos índices de chaves normalizadas
+            posicoes = self.issn_index.get(normalize_issn(query))
+        elif field == 'doi':
+            posicoes = self.doi_index.get(doi_key(query))
+        else:
+            # Busca exata por ano
+            posicoes = np.flatnonzero(year_mask(self.all_articles[search_field], query) & self._ativos)
+
+        if posicoes is None or not len(posicoes):
             return None
+        return ResultSet(self.all_articles, posicoes, columns, total)
 
-    def filter_results(self, df, filters):
-        """Aplica filtros aos resultados"""
-        if df is None or df.empty:
+    @_synchronized
+    def all_results(self, columns=None):
+        """ResultSet com todos os artigos ativos"""
+        if self.all_articles is None:
+            return None
+        return ResultSet(self.all_articles, np.flatnonzero(self._ativos), columns)
+
+    def find_duplicates(self, field='doi'):
+        """Artigos cujo DOI (ou ISSN) aparece em mais de um currículo, agrupados pela chave"""
+        index = self.doi_index if field == 'doi' else self.issn_index
+        if not index or 'CURRICULO_ID' not in self.all_articles.columns:
+            return pd.DataFrame()
+        curriculos = self.all_articles['CURRICULO_ID'].to_numpy()
+        grupos = [(chave, posicoes) for chave, posicoes in index.items()
+                  if len(posicoes) > 1 and len(set(curriculos[posicoes])) > 1]
+        if not grupos:
             return pd.DataFrame()
-            
-        filtered_df = df.copy()
+        posicoes = np.concatenate([posicoes for _, posicoes in grupos])
+        duplicados = self.all_articles.iloc[posicoes].copy()
+        duplicados.insert(0, 'CHAVE', np.repeat([chave for chave, _ in grupos], [len(p) for _, p in grupos]))
+        return duplicados
+
+    def filter_results(self, results, filters):
+        """Aplica filtros aos resultados (ResultSet ou DataFrame), sem copiar linhas"""
+        if results is None:
+            return None
+        if isinstance(results, pd.DataFrame):
+            results = ResultSet(results, np.arange(len(results)))
         
         for field, value in filters.items():
-            if value:
-                if field in ['SJR', 'H index']:
-                    col_name = f'SCIMAGO_{field.replace(" ", "_")}'
-                    if col_name in filtered_df.columns:
-                        try:
-                            min_val, max_val = value
-                            filtered_df = filtered_df[
-                                (filtered_df[col_name] >= min_val) & 
-                                (filtered_df[col_name] <= max_val)
-                            ]
-                        except:
-                            continue
-                        
-                elif field == 'Categories':
-                    if 'SCIMAGO_Categories' in filtered_df.columns:
-                        filtered_df = filtered_df[
-                            filtered_df['SCIMAGO_Categories'].fillna('').str.contains(
-                                value, case=False, na=False
-                            )
-                        ]
+            if not value or results.empty:
+                continue
+            if field in ['SJR', 'H index']:
+                col_name = f'SCIMAGO_{field.replace(" ", "_")}'
+                if col_name in results.source.columns:
+                    try:
+                        min_val, max_val = value
+                    except (TypeError, ValueError):
+                        continue
+                    valores = results.column(col_name)
+                    results = results.where((valores >= min_val) & (valores <= max_val))
                     
-                elif field == 'Year':
-                    if 'ANO' in filtered_df.columns:
-                        try:
-                            year = str(value)
-                            filtered_df['ANO'] = filtered_df['ANO'].astype(str)
-                            filtered_df = filtered_df[filtered_df['ANO'] == year]
-                        except:
-                            continue
+            elif field == 'Categories':
+                if 'SCIMAGO_Categories' in results.source.columns:
+                    results = results.where(category_mask(results.column('SCIMAGO_Categories'), value))
+                
+            elif field == 'Year':
+                if 'ANO' in results.source.columns:
+                    results = results.where(year_mask(results.column('ANO'), value))
 
-        return filtered_df
+        return results
 
     def get_all_articles(self):
         """Retorna todos os artigos sem filtro"""
-        return self.all_articles.copy() if self.all_articles is not None else None
+        results = self.all_results()
+        return results.to_frame() if results is not None else None
@@ -0,0 +1,388 @@
+import os
+import glob
+import sqlite3
+import threading
+import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from section_schema import apply_schema, read_section_csv
+from collections.abc import MutableMapping
+
+DB_FILE = 'curriculos.db'
+
+# Colunas indexadas quando presentes em uma seção
+INDEXED_COLUMNS = ['CURRICULO_ID', 'ANO', 'ISSN', 'DOI', 'REVISTA']
+
+# Seções lidas sob demanda mantidas em memória (as usadas há mais tempo são descartadas)
+MAX_RESIDENT_SECTIONS = 256
+
+def _read_frame(reader, file):
+    """Lê um arquivo; retorna (DataFrame, None) ou (None, mensagem de erro)"""
+    try:
+        return reader(file), None
+    except Exception as e:
+        return None, str(e)
+
+def read_frames(files, reader=pd.read_csv, workers=None, processos=False, progress=None):
+    """Lê vários arquivos em paralelo; retorna ({arquivo: DataFrame}, {arquivo: erro}).
+
+    Por padrão usa um pool de threads (a leitura é dominada por E/S e o parser
+    do pandas libera o GIL); processos=True usa um pool de processos quando o
+    parsing pesa mais. Os resultados seguem a ordem de files, independente da
+    ordem de conclusão. progress(feitos, total, arquivo) é chamado a cada arquivo.
+    """
+    files = list(files)
+    workers = workers or os.cpu_count() or 1
+    frames, erros = {}, {}
+    
+    def coletar(resultados):
+        for i, (file, (df, erro)) in enumerate(zip(files, resultados), 1):
+            if erro is None:
+                frames[file] = df
+            else:
+                erros[file] = erro
+            if progress:
+                progress(i, len(files), os.path.basename(file))
+    
+    if workers == 1 or len(files) <= 1:
+        coletar(_read_frame(reader, file) for file in files)
+    else:
+        executor_cls = ProcessPoolExecutor if processos else ThreadPoolExecutor
+        with executor_cls(max_workers=min(workers, len(files))) as executor:
+            coletar(executor.map(_read_frame, [reader] * len(files), files))
+    return frames, erros
+
+def _quote(identifier):
+    """Escapa nomes de tabela/coluna (as seções usam hífen)"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+class CurriculoStore:
+    """Armazena a saída do conversor em um banco SQLite, uma tabela por seção"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        # A conexão é aberta pela thread de carga e usada depois pela interface;
+        # o lock serializa as consultas entre threads
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+
+    def close(self):
+        self.conn.close()
+
+    def ingest_csv_dir(self, csv_dir):
+        """Importa todos os CSVs de csv_output/ (substitui o conteúdo atual).
+
+        Retorna {arquivo: erro} com os CSVs que não puderam ser lidos.
+        """
+        por_secao, erros = {}, {}
+        for file in glob.glob(os.path.join(csv_dir, '*.csv')):
+            basename = os.path.basename(file)
+            parts = basename.split('_', 1)
+            if len(parts) != 2:
+                continue
+
+            id_curriculo, resto = parts
+            tipo = resto.replace('.csv', '')
+            try:
+                df = read_section_csv(file)
+            except Exception as e:
+                erros[file] = str(e)
+                continue
+            df.insert(0, 'CURRICULO_ID', id_curriculo)
+            por_secao.setdefault(tipo, []).append(df)
+
+        self.ingest_sections({
+            tipo: pd.concat(frames, ignore_index=True) for tipo, frames in por_secao.items()
+        })
+        return erros
+
+    def ingest_curriculos(self, curriculos):
+        """Importa um dicionário {id: {seção: DataFrame}} (substitui o conteúdo atual)"""
+        por_secao = {}
+        for id_curriculo, dados in curriculos.items():
+            for tipo, df in dados.items():
+                df = df.copy()
+                df.insert(0, 'CURRICULO_ID', id_curriculo)
+                por_secao.setdefault(tipo, []).append(df)
+
+        self.ingest_sections({
+            tipo: pd.concat(frames, ignore_index=True) for tipo, frames in por_secao.items()
+        })
+
+    def ingest_sections(self, secoes):
+        """Grava um DataFrame por seção (com coluna CURRICULO_ID) e cria os índices"""
+        with self._lock, self.conn:
+            for tabela in self.sections():
+                self.conn.execute(f'DROP TABLE IF EXISTS {_quote(tabela)}')
+            self.conn.execute('DROP TABLE IF EXISTS _secoes')
+            self.conn.execute(
+                'CREATE TABLE _secoes (CURRICULO_ID TEXT, SECAO TEXT, TOTAL INTEGER, '
+                'PRIMARY KEY (CURRICULO_ID, SECAO))'
+            )
+
+            for tipo, df in secoes.items():
+                df.to_sql(tipo, self.conn, if_exists='replace', index=False)
+                for col in INDEXED_COLUMNS:
+                    if col in df.columns:
+                        nome_indice = f'idx_{tipo}_{col}'.replace('-', '_')
+                        self.conn.execute(
+                            f'CREATE INDEX IF NOT EXISTS {_quote(nome_indice)} '
+                            f'ON {_quote(tipo)} ({_quote(col)})'
+                        )
+                totais = df.groupby('CURRICULO_ID').size()
+                self.conn.executemany(
+                    'INSERT INTO _secoes VALUES (?, ?, ?)',
+                    [(str(id_curriculo), tipo, int(total)) for id_curriculo, total in totais.items()]
+                )
+
+    def sections(self):
+        """Seções (tabelas) presentes no banco"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE '\\_%' ESCAPE '\\'"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def section_index(self):
+        """Retorna {id: [seções com registros]} sem carregar nenhuma seção"""
+        index = {}
+        try:
+            with self._lock:
+                rows = self.conn.execute(
+                    'SELECT CURRICULO_ID, SECAO FROM _secoes ORDER BY rowid'
+                ).fetchall()
+        except sqlite3.OperationalError:
+            return index
+        for id_curriculo, tipo in rows:
+            index.setdefault(id_curriculo, []).append(tipo)
+        return index
+
+    def load_section(self, tipo, curriculo_id=None, columns=None, where=None, params=()):
+        """Carrega uma seção, opcionalmente filtrada por currículo, colunas e condição SQL"""
+        cols = ', '.join(_quote(c) for c in columns) if columns else '*'
+        sql = f'SELECT {cols} FROM {_quote(tipo)}'
+        conditions = []
+        params = list(params)
+        if curriculo_id is not None:
+            conditions.append('CURRICULO_ID = ?')
+            params.insert(0, curriculo_id)
+        if where:
+            conditions.append(f'({where})')
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        with self._lock:
+            return pd.read_sql_query(sql, self.conn, params=params)
+
+    def query(self, sql, params=()):
+        """Executa uma consulta SQL arbitrária e retorna um DataFrame"""
+        with self._lock:
+            return pd.read_sql_query(sql, self.conn, params=list(params))
+
+    def load_sections(self, tipo, progress=None):
+        """Lê uma seção de todos os currículos com uma única consulta; retorna {id: DataFrame}"""
+        if tipo not in self.sections():
+            return {}
+        df = apply_schema(self.load_section(tipo))
+        return {
+            id_curriculo: grupo.drop(columns='CURRICULO_ID').reset_index(drop=True)
+            for id_curriculo, grupo in df.groupby('CURRICULO_ID', sort=False)
+        }
+
+    def curriculos(self, transforms=None, preload=('DADOS-GERAIS',), section_cache=None):
+        """Retorna um mapeamento {id: seções} que carrega cada seção sob demanda.
+
+        transforms mapeia seção -> função aplicada ao DataFrame carregado
+        (ex.: enriquecimento Scimago dos artigos). As seções em preload são
+        lidas com uma única consulta e distribuídas entre os currículos.
+        As seções lidas sob demanda ficam em um cache LRU comum a todos os
+        currículos (section_cache ou, se omitido, um SectionCache novo).
+        """
+        transforms = transforms or {}
+        if section_cache is None:
+            section_cache = SectionCache()
+        index = self.section_index()
+        curriculos = {
+            id_curriculo: CurriculoSections(self, id_curriculo, tipos, transforms, section_cache)
+            for id_curriculo, tipos in index.items()
+        }
+
+        for tipo in preload:
+            if tipo not in self.sections():
+                continue
+            df = self.load_section(tipo)
+            for id_curriculo, grupo in df.groupby('CURRICULO_ID', sort=False):
+                if id_curriculo in curriculos:
+                    curriculos[id_curriculo].cache(tipo, grupo.reset_index(drop=True))
+
+        return curriculos
+
+class CsvCurriculoSource:
+    """Fonte de seções sobre os CSVs do conversor (ID_SEÇÃO.csv), lidos sob demanda.
+
+    As leituras em lote (pré-carga e load_sections) são feitas em paralelo
+    por read_frames; os arquivos que falharam ficam em errors ({arquivo: erro}).
+    """
+
+    def __init__(self, csv_dir, workers=None, processos=False):
+        self.csv_dir = csv_dir
+        self.workers = workers
+        self.processos = processos
+        self.errors = {}
+        self.files = {}
+        for file in sorted(glob.glob(os.path.join(csv_dir, '*.csv'))):
+            parts = os.path.basename(file).split('_', 1)
+            if len(parts) != 2:
+                continue
+            id_curriculo, resto = parts
+            self.files.setdefault(id_curriculo, {})[resto.replace('.csv', '')] = file
+
+    def section_index(self):
+        """Retorna {id: [seções]} apenas pelos nomes dos arquivos"""
+        return {id_curriculo: list(arquivos) for id_curriculo, arquivos in self.files.items()}
+
+    def load_section(self, tipo, curriculo_id):
+        return read_section_csv(self.files[curriculo_id][tipo])
+
+    def load_sections(self, tipo, progress=None):
+        """Lê uma seção de todos os currículos em paralelo; retorna {id: DataFrame}"""
+        ids = {arquivos[tipo]: id_curriculo for id_curriculo, arquivos in self.files.items() if tipo in arquivos}
+        frames, erros = read_frames(ids, read_section_csv, self.workers, self.processos, progress)
+        self.errors.update(erros)
+        return {ids[file]: df for file, df in frames.items()}
+
+    def curriculos(self, transforms=None, preload=('DADOS-GERAIS',), section_cache=None, progress=None):
+        """Mapeamento {id: seções} análogo a CurriculoStore.curriculos.
+
+        progress(feitos, total, arquivo) é chamado após cada arquivo pré-carregado.
+        Uma seção pré-carregada cuja leitura falhou é retirada do currículo
+        (o erro fica em errors), para não ser lida de novo ao ser acessada.
+        """
+        transforms = transforms or {}
+        if section_cache is None:
+            section_cache = SectionCache()
+        curriculos = {
+            id_curriculo: CurriculoSections(self, id_curriculo, tipos, transforms, section_cache)
+            for id_curriculo, tipos in self.section_index().items()
+        }
+        for tipo in preload:
+            carregadas = self.load_sections(tipo, progress)
+            for id_curriculo, secoes in curriculos.items():
+                if id_curriculo in carregadas:
+                    secoes.cache(tipo, carregadas[id_curriculo])
+                elif tipo in secoes:
+                    del secoes[tipo]
+        return curriculos
+
+class SectionCache:
+    """Cache LRU das seções lidas sob demanda, compartilhado entre os currículos"""
+
+    def __init__(self, max_frames=MAX_RESIDENT_SECTIONS):
+        self.max_frames = max_frames
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            df = self._frames.get(chave)
+            if df is not None:
+                self._frames.move_to_end(chave)
+            return df
+
+    def put(self, chave, df):
+        with self._lock:
+            self._frames[chave] = df
+            self._frames.move_to_end(chave)
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+
+    def discard(self, chave):
+        with self._lock:
+            self._frames.pop(chave, None)
+
+    def __len__(self):
+        return len(self._frames)
+
+class CurriculoSections(MutableMapping):
+    """Seções de um currículo, lidas da fonte (SQLite ou CSV) na primeira vez que são acessadas.
+
+    As seções pré-carregadas ou atribuídas ficam fixas em memória; as lidas
+    sob demanda vão para section_cache (SectionCache comum a todos os
+    currículos da fonte), que limita quantas ficam em memória. O lock
+    serializa leituras e alterações feitas por threads diferentes (ex.:
+    interface e thread de carga).
+    """
+
+    def __init__(self, store, curriculo_id, tipos, transforms, section_cache):
+        self.store = store
+        self.curriculo_id = curriculo_id
+        self._tipos = list(tipos)
+        self._transforms = transforms
+        self._section_cache = section_cache
+        self._frames = {}
+        self._lock = threading.RLock()
+
+    def _prepare(self, tipo, df):
+        # Tipos do registro de seções (o SQLite devolve anos como float quando há NULL)
+        df = apply_schema(df.drop(columns='CURRICULO_ID', errors='ignore'))
+        transform = self._transforms.get(tipo)
+        return transform(df) if transform else df
+
+    def cache(self, tipo, df):
+        """Guarda um DataFrame já carregado (sem a coluna CURRICULO_ID)"""
+        df = self._prepare(tipo, df)
+        with self._lock:
+            self._frames[tipo] = df
+
+    def __getitem__(self, tipo):
+        with self._lock:
+            if tipo in self._frames:
+                return self._frames[tipo]
+            if tipo not in self._tipos:
+                raise KeyError(tipo)
+            chave = (self.curriculo_id, tipo)
+            df = self._section_cache.get(chave)
+            if df is None:
+                df = self._prepare(tipo, self.store.load_section(tipo, curriculo_id=self.curriculo_id))
+                self._section_cache.put(chave, df)
+            return df
+
+    def __setitem__(self, tipo, df):
+        with self._lock:
+            if tipo not in self._tipos:
+                self._tipos.append(tipo)
+            self._frames[tipo] = df
+            self._section_cache.discard((self.curriculo_id, tipo))
+
+    def __delitem__(self, tipo):
+        with self._lock:
+            self._tipos.remove(tipo)
+            self._frames.pop(tipo, None)
+            self._section_cache.discard((self.curriculo_id, tipo))
+
+    def __contains__(self, tipo):
+        with self._lock:
+            return tipo in self._tipos
+
+    def __iter__(self):
+        # Cópia: uma alteração em outra thread não afeta a iteração em curso
+        with self._lock:
+            return iter(list(self._tipos))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._tipos)
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    store = CurriculoStore(os.path.join(base_dir, DB_FILE))
+    try:
+        erros = store.ingest_csv_dir(os.path.join(base_dir, 'csv_output'))
+        index = store.section_index()
+        print(f"{len(index)} currículos importados em {DB_FILE} ({len(store.sections())} seções)")
+        for arquivo, erro in erros.items():
+            print(f"Erro ao carregar {arquivo}: {erro}")
+    finally:
+        store.close()
+
+if __name__ == '__main__':
+    main()
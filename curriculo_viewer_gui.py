@@ -1,26 +1,43 @@
 import sys
 import os
 import pandas as pd
-import glob
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QLineEdit, 
-                            QTableWidget, QTableWidgetItem, QTabWidget, 
+                            QTableWidget, QTableWidgetItem, QTableView, QTabWidget, 
                             QTreeWidget, QTreeWidgetItem, QSplitter, QScrollArea, 
                             QComboBox, QDialog, QMessageBox, QGridLayout,
                             QProgressDialog, QProgressBar, QInputDialog)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QThread
 import numpy as np
 from stats_analyzer import CurriculoAnalyzer
 from collections import defaultdict, Counter
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from scimago_data import load_scimago_data
-from advanced_search import ArticleSearch
+from advanced_search import ArticleSearch, parse_range
+from live_search import LiveSearch, NameFilter, ArticleQueryRunner, DEBOUNCE_MS
+from table_model import DataFrameModel
 from stats_dashboard import StatsDashboard
+from data_loader import DataLoader
 import scholarly
 from scholarly import scholarly
 
+# Artigos exibidos na busca por título (os mais relevantes)
+MAX_RANKED_RESULTS = 500
+
+# Linhas consultadas para ajustar a largura das colunas ao conteúdo
+RESIZE_SAMPLE_ROWS = 200
+
+# Grupos de seções exibidos sob cada pesquisador na árvore
+TREE_GROUPS = {
+    "Informações Básicas": ['DADOS-GERAIS', 'FORMACAO-ACADEMICA', 'ATUACOES-PROFISSIONAIS'],
+    "Produção Bibliográfica": ['ARTIGOS-PUBLICADOS', 'LIVROS-PUBLICADOS', 'CAPITULOS-LIVROS', 'TRABALHOS-EVENTOS'],
+    "Produção Técnica": ['SOFTWARE', 'PATENTES', 'PRODUTOS-TECNOLOGICOS', 'TRABALHOS-TECNICOS', 'DEMAIS-PRODUCOES-TECNICAS'],
+    "Orientações": ['ORIENTACOES-MESTRADO', 'ORIENTACOES-DOUTORADO', 'ORIENTACOES-POS-DOUTORADO', 'OUTRAS-ORIENTACOES'],
+    "Prêmios e Projetos": ['PREMIOS-TITULOS', 'PROJETOS-PESQUISA'],
+    "Áreas e Palavras-chave": ['AREAS-DE-ATUACAO', 'PALAVRAS-CHAVES']
+}
+
 class SplashScreen(QDialog):
     def __init__(self):
         super().__init__()
@@ -120,7 +137,6 @@ class SplashScreen(QDialog):
         """Atualiza progresso e mensagem"""
         self.progress.setValue(value)
         self.status.setText(text)
-        QApplication.processEvents()
 
 class CurriculoViewer(QMainWindow):
     def __init__(self):
@@ -129,7 +145,11 @@ class CurriculoViewer(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
         self.dataframes = {}
         self.analyzer = None
+        self.stats_resumo = None  # Totais do painel global, calculados pela thread de carga
+        self.store = None  # Fonte das seções lidas sob demanda (SQLite ou CSV)
+        self.scimago_data = None
         self.stats_area = None  # Será inicializado no create_stats_tab
+        self.loader = None
         
         # Criar e mostrar splash screen
         self.splash = SplashScreen()
@@ -139,34 +159,103 @@ class CurriculoViewer(QMainWindow):
         QTimer.singleShot(100, self.initialize_application)
 
     def initialize_application(self):
-        """Inicializa a aplicação com barra de progresso"""
-        # Carregar Scimago (20%)
-        self.splash.set_progress(20, "Carregando base Scimago...")
-        self.scimago_data = load_scimago_data()
-        
-        # Inicializar busca (40%)
-        self.splash.set_progress(40, "Inicializando sistema de busca...")
-        self.article_search = ArticleSearch(self.scimago_data)
-        
-        # Configurar UI (60%)
-        self.splash.set_progress(60, "Configurando interface...")
+        """Monta a interface e inicia a carga dos dados em segundo plano"""
+        self.splash.set_progress(2, "Configurando interface...")
+        self.article_search = ArticleSearch(None)
+        self.article_runner = ArticleQueryRunner(self.article_search)
+        
+        # Buscas enquanto o usuário digita (árvore e artigos) em threads de trabalho
+        self.tree_filter = NameFilter([])
+        self.tree_search = LiveSearch(lambda texto: self.tree_filter(texto), self._apply_tree_filter, parent=self)
+        self.live_article_search = LiveSearch(self.article_runner.run, self._show_live_count,
+                                              self._show_live_error, parent=self)
         self.setup_ui()
-        
-        # Carregar dados (80%)
-        self.splash.set_progress(80, "Carregando currículos...")
-        self.load_data()
-        
-        # Finalizar (100%)
+        # A busca de artigos só é liberada depois da indexação
+        self.search_panel.setEnabled(False)
+        
+        # Scimago, currículos e índice de artigos são carregados por uma thread de trabalho;
+        # o progresso de cada etapa e de cada arquivo chega à splash screen por sinais
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        self.loader_thread = QThread()
+        self.loader = DataLoader(base_dir, self.article_search)
+        self.loader.moveToThread(self.loader_thread)
+        self.loader_thread.started.connect(self.loader.run)
+        self.loader.progress.connect(self._on_load_progress)
+        self.loader.scimago_loaded.connect(self._on_scimago_loaded)
+        self.loader.curriculos_loaded.connect(self._on_curriculos_loaded)
+        self.loader.articles_indexed.connect(self._on_articles_indexed)
+        self.loader.stats_ready.connect(self._on_stats_ready)
+        self.loader.load_errors.connect(self._on_load_errors)
+        self.loader.failed.connect(self._on_load_failed)
+        self.loader.finished.connect(self.loader_thread.quit)
+        self.loader_thread.start()
+
+    def _on_load_progress(self, valor, texto):
+        """Progresso na splash screen; depois que a janela aparece, na barra de status"""
+        if self.splash.isVisible():
+            self.splash.set_progress(valor, texto)
+        else:
+            self.statusBar().showMessage(texto)
+
+    def _on_scimago_loaded(self, scimago_data):
+        self.scimago_data = scimago_data
+
+    def _on_curriculos_loaded(self, curriculos, store):
+        """Preenche a interface com os currículos e exibe a janela principal"""
+        self.store = store
+        self.splash.set_progress(95, "Montando navegação...")
+        self.load_data(curriculos)
         self.splash.set_progress(100, "Concluído!")
+        self._finish_loading()
+        self.statusBar().showMessage("Indexando artigos para a busca...")
         
-        # Fechar splash e mostrar janela principal
-        QTimer.singleShot(500, self._finish_loading)
+        # Os totais do painel chegam depois, calculados pela thread de carga
+        self.update_stats()
+
+    def _on_articles_indexed(self):
+        self.search_panel.setEnabled(True)
+        self.statusBar().showMessage("Busca de artigos pronta", 3000)
+
+    def _on_stats_ready(self, resumo):
+        """Desenha o painel global com os totais calculados em segundo plano"""
+        self.stats_resumo = resumo
+        if self.analysis_type.currentData() == "global":
+            self.update_stats()
+
+    def _on_load_errors(self, erros):
+        """Relatório dos arquivos que não puderam ser lidos (ou foram ignorados) durante a carga"""
+        linhas = [f"{os.path.basename(arquivo)}: {erro}" for arquivo, erro in sorted(erros.items())]
+        detalhes = "\n".join(linhas[:20])
+        if len(linhas) > 20:
+            detalhes += f"\n... e mais {len(linhas) - 20}"
+        QMessageBox.warning(self, "Aviso", f"{len(erros)} arquivo(s) não puderam ser usados:\n\n{detalhes}")
+
+    def _on_load_failed(self, mensagem):
+        print(f"Erro ao carregar dados: {mensagem}")
+        if self.splash.isVisible():
+            self._finish_loading()
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Erro", f"Erro ao carregar dados: {mensagem}")
 
     def _finish_loading(self):
         """Fecha splash e mostra janela principal"""
         self.splash.close()
         self.show()
 
+    def closeEvent(self, event):
+        """Encerra a carga e as threads de busca e grava o cache Scimago antes de fechar"""
+        if self.loader is not None:
+            self.loader.cancel()
+            self.loader_thread.quit()
+            self.loader_thread.wait()
+        for live in (getattr(self, 'tree_search', None), getattr(self, 'live_article_search', None)):
+            if live is not None:
+                live.stop()
+        # Correspondências resolvidas nas seções lidas sob demanda
+        if self.scimago_data is not None:
+            self.scimago_data.save_match_cache()
+        super().closeEvent(event)
+
     def setup_ui(self):
         # Widget central
         central_widget = QWidget()
@@ -174,8 +263,8 @@ class CurriculoViewer(QMainWindow):
         layout = QVBoxLayout(central_widget)  # Changed to VBox to stack controls vertically
         
         # Add search panel at the top
-        search_panel = self._create_search_panel()
-        layout.addWidget(search_panel)
+        self.search_panel = self._create_search_panel()
+        layout.addWidget(self.search_panel)
         
         # Main content area
         content = QWidget()
@@ -199,6 +288,7 @@ class CurriculoViewer(QMainWindow):
         self.tree = QTreeWidget()
         self.tree.setHeaderLabel("Currículos")
         self.tree.itemClicked.connect(self.on_tree_item_clicked)
+        self.tree.itemExpanded.connect(self._populate_tree_item)
         left_layout.addWidget(self.tree)
 
         # Painel direito (conteúdo)
@@ -231,11 +321,14 @@ class CurriculoViewer(QMainWindow):
         
         self.search_field = QLineEdit()
         self.search_field.setPlaceholderText("Digite sua busca...")
+        self.search_field.textChanged.connect(self._schedule_article_search)
+        self.search_field.returnPressed.connect(self._perform_search)
         layout.addWidget(self.search_field, 0, 1)
         
         self.search_type = QComboBox()
         self.search_type.addItems(['Título', 'ISSN', 'DOI', 'Ano'])  # Adicionar opção Ano
         self.search_type.setMaximumWidth(100)
+        self.search_type.currentIndexChanged.connect(self._schedule_article_search)
         layout.addWidget(self.search_type, 0, 2)
         
         search_btn = QPushButton("Buscar")
@@ -277,8 +370,15 @@ class CurriculoViewer(QMainWindow):
         filter_layout.addWidget(self.filter_hindex)
         filter_layout.addWidget(self.filter_category)
         filter_layout.addWidget(self.filter_year)
+        for filtro in (self.filter_sjr, self.filter_hindex, self.filter_category, self.filter_year):
+            filtro.textChanged.connect(self._schedule_article_search)
+            filtro.returnPressed.connect(self._perform_search)
         layout.addWidget(filter_widget, 1, 1, 1, 3)
         
+        # Total encontrado pela busca em andamento
+        self.search_status = QLabel()
+        layout.addWidget(self.search_status, 1, 4)
+        
         return panel
 
     def setup_tabs(self):
@@ -347,13 +447,19 @@ class CurriculoViewer(QMainWindow):
         header_label.setStyleSheet("color: blue; padding: 5px;")
         layout.addWidget(header_label)
         
-        # Tabela
-        table = QTableWidget()
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Filtro e tabela (modelo sobre o DataFrame; só as linhas visíveis são lidas)
+        filter_input = QLineEdit()
+        filter_input.setPlaceholderText("Filtrar...")
+        layout.addWidget(filter_input)
+        
+        table, model = self._create_frame_table(missing_text='Não disponível')
+        self._connect_filter(filter_input, model)
         layout.addWidget(table)
         
         # Guardar referências
         container.table = table
+        container.model = model
+        container.filter_input = filter_input
         container.header_label = header_label
         
         # Configurar scroll
@@ -361,6 +467,35 @@ class CurriculoViewer(QMainWindow):
         
         return scroll
 
+    def _create_frame_table(self, missing_text='', float_format=None):
+        """QTableView com DataFrameModel (que também ordena e filtra); retorna (view, modelo)"""
+        table = QTableView()
+        model = DataFrameModel(missing_text=missing_text, float_format=float_format, parent=table)
+        
+        table.setModel(model)
+        table.setEditTriggers(QTableView.NoEditTriggers)
+        # Sem ordenação inicial: mantém a ordem em que o DataFrame foi entregue
+        table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        table.setSortingEnabled(True)
+        # A largura das colunas é estimada por uma amostra de linhas
+        table.horizontalHeader().setResizeContentsPrecision(RESIZE_SAMPLE_ROWS)
+        return table, model
+
+    def _connect_filter(self, filter_input, model):
+        """Aplica o texto de filter_input ao modelo após uma pausa na digitação"""
+        timer = QTimer(filter_input)
+        timer.setSingleShot(True)
+        timer.setInterval(DEBOUNCE_MS)
+        timer.timeout.connect(lambda: model.set_filter_text(filter_input.text()))
+        filter_input.textChanged.connect(lambda _: timer.start())
+
+    def _fit_columns(self, table, max_width=300):
+        """Ajusta as colunas ao conteúdo (amostrado), limitando a largura"""
+        table.resizeColumnsToContents()
+        for col in range(table.model().columnCount()):
+            if table.columnWidth(col) > max_width:
+                table.setColumnWidth(col, max_width)
+
     def create_stats_tab(self):
         """Cria aba de estatísticas"""
         scroll = QScrollArea()
@@ -442,34 +577,10 @@ class CurriculoViewer(QMainWindow):
                 nome = dados['DADOS-GERAIS']['NOME-COMPLETO'].iloc[0]
                 self.researcher_selector.addItem(nome, curriculo_id)  # Nome como texto, ID como dados
 
-    def load_data(self):
-        csv_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'csv_output')
-        csv_files = glob.glob(os.path.join(csv_dir, '*.csv'))
-
-        # Agrupar arquivos por ID do currículo
-        curriculos = {}
-        for file in csv_files:
-            basename = os.path.basename(file)
-            parts = basename.split('_', 1)
-            if len(parts) != 2:
-                continue
-                
-            id_curriculo, resto = parts
-            tipo = resto.replace('.csv', '')
-            
-            if id_curriculo not in curriculos:
-                curriculos[id_curriculo] = {}
-            
-            try:
-                df = pd.read_csv(file)
-                # Enriquece dados de artigos com informações do Scimago
-                if tipo == 'ARTIGOS-PUBLICADOS' and self.scimago_data:
-                    df = self.scimago_data.enrich_article_data(df)
-                curriculos[id_curriculo][tipo] = df
-            except Exception as e:
-                print(f"Erro ao carregar {file}: {str(e)}")
-
-        # Preencher a árvore com grupos organizados
+    def load_data(self, curriculos):
+        """Preenche a árvore, o analisador e os seletores com os currículos carregados"""
+        # Só os nós dos pesquisadores; grupos e seções são criados ao expandir
+        self.tree.clear()
         for id_curriculo, dados in curriculos.items():
             item = QTreeWidgetItem(self.tree)
             nome = "Sem nome"
@@ -480,42 +591,16 @@ class CurriculoViewer(QMainWindow):
             
             item.setText(0, f"{nome} ({id_curriculo})")
             item.setData(0, Qt.UserRole, id_curriculo)
-            
-            # Criar grupos na árvore
-            grupos = {
-                "Informações Básicas": ['DADOS-GERAIS', 'FORMACAO-ACADEMICA', 'ATUACOES-PROFISSIONAIS'],
-                "Produção Bibliográfica": ['ARTIGOS-PUBLICADOS', 'LIVROS-PUBLICADOS', 'CAPITULOS-LIVROS', 'TRABALHOS-EVENTOS'],
-                "Produção Técnica": ['SOFTWARE', 'PATENTES', 'PRODUTOS-TECNOLOGICOS', 'TRABALHOS-TECNICOS', 'DEMAIS-PRODUCOES-TECNICAS'],
-                "Orientações": ['ORIENTACOES-MESTRADO', 'ORIENTACOES-DOUTORADO', 'ORIENTACOES-POS-DOUTORADO', 'OUTRAS-ORIENTACOES'],
-                "Prêmios e Projetos": ['PREMIOS-TITULOS', 'PROJETOS-PESQUISA'],
-                "Áreas e Palavras-chave": ['AREAS-DE-ATUACAO', 'PALAVRAS-CHAVES']
-            }
-
-            # Criar grupos na árvore com seus itens
-            for grupo_nome, tipos in grupos.items():
-                grupo_item = QTreeWidgetItem(item)
-                grupo_item.setText(0, grupo_nome)
-                
-                # Adicionar subseções do grupo
-                for tipo in tipos:
-                    if tipo in dados and not dados[tipo].empty:
-                        child = QTreeWidgetItem(grupo_item)
-                        display_name = tipo.replace('-', ' ').title()
-                        child.setText(0, display_name)
-                        child.setData(0, Qt.UserRole, (id_curriculo, tipo))
-                        
-                # Remover grupo se não tiver itens
-                if grupo_item.childCount() == 0:
-                    item.removeChild(grupo_item)
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
 
         self.dataframes = curriculos
         self.analyzer = CurriculoAnalyzer(self.dataframes)
+        self.stats_resumo = None
         
-        # Inicializar a busca com todos os artigos
-        self.article_search.set_articles_data(self.dataframes)
-        
-        # Atualizar estatísticas
-        self.update_stats()
+        # Nomes da árvore para o filtro em segundo plano (mesma ordem dos itens)
+        self.tree_filter = NameFilter(
+            [self.tree.topLevelItem(i).text(0) for i in range(self.tree.topLevelItemCount())]
+        )
         
         # Atualizar o seletor de pesquisadores
         self.update_researcher_selector()
@@ -536,9 +621,17 @@ class CurriculoViewer(QMainWindow):
                 msg.setAlignment(Qt.AlignCenter)
                 self.stats_area.addWidget(msg)
                 return
+            
+            if self.stats_resumo is None:
+                # A thread de carga ainda está lendo as seções e calculando os totais
+                msg = QLabel("Calculando estatísticas...")
+                msg.setStyleSheet("font-size: 14px; color: #666; padding: 20px;")
+                msg.setAlignment(Qt.AlignCenter)
+                self.stats_area.addWidget(msg)
+                return
                 
             # Criar dashboard
-            stats_dashboard = StatsDashboard(self.dataframes, self.analyzer)
+            stats_dashboard = StatsDashboard(self.dataframes, self.analyzer, self.stats_resumo)
             
             # Container para métricas
             metrics_panel = stats_dashboard.create_metrics_panel()
@@ -605,12 +698,41 @@ class CurriculoViewer(QMainWindow):
             error_msg.setStyleSheet("color: red; padding: 20px;")
             self.stats_area.addWidget(error_msg)
 
+    def _populate_tree_item(self, item):
+        """Cria os grupos e seções de um pesquisador na primeira vez que o nó é expandido"""
+        id_curriculo = item.data(0, Qt.UserRole)
+        if item.parent() is not None or item.childCount() > 0 or id_curriculo not in self.dataframes:
+            return
+        dados = self.dataframes[id_curriculo]
+        
+        for grupo_nome, tipos in TREE_GROUPS.items():
+            # O conversor não grava seções vazias, e o teste de pertinência
+            # não obriga o carregamento da seção (SQLite ou CSV)
+            presentes = [tipo for tipo in tipos if tipo in dados]
+            if not presentes:
+                continue
+            grupo_item = QTreeWidgetItem(item)
+            grupo_item.setText(0, grupo_nome)
+            for tipo in presentes:
+                child = QTreeWidgetItem(grupo_item)
+                child.setText(0, tipo.replace('-', ' ').title())
+                child.setData(0, Qt.UserRole, (id_curriculo, tipo))
+        
+        if item.childCount() == 0:
+            item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicator)
+
     def on_tree_item_clicked(self, item):
         data = item.data(0, Qt.UserRole)
         if isinstance(data, tuple):  # Clicou em um tipo específico
             id_curriculo, tipo = data
             if id_curriculo in self.dataframes and tipo in self.dataframes[id_curriculo]:
-                self.display_data(self.dataframes[id_curriculo][tipo], tipo)
+                # A seção é lida da fonte agora, se não estiver em memória
+                try:
+                    df = self.dataframes[id_curriculo][tipo]
+                except Exception as e:
+                    QMessageBox.warning(self, "Erro", f"Erro ao carregar {tipo}: {e}")
+                    return
+                self.display_data(df, tipo)
                 self.tab_widget.setCurrentWidget(self.tabs[tipo])
 
     def display_data(self, df, tab_name):
@@ -618,8 +740,9 @@ class CurriculoViewer(QMainWindow):
             return
         
         tab_widget = self.tabs[tab_name]
-        table = tab_widget.widget().table
-        header_label = tab_widget.widget().header_label
+        container = tab_widget.widget()
+        table = container.table
+        header_label = container.header_label
         
         # Remover colunas vazias
         df = df.dropna(axis=1, how='all')
@@ -656,38 +779,30 @@ class CurriculoViewer(QMainWindow):
         header_label.setText(info_text)
         header_label.setStyleSheet("color: blue; padding: 5px;")
 
-        # Preparar dados - substituir None/NaN por texto informativo
-        df_display = df.fillna('Não disponível')
-
-        # Configurar tabela
-        table.setRowCount(len(df_display))
-        table.setColumnCount(len(df_display.columns))
-        
-        # Renomear colunas para melhor legibilidade
-        headers = [col.replace('-', ' ').title() for col in df_display.columns]
-        table.setHorizontalHeaderLabels(headers)
-
-        # Preencher dados
-        for i, row in df_display.iterrows():
-            for j, value in enumerate(row):
-                item = QTableWidgetItem(str(value))
-                if value == 'Não disponível':
-                    item.setForeground(Qt.gray)
-                table.setItem(i, j, item)
+        # Exibir pelo modelo (valores ausentes aparecem como 'Não disponível'),
+        # com colunas renomeadas para melhor legibilidade
+        headers = [col.replace('-', ' ').title() for col in df.columns]
+        table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        container.model.set_frame(df, headers)
+        container.filter_input.clear()
         
         # Ajustar visualização
-        table.resizeColumnsToContents()
-        for col in range(table.columnCount()):
-            if table.columnWidth(col) > 300:
-                table.setColumnWidth(col, 300)
+        self._fit_columns(table)
         
         self.tab_widget.setCurrentWidget(tab_widget)
 
     def search_data(self):
-        search_text = self.search_input.text().lower()
+        """Filtra a árvore em segundo plano (após uma pausa na digitação)"""
+        self.tree_search.schedule(self.search_input.text())
+
+    def _apply_tree_filter(self, indices):
+        """Mostra apenas os currículos encontrados, alterando só os itens que mudaram"""
+        visiveis = set(indices)
         for i in range(self.tree.topLevelItemCount()):
             item = self.tree.topLevelItem(i)
-            item.setHidden(search_text not in item.text(0).lower())
+            oculto = i not in visiveis
+            if item.isHidden() != oculto:
+                item.setHidden(oculto)
 
     def show_global_stats(self):
         """Mostra estatísticas globais"""
@@ -1151,37 +1266,87 @@ class CurriculoViewer(QMainWindow):
         container_layout = container.layout()
         container_layout.insertWidget(0, search_panel)
 
-    def _perform_search(self):
-        """Executa a pesquisa avançada"""
+    def _article_query_params(self):
+        """Parâmetros de ArticleSearch.query a partir dos campos de busca.
+
+        Retorna None se não houver termo nem filtro; levanta ValueError com a
+        mensagem para o usuário se um filtro for inválido.
+        """
         search_text = self.search_field.text().strip()
         search_type = self.search_type.currentText().lower()
         
-        # Converter tipo de busca para o formato esperado pelo ArticleSearch
-        field_map = {
-            'título': 'title',
-            'issn': 'issn',
-            'doi': 'doi',
-            'ano': 'year'
-        }
-        search_field = field_map.get(search_type, 'title')
-        
-        # Tratar busca por ano de forma especial
+        # Filtros: intervalos 'min-max' (ou valor único) e categoria
+        try:
+            anos = parse_range(self.filter_year.text())
+            sjr = parse_range(self.filter_sjr.text())
+            h_index = parse_range(self.filter_hindex.text())
+        except ValueError as e:
+            raise ValueError(f"Filtro inválido: {e}")
+        categoria = self.filter_category.text().strip() or None
+        
+        # Converter tipo de busca para o parâmetro esperado pelo ArticleSearch
+        criterios = {}
         if search_type == 'ano':
-            year = self.filter_year.text().strip() or search_text
-            if not year:
-                QMessageBox.warning(self, "Aviso", "Digite um ano para filtrar")
-                return
-                
-            results = self.article_search.get_all_articles()
-            if results is not None and not results.empty:
-                results = self.article_search.filter_results(results, {'Year': year})
-        # Busca normal para outros tipos
-        else:
-            if not search_text:
-                QMessageBox.warning(self, "Aviso", "Digite um termo para busca")
-                return
-            
-            results = self.article_search.search_by_criteria(search_text, search_field)
+            try:
+                anos = anos or parse_range(search_text)
+            except ValueError as e:
+                raise ValueError(f"Ano inválido: {e}")
+        elif search_text:
+            field_map = {
+                'título': 'title',
+                'issn': 'issn',
+                'doi': 'doi'
+            }
+            criterios[field_map.get(search_type, 'title')] = search_text
+        
+        if not criterios and not any([anos, sjr, h_index, categoria]):
+            return None
+        
+        # Títulos: os mais relevantes primeiro (BM25)
+        return dict(
+            anos=anos, sjr=sjr, h_index=h_index, categoria=categoria,
+            limit=MAX_RANKED_RESULTS if 'title' in criterios else None, **criterios
+        )
+
+    def _schedule_article_search(self):
+        """Agenda a busca de artigos enquanto o usuário digita"""
+        try:
+            params = self._article_query_params()
+        except ValueError as e:
+            self.live_article_search.cancel()
+            self.search_status.setText(str(e))
+            return
+        if params is None:
+            self.live_article_search.cancel()
+            self.search_status.clear()
+            return
+        self.search_status.setText("Buscando...")
+        self.live_article_search.schedule(params)
+
+    def _show_live_count(self, results):
+        """Mostra o total encontrado pela busca em segundo plano"""
+        total = 0 if results is None else results.total
+        self.search_status.setText(f"{total} artigos")
+
+    def _show_live_error(self, mensagem):
+        self.search_status.setText(f"Erro na busca: {mensagem}")
+
+    def _perform_search(self):
+        """Executa a pesquisa avançada (texto e filtros em uma única consulta)"""
+        try:
+            params = self._article_query_params()
+        except ValueError as e:
+            QMessageBox.warning(self, "Aviso", str(e))
+            return
+        if params is None:
+            QMessageBox.warning(self, "Aviso", "Digite um termo para busca ou preencha um filtro")
+            return
+        
+        # A busca em segundo plano pendente fica obsoleta; o resultado dela é
+        # reaproveitado se já tiver terminado com os mesmos parâmetros
+        self.live_article_search.cancel()
+        results = self.article_runner.run(params)
+        self._show_live_count(results)
         
         # Mostrar resultados...
         if results is not None and not results.empty:
@@ -1189,8 +1354,8 @@ class CurriculoViewer(QMainWindow):
         else:
             QMessageBox.information(self, "Busca", "Nenhum resultado encontrado")
 
-    def _show_search_results(self, df):
-        """Mostra os resultados da busca em uma nova janela"""
+    def _show_search_results(self, results):
+        """Mostra os resultados da busca (ResultSet) em uma nova janela"""
         dialog = QDialog(self)
         dialog.setWindowTitle("Resultados da Busca")
         dialog.setMinimumSize(1000, 600)
@@ -1198,12 +1363,20 @@ class CurriculoViewer(QMainWindow):
         
         # Adicionar informações de resumo
         info_label = QLabel()
-        info_label.setText(f"Total de artigos encontrados: {len(df)}")
+        if results.total > len(results):
+            info_label.setText(f"Total de artigos encontrados: {results.total} "
+                               f"(exibindo os {len(results)} mais relevantes)")
+        else:
+            info_label.setText(f"Total de artigos encontrados: {results.total}")
         layout.addWidget(info_label)
         
-        # Tabela de resultados
-        table = QTableWidget()
-        table.setRowCount(len(df))
+        # Filtro e tabela de resultados
+        filter_input = QLineEdit()
+        filter_input.setPlaceholderText("Filtrar resultados...")
+        layout.addWidget(filter_input)
+        
+        table, model = self._create_frame_table(float_format="{:.2f}")
+        self._connect_filter(filter_input, model)
         
         # Definir ordem das colunas e seus nomes de exibição
         column_order = [
@@ -1217,46 +1390,22 @@ class CurriculoViewer(QMainWindow):
             ('CURRICULO_ID', 'ID Currículo')
         ]
         
-        # Filtrar apenas colunas que existem no DataFrame
-        visible_columns = [(col, display) for col, display in column_order if col in df.columns]
+        # Filtrar apenas colunas que existem no DataFrame e copiar só essas
+        visible_columns = [(col, display) for col, display in column_order if col in results.source.columns]
+        df = results.to_frame([col for col, _ in visible_columns])
         
-        # Configurar colunas da tabela
-        table.setColumnCount(len(visible_columns))
-        table.setHorizontalHeaderLabels([display for _, display in visible_columns])
-
-        # Preencher dados
-        for row_idx, (_, row_data) in enumerate(df.iterrows()):
-            for col_idx, (col_name, _) in enumerate(visible_columns):
-                value = row_data.get(col_name, '')
-                
-                # Tratar tipos de dados específicos
-                if pd.isna(value):
-                    str_value = ''
-                elif isinstance(value, float):
-                    str_value = f"{value:.2f}"
-                else:
-                    str_value = str(value)
-
-                item = QTableWidgetItem(str_value)
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # Fazer célula read-only
-                table.setItem(row_idx, col_idx, item)
+        # Células lidas sob demanda: ausentes em branco, floats com 2 casas
+        model.set_frame(df, [display for _, display in visible_columns])
         
         # Ajustar tamanho das colunas
-        table.resizeColumnsToContents()
-        for col in range(table.columnCount()):
-            width = table.columnWidth(col)
-            if width > 300:
-                table.setColumnWidth(col, 300)
-        
-        # Habilitar ordenação
-        table.setSortingEnabled(True)
+        self._fit_columns(table)
         layout.addWidget(table)
 
         # Botões
         button_layout = QHBoxLayout()
         
         export_btn = QPushButton("Exportar CSV")
-        export_btn.clicked.connect(lambda: self._export_results(df))
+        export_btn.clicked.connect(lambda: self._export_results(results.to_frame()))
         button_layout.addWidget(export_btn)
         
         close_btn = QPushButton("Fechar")
@@ -2768,6 +2917,10 @@ class CurriculoViewer(QMainWindow):
                 QMessageBox.information(self, "Importação", 
                                        f"{len(scholar_df)} artigos foram importados.")
             
+            # Atualizar a busca só com os artigos deste currículo
+            self.article_search.replace_curriculo(
+                curriculo_id, self.dataframes[curriculo_id]['ARTIGOS-PUBLICADOS'])
+            
             # Atualizar visualização se necessário
             self.display_data(self.dataframes[curriculo_id]['ARTIGOS-PUBLICADOS'], 'ARTIGOS-PUBLICADOS')
             
@@ -0,0 +1,241 @@
+import os
+import glob
+import pandas as pd
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+from scimago_data import load_scimago_data
+from stats_analyzer import CurriculoAnalyzer, DASHBOARD_SECTIONS
+from section_schema import apply_schema
+from curriculo_store import CurriculoStore, CsvCurriculoSource, SectionCache, read_frames, DB_FILE
+
+class LoadCancelled(Exception):
+    """Carga interrompida (ex.: janela fechada durante o carregamento)"""
+
+def _article_transforms(scimago_data):
+    """Transformações aplicadas às seções carregadas sob demanda"""
+    transforms = {}
+    if scimago_data:
+        transforms['ARTIGOS-PUBLICADOS'] = scimago_data.enrich_article_data
+    return transforms
+
+def read_curriculos_csv(csv_dir, scimago_data=None, progress=None, section_cache=None,
+                        workers=None, processos=False):
+    """Indexa os CSVs de csv_output/; retorna (fonte, currículos) com as seções lidas sob demanda.
+
+    Só DADOS-GERAIS (nome do pesquisador) é lido agora, em paralelo;
+    progress(feitos, total, arquivo) é chamado após cada arquivo.
+    """
+    source = CsvCurriculoSource(csv_dir, workers, processos)
+    return source, source.curriculos(transforms=_article_transforms(scimago_data),
+                                     section_cache=section_cache, progress=progress)
+
+def read_curriculos_sqlite(db_file, scimago_data=None, section_cache=None):
+    """Abre o banco SQLite; retorna (store, currículos) com as seções lidas sob demanda"""
+    store = CurriculoStore(db_file)
+    return store, store.curriculos(transforms=_article_transforms(scimago_data), section_cache=section_cache)
+
+def read_curriculos_parquet(parquet_dir, scimago_data=None, progress=None, erros=None,
+                            workers=None, processos=False):
+    """Lê os datasets Parquet (um por seção) em paralelo e separa os registros por currículo.
+
+    Arquivos que não puderam ser lidos são registrados em erros ({arquivo: erro}).
+    """
+    curriculos = {}
+    arquivos = sorted(glob.glob(os.path.join(parquet_dir, '*.parquet')))
+    frames, falhas = read_frames(arquivos, pd.read_parquet, workers, processos, progress)
+    if erros is not None:
+        erros.update(falhas)
+    
+    for file, df in frames.items():
+        tipo = os.path.splitext(os.path.basename(file))[0]
+        # Datasets gravados por versões anteriores tinham menos colunas tipadas
+        df = apply_schema(df)
+        # Enriquece todos os artigos de uma vez
+        if tipo == 'ARTIGOS-PUBLICADOS' and scimago_data:
+            try:
+                df = scimago_data.enrich_article_data(df)
+            except Exception as e:
+                if erros is not None:
+                    erros[file] = str(e)
+                continue
+
+        for id_curriculo, grupo in df.groupby('CURRICULO_ID', sort=False):
+            curriculos.setdefault(id_curriculo, {})[tipo] = (
+                grupo.drop(columns='CURRICULO_ID').reset_index(drop=True)
+            )
+
+    return curriculos
+
+def _csv_mtime(csv_dir):
+    """Data do CSV gravado mais recentemente em csv_output/ (None se não houver CSVs)"""
+    arquivos = glob.glob(os.path.join(csv_dir, '*.csv'))
+    return max(os.path.getmtime(file) for file in arquivos) if arquivos else None
+
+def _is_stale(arquivos, csv_mtime):
+    """Indica se algum dos arquivos é mais antigo que a última conversão para CSV"""
+    return csv_mtime is not None and min(os.path.getmtime(file) for file in arquivos) < csv_mtime
+
+def read_curriculos(base_dir, scimago_data=None, progress=None, workers=None, processos=False):
+    """Lê os currículos da melhor fonte disponível; retorna (fonte ou None, currículos, erros).
+
+    SQLite e CSV são lidos sob demanda, com as seções em um cache LRU comum;
+    os datasets Parquet (um arquivo por seção) são lidos de uma vez. erros
+    ({arquivo: mensagem}) continua recebendo as falhas das leituras em lote
+    feitas depois pela fonte. Banco ou datasets mais antigos que csv_output/
+    (conversão feita depois deles) são ignorados e registrados em erros.
+    """
+    db_file = os.path.join(base_dir, DB_FILE)
+    parquet_dir = os.path.join(base_dir, 'parquet_output')
+    csv_dir = os.path.join(base_dir, 'csv_output')
+    csv_mtime = _csv_mtime(csv_dir)
+    avisos = {}
+
+    # Banco SQLite e datasets colunares têm prioridade sobre os CSVs individuais
+    if os.path.exists(db_file):
+        if not _is_stale([db_file], csv_mtime):
+            store, curriculos = read_curriculos_sqlite(db_file, scimago_data, SectionCache())
+            return store, curriculos, avisos
+        avisos[db_file] = 'banco desatualizado em relação a csv_output (usando os CSVs)'
+    parquet_files = glob.glob(os.path.join(parquet_dir, '*.parquet'))
+    if parquet_files:
+        if not _is_stale(parquet_files, csv_mtime):
+            curriculos = read_curriculos_parquet(parquet_dir, scimago_data, progress, avisos, workers, processos)
+            return None, curriculos, avisos
+        avisos[parquet_dir] = 'datasets desatualizados em relação a csv_output (usando os CSVs)'
+    source, curriculos = read_curriculos_csv(csv_dir, scimago_data, progress,
+                                             SectionCache(), workers, processos)
+    source.errors.update(avisos)
+    return source, curriculos, source.errors
+
+class DataLoader(QObject):
+    """Carrega Scimago, currículos e o índice de artigos fora da thread da interface.
+
+    Os sinais chegam à interface na ordem das etapas: scimago_loaded,
+    curriculos_loaded (a janela já pode ser exibida) e articles_indexed;
+    load_errors traz, ao final, os arquivos que não puderam ser lidos.
+    Depois da indexação, stats_ready entrega os totais do painel global
+    (CurriculoAnalyzer.analyze_dashboard), calculados nesta thread sobre
+    leituras em lote que são descartadas em seguida: os currículos entregues
+    à interface não são alterados por esta thread.
+    progress(valor, texto) é compatível com SplashScreen.set_progress.
+    workers e processos configuram as leituras paralelas (ver read_frames).
+    """
+    progress = pyqtSignal(int, str)
+    scimago_loaded = pyqtSignal(object)
+    curriculos_loaded = pyqtSignal(object, object)
+    articles_indexed = pyqtSignal()
+    stats_ready = pyqtSignal(object)
+    load_errors = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    # Faixas da barra de progresso de cada etapa
+    SCIMAGO_RANGE = (5, 20)
+    CURRICULOS_RANGE = (20, 90)
+    ARTICLES_RANGE = (90, 95)
+    ANALYTICS_RANGE = (95, 100)
+
+    def __init__(self, base_dir, article_search, workers=None, processos=False):
+        super().__init__()
+        self.base_dir = base_dir
+        self.article_search = article_search
+        self.workers = workers
+        self.processos = processos
+        self._cancelado = False
+
+    def cancel(self):
+        """Pede a interrupção da carga (atendida no próximo arquivo ou etapa)"""
+        self._cancelado = True
+
+    def _check(self):
+        if self._cancelado:
+            raise LoadCancelled()
+
+    def _file_progress(self, faixa, texto):
+        """Callback de progresso por arquivo dentro da faixa de uma etapa"""
+        inicio, fim = faixa
+        def progress(feitos, total, arquivo):
+            self._check()
+            valor = inicio + (fim - inicio) * feitos // max(total, 1)
+            self.progress.emit(valor, f"{texto} {feitos}/{total} ({arquivo})")
+        return progress
+
+    def _index_articles(self, store, curriculos, scimago_data):
+        """Constrói o índice de artigos lendo a seção de todos os currículos em lote.
+
+        Retorna os artigos lidos ({id: DataFrame}, None para Parquet) para o
+        cálculo das estatísticas.
+        """
+        if store is None:
+            self.article_search.set_articles_data(curriculos)
+            return None
+        # Leitura paralela (CSV) ou em uma consulta (SQLite), com o Scimago
+        # resolvido de uma vez para todos os artigos
+        artigos = store.load_sections(
+            'ARTIGOS-PUBLICADOS', self._file_progress(self.ARTICLES_RANGE, "Indexando artigos...")
+        )
+        self._check()
+        if scimago_data:
+            scimago_data.enrich_article_frames(artigos.values())
+        self.article_search.set_articles_data(
+            {id_curriculo: {'ARTIGOS-PUBLICADOS': df} for id_curriculo, df in artigos.items()}
+        )
+        return artigos
+
+    def _dashboard_summary(self, store, curriculos, artigos):
+        """Totais do painel global a partir de leituras em lote das seções de DASHBOARD_SECTIONS.
+
+        As seções lidas só existem durante o cálculo: nada é guardado nos
+        currículos nem no cache LRU (Parquet já está todo em memória).
+        """
+        if store is None:
+            return CurriculoAnalyzer(curriculos).analyze_dashboard()
+        progress = self._file_progress(self.ANALYTICS_RANGE, "Calculando estatísticas...")
+        dados = {id_curriculo: {} for id_curriculo in curriculos}
+        for tipo in DASHBOARD_SECTIONS:
+            frames = artigos if tipo == 'ARTIGOS-PUBLICADOS' else store.load_sections(tipo, progress)
+            self._check()
+            for id_curriculo, df in frames.items():
+                if id_curriculo in dados:
+                    dados[id_curriculo][tipo] = df
+        return CurriculoAnalyzer(dados).analyze_dashboard()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            self.progress.emit(self.SCIMAGO_RANGE[0], "Carregando base Scimago...")
+            scimago_data = load_scimago_data()
+            self.article_search.scimago_data = scimago_data
+            self._check()
+            self.scimago_loaded.emit(scimago_data)
+
+            self.progress.emit(self.CURRICULOS_RANGE[0], "Carregando currículos...")
+            store, curriculos, erros = read_curriculos(
+                self.base_dir, scimago_data,
+                self._file_progress(self.CURRICULOS_RANGE, "Carregando currículos..."),
+                self.workers, self.processos
+            )
+            self._check()
+            self.curriculos_loaded.emit(curriculos, store)
+
+            # A interface já está utilizável; a busca de artigos fica pronta depois
+            self.progress.emit(self.ARTICLES_RANGE[0], "Indexando artigos...")
+            artigos = self._index_articles(store, curriculos, scimago_data)
+            if scimago_data:
+                # Uma gravação do cache de correspondências para toda a carga
+                scimago_data.save_match_cache()
+            self._check()
+            self.articles_indexed.emit()
+
+            self.progress.emit(self.ANALYTICS_RANGE[0], "Calculando estatísticas...")
+            resumo = self._dashboard_summary(store, curriculos, artigos)
+            del artigos
+            self._check()
+            self.stats_ready.emit(resumo)
+            if erros:
+                self.load_errors.emit(dict(erros))
+        except LoadCancelled:
+            pass
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
@@ -0,0 +1,168 @@
+import threading
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+
+# Espera (ms) depois da última tecla antes de disparar a busca
+DEBOUNCE_MS = 250
+
+class SearchWorker(QObject):
+    """Executa as buscas em uma thread própria, descartando as já superadas"""
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, func):
+        super().__init__()
+        self.func = func
+        # Id da consulta mais recente (atualizado pela thread da interface)
+        self.latest = 0
+
+    @pyqtSlot(int, object)
+    def run(self, query_id, params):
+        # Consultas enfileiradas que já foram superadas nem chegam a rodar
+        if query_id != self.latest:
+            return
+        try:
+            resultado = self.func(params)
+        except Exception as e:
+            self.failed.emit(query_id, str(e))
+            return
+        # Chegou uma consulta nova enquanto esta rodava: o resultado é descartado
+        if query_id == self.latest:
+            self.finished.emit(query_id, resultado)
+
+class LiveSearch(QObject):
+    """Busca enquanto o usuário digita: debounce, thread de trabalho e cancelamento.
+
+    func(params) roda na thread de trabalho; on_result(resultado) e
+    on_error(mensagem) são chamados na thread da interface, apenas para a
+    consulta mais recente.
+    """
+    requested = pyqtSignal(int, object)
+
+    def __init__(self, func, on_result, on_error=None, delay=DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.on_result = on_result
+        self.on_error = on_error
+        self._query_id = 0
+        self._params = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self._submit)
+
+        self._thread = QThread()
+        self.worker = SearchWorker(func)
+        self.worker.moveToThread(self._thread)
+        self.requested.connect(self.worker.run)
+        self.worker.finished.connect(self._deliver)
+        self.worker.failed.connect(self._fail)
+        self._thread.start()
+
+    def schedule(self, params):
+        """Agenda a busca; cada nova chamada reinicia a espera"""
+        self._params = params
+        self._timer.start()
+
+    def run_now(self, params):
+        """Dispara a busca sem esperar o debounce"""
+        self._timer.stop()
+        self._params = params
+        self._submit()
+
+    def _submit(self):
+        self._query_id += 1
+        self.worker.latest = self._query_id
+        self.requested.emit(self._query_id, self._params)
+
+    def cancel(self):
+        """Descarta a busca agendada e as que estiverem em andamento"""
+        self._timer.stop()
+        self._query_id += 1
+        self.worker.latest = self._query_id
+
+    def _deliver(self, query_id, resultado):
+        if query_id == self._query_id:
+            self.on_result(resultado)
+
+    def _fail(self, query_id, mensagem):
+        if query_id == self._query_id:
+            if self.on_error:
+                self.on_error(mensagem)
+            else:
+                print(f"Erro na busca: {mensagem}")
+
+    def stop(self):
+        """Encerra a thread de trabalho (chamar ao fechar a janela)"""
+        self.cancel()
+        self._thread.quit()
+        self._thread.wait()
+
+class NameFilter:
+    """Filtro por substring sobre uma lista de nomes, reaproveitando o resultado anterior.
+
+    Se o novo texto contém o anterior, só os nomes que já casavam precisam
+    ser testados de novo.
+    """
+
+    def __init__(self, nomes):
+        self.nomes = [nome.lower() for nome in nomes]
+        self._lock = threading.Lock()
+        self._texto = ''
+        self._indices = list(range(len(self.nomes)))
+
+    def __call__(self, texto):
+        """Retorna os índices dos nomes que contêm texto"""
+        texto = texto.lower()
+        with self._lock:
+            if self._texto in texto:
+                base = self._indices
+            else:
+                base = range(len(self.nomes))
+            indices = [i for i in base if texto in self.nomes[i]]
+            self._texto, self._indices = texto, indices
+        return indices
+
+class ArticleQueryRunner:
+    """Executa ArticleSearch.query reaproveitando a consulta anterior.
+
+    Quando só o título cresceu (o último termo casa por prefixo, então o
+    resultado só pode diminuir), a busca é restrita às posições encontradas
+    na consulta anterior. Parâmetros idênticos devolvem o mesmo ResultSet.
+    """
+
+    def __init__(self, article_search):
+        self.article_search = article_search
+        self._params = None
+        self._version = None
+        self._results = None
+
+    def _reusable(self, params):
+        """Indica se o resultado anterior contém todos os resultados de params"""
+        if self._params is None or self._version != self.article_search.version:
+            return False
+        anterior, atual = dict(self._params), dict(params)
+        titulo_anterior = anterior.pop('title', None) or ''
+        titulo = atual.pop('title', None) or ''
+        anterior.pop('limit', None)
+        atual.pop('limit', None)
+        return (anterior == atual and bool(titulo_anterior) and titulo.startswith(titulo_anterior)
+                and '"' not in titulo)
+
+    def run(self, params):
+        # O lock do ArticleSearch impede que os artigos mudem entre a verificação e a consulta
+        with self.article_search.lock:
+            if params == self._params and self._version == self.article_search.version:
+                return self._results
+            within = None
+            if self._reusable(params):
+                within = self._results.matches if self._results is not None else []
+            resultado = self.article_search.query(within=within, **params)
+            self._params, self._version, self._results = dict(params), self.article_search.version, resultado
+            return resultado
+
+    def cached(self, params):
+        """Resultado já calculado para params (ou None)"""
+        with self.article_search.lock:
+            if params == self._params and self._version == self.article_search.version:
+                return self._results
+        return None
@@ -1,112 +1,649 @@
+import os
+import sys
+import glob
+import re
+import json
+import pickle
+import hashlib
+import threading
+import unicodedata
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-import difflib
+from collections import defaultdict
+from difflib import SequenceMatcher
 
-class ScimagoData:
-    def __init__(self, scimago_file):
-        # Colunas numéricas do Scimago
-        numeric_columns = [
-            'SJR', 'H index', 'Total Docs. (2023)', 'Total Refs.',
-            'Total Cites (3years)', 'Citable Docs. (3years)',
-            'Cites / Doc. (2years)', 'Ref. / Doc.'
-        ]
-        
-        # Função para converter valores numéricos, tratando valores vazios
-        def convert_numeric(x):
-            if pd.isna(x) or str(x).strip() == '':
-                return 0.0
+_NAO_ALFANUMERICO = re.compile(r'[^0-9a-z]+')
+_NAO_ISSN = re.compile(r'[^0-9X]')
+
+def normalize_title(title):
+    """Normaliza um título de periódico: minúsculas, sem acentos, pontuação e espaços extras"""
+    if not isinstance(title, str):
+        return ''
+    texto = unicodedata.normalize('NFKD', title.lower())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return _NAO_ALFANUMERICO.sub(' ', texto).strip()
+
+def normalize_issn(issn):
+    """Normaliza um ISSN para 8 caracteres sem hífen, validando o dígito verificador.
+
+    Retorna None para valores vazios ou inválidos.
+    """
+    if issn is None or (isinstance(issn, (float, np.number)) and pd.isna(issn)):
+        return None
+    if isinstance(issn, (int, float, np.number)):
+        # Coluna lida como número pelo pandas: recupera os zeros à esquerda
+        issn = str(int(issn)).zfill(8)
+    valor = _NAO_ISSN.sub('', str(issn).upper())
+    if len(valor) != 8 or not valor[:7].isdigit():
+        return None
+    soma = sum(int(d) * peso for d, peso in zip(valor[:7], range(8, 1, -1)))
+    digito = (11 - soma % 11) % 11
+    if valor[7] != ('X' if digito == 10 else str(digito)):
+        return None
+    return valor
+
+class TitleMatcher:
+    """Busca aproximada de títulos com índice invertido de trigramas de caracteres.
+
+    Os trigramas em comum com cada título são contados de uma vez sobre as
+    listas invertidas (numpy), os candidatos são podados pelo coeficiente de
+    Dice e apenas os melhores são verificados com o mesmo escore do difflib
+    (SequenceMatcher.ratio).
+    """
+    def __init__(self, titles, candidatos=10, folga=0.25, arrays=None):
+        self.titles = list(titles)
+        self.candidatos = candidatos
+        # O filtro por trigramas usa um limiar mais permissivo que o escore final
+        self.folga = folga
+        if arrays is not None:
+            # Índice pré-construído (snapshot): listas são fatias do vetor contínuo
+            offsets, flat, self.sizes = arrays
+            self.postings = {gram: flat[inicio:fim] for gram, (inicio, fim) in offsets.items()}
+            return
+        postings = defaultdict(list)
+        sizes = []
+        for pos, titulo in enumerate(self.titles):
+            grams = self._grams(titulo)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings[gram].append(pos)
+        self.postings = {gram: np.array(lista, dtype=np.int32) for gram, lista in postings.items()}
+        self.sizes = np.array(sizes, dtype=np.int32)
+    
+    def to_arrays(self):
+        """Exporta o índice como (offsets por trigrama, vetor contínuo, tamanhos)"""
+        offsets = {}
+        inicio = 0
+        for gram, lista in self.postings.items():
+            offsets[gram] = (inicio, inicio + len(lista))
+            inicio += len(lista)
+        flat = np.concatenate(list(self.postings.values())) if self.postings else np.empty(0, dtype=np.int32)
+        return offsets, flat.astype(np.int32), self.sizes
+    
+    @staticmethod
+    def _grams(texto):
+        texto = f'  {texto} '
+        return frozenset(texto[i:i + 3] for i in range(len(texto) - 2))
+    
+    def best_match(self, query, min_score=0.85):
+        """Retorna o título mais parecido com escore >= min_score, ou None"""
+        query_grams = self._grams(query)
+        listas = [self.postings[gram] for gram in query_grams if gram in self.postings]
+        if not listas:
+            return None
+        
+        # Trigramas em comum com cada título e coeficiente de Dice
+        comuns = np.bincount(np.concatenate(listas), minlength=len(self.titles))
+        dice = 2 * comuns / (len(query_grams) + self.sizes)
+        limiar = max(min_score - self.folga, 0.1)
+        candidatos = np.flatnonzero(dice >= limiar)
+        if len(candidatos) > self.candidatos:
+            melhores = np.argpartition(dice[candidatos], -self.candidatos)[-self.candidatos:]
+            candidatos = candidatos[melhores]
+        candidatos = candidatos[np.argsort(-dice[candidatos], kind='stable')]
+        
+        melhor = None
+        melhor_score = min_score
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        for pos in candidatos:
+            matcher.set_seq1(self.titles[pos])
+            if (matcher.real_quick_ratio() >= melhor_score and
+                    matcher.quick_ratio() >= melhor_score):
+                score = matcher.ratio()
+                if score > melhor_score or (melhor is None and score >= melhor_score):
+                    melhor, melhor_score = self.titles[pos], score
+        return melhor
+
+def file_fingerprint(path):
+    """Impressão digital (SHA-256 do conteúdo) de uma edição do Scimago"""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+class MatchCache:
+    """Cache em disco das correspondências título -> linha do Scimago.
+
+    Guarda também resultados negativos (-1). O arquivo registra a impressão
+    digital da edição do Scimago; se ela mudar, o cache é descartado. Pode
+    ser usado por várias threads (carga e interface) ao mesmo tempo.
+    """
+    def __init__(self, cache_file, fingerprint):
+        self.cache_file = cache_file
+        self.fingerprint = fingerprint
+        self.matches = {}
+        self._alterado = False
+        self._lock = threading.Lock()
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            if dados.get('fingerprint') == fingerprint:
+                self.matches = dados.get('matches', {})
+        except (OSError, ValueError):
+            pass
+    
+    @staticmethod
+    def key(titulo, min_score):
+        return f'{min_score}|{titulo}'
+    
+    def get(self, key):
+        with self._lock:
+            return self.matches.get(key)
+    
+    def set(self, key, pos):
+        with self._lock:
+            self.matches[key] = pos
+            self._alterado = True
+    
+    def save(self):
+        """Grava o cache (de forma atômica) se houver novas correspondências"""
+        # O lock impede gravações simultâneas no mesmo .tmp e alterações durante o dump
+        with self._lock:
+            if not self._alterado:
+                return
             try:
-                return float(str(x).replace(',', '.'))
-            except (ValueError, TypeError):
-                return 0.0
-        
-        # Converter vírgula para ponto e transformar em float
-        converters = {col: convert_numeric for col in numeric_columns}
-        
-        # Ler CSV com converters para colunas numéricas
-        self.scimago_df = pd.read_csv(
-            scimago_file,
-            sep=';',
-            encoding='utf-8',
-            converters=converters
-        )
-        self.prepare_data()
+                tmp_file = self.cache_file + '.tmp'
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump({'fingerprint': self.fingerprint, 'matches': self.matches}, f, ensure_ascii=False)
+                os.replace(tmp_file, self.cache_file)
+                self._alterado = False
+            except OSError as e:
+                print(f"Erro ao gravar cache de correspondências Scimago: {e}")
+
+SNAPSHOT_VERSION = 3
+
+def snapshot_dir(scimago_file):
+    """Diretório do snapshot binário de uma edição do Scimago"""
+    return os.path.splitext(os.path.abspath(scimago_file))[0] + '.snapshot'
+
+def _write_meta(meta_file, meta):
+    """Grava o meta.json do snapshot de forma atômica (temporário + os.replace)"""
+    tmp_file = meta_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_file, meta_file)
+
+# Colunas numéricas do Scimago levadas para os artigos (prefixo SCIMAGO_).
+# 'Total Docs.' corresponde à coluna 'Total Docs. (ANO)' de cada edição.
+METRIC_COLUMNS = [
+    'SJR', 'H index', 'Total Docs.', 'Total Refs.',
+    'Total Cites (3years)', 'Citable Docs. (3years)',
+    'Cites / Doc. (2years)', 'Ref. / Doc.'
+]
+
+_TOTAL_DOCS_ANO = re.compile(r'Total Docs\. \((\d{4})\)')
+_ANO_ARQUIVO = re.compile(r'(?<!\d)((?:19|20)\d{2})(?!\d)')
+
+# Quartis do SJR (coluna 'SJR Best Quartile'); '-' ou vazio = sem quartil
+QUARTILES = ['Q1', 'Q2', 'Q3', 'Q4']
+_QUARTIL_CATEGORIA = re.compile(r'\s*\((?:Q[1-4]|-)\)\s*$')
+
+@lru_cache(maxsize=None)
+def category_tokens(categorias):
+    """Conjunto (interned) das categorias de um periódico, sem o quartil de cada uma"""
+    if not isinstance(categorias, str):
+        return frozenset()
+    tokens = (_QUARTIL_CATEGORIA.sub('', parte).strip() for parte in categorias.split(';'))
+    return frozenset(sys.intern(token) for token in tokens if token)
+
+def category_mask(categorias, termo):
+    """Máscara dos artigos cujo periódico tem alguma categoria contendo termo.
+
+    O termo é testado uma vez por conjunto distinto de categorias (as
+    categorias do Categorical SCIMAGO_Categories) e propagado pelos códigos.
+    """
+    categorias = pd.Series(categorias)
+    if not isinstance(categorias.dtype, pd.CategoricalDtype):
+        categorias = categorias.astype('category')
+    termo = str(termo).lower().strip()
+    casa = np.array([
+        any(termo in token.lower() for token in category_tokens(rotulo))
+        for rotulo in categorias.cat.categories
+    ] + [False], dtype=bool)
+    # Código -1 (sem categorias) cai na última posição (False)
+    return casa[categorias.cat.codes.to_numpy()]
+
+def read_scimago_header(scimago_file):
+    return list(pd.read_csv(scimago_file, sep=';', encoding='utf-8', nrows=0).columns)
+
+def edition_year(scimago_file):
+    """Ano de uma edição do Scimago: pelo nome do arquivo ou pela coluna 'Total Docs. (ANO)'"""
+    match = _ANO_ARQUIVO.search(os.path.basename(scimago_file))
+    if match:
+        return int(match.group(1))
+    for col in read_scimago_header(scimago_file):
+        match = _TOTAL_DOCS_ANO.fullmatch(col)
+        if match:
+            return int(match.group(1))
+    raise ValueError(f"Não foi possível identificar o ano da edição {scimago_file}")
+
+def read_scimago_csv(scimago_file):
+    """Lê o CSV do Scimago convertendo as colunas numéricas (vírgula decimal) para float"""
+    # Função para converter valores numéricos, tratando valores vazios
+    def convert_numeric(x):
+        if pd.isna(x) or str(x).strip() == '':
+            return 0.0
+        try:
+            return float(str(x).replace(',', '.'))
+        except (ValueError, TypeError):
+            return 0.0
+    
+    # A coluna de documentos do ano traz o ano da edição no nome
+    renomear = {col: 'Total Docs.' for col in read_scimago_header(scimago_file)
+                if _TOTAL_DOCS_ANO.fullmatch(col)}
+    
+    # Converter vírgula para ponto e transformar em float
+    converters = {col: convert_numeric for col in METRIC_COLUMNS}
+    converters.update({col: convert_numeric for col in renomear})
+    
+    # Ler CSV com converters para colunas numéricas
+    return pd.read_csv(
+        scimago_file,
+        sep=';',
+        encoding='utf-8',
+        converters=converters
+    ).rename(columns=renomear)
+
+def _editions(scimago_file):
+    """Normaliza o argumento de ScimagoData para {ano: arquivo}, em ordem de ano"""
+    if isinstance(scimago_file, dict):
+        edicoes = {int(ano): arquivo for ano, arquivo in scimago_file.items()}
+    else:
+        arquivos = [scimago_file] if isinstance(scimago_file, (str, os.PathLike)) else list(scimago_file)
+        edicoes = {edition_year(arquivo): arquivo for arquivo in arquivos}
+    if not edicoes:
+        raise ValueError("Nenhuma edição do Scimago informada")
+    return dict(sorted(edicoes.items()))
+
+def _source_info(ano, arquivo, fingerprint=None):
+    stat = os.stat(arquivo)
+    return {
+        'ano': ano,
+        'arquivo': os.path.abspath(arquivo),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'fingerprint': fingerprint or file_fingerprint(arquivo)
+    }
+
+def _combined_fingerprint(fontes):
+    """Impressão digital do conjunto de edições carregadas"""
+    sha = hashlib.sha256()
+    for fonte in fontes:
+        sha.update(f"{fonte['ano']}:{fonte['fingerprint']};".encode())
+    return sha.hexdigest()
+
+class ScimagoData:
+    """Uma ou mais edições anuais do Scimago em uma única estrutura.
+
+    scimago_file pode ser um caminho, uma lista de caminhos ou {ano: caminho}.
+    A tabela (scimago_df) tem uma linha por periódico, com os dados da edição
+    mais recente em que ele aparece; as métricas de todas as edições ficam em
+    year_metrics[periódico, edição, métrica].
+    """
+    def __init__(self, scimago_file, use_cache=True, use_snapshot=True):
+        self.editions = _editions(scimago_file)
+        self.years = np.array(list(self.editions), dtype=np.int64)
+        arquivos = list(self.editions.values())
+        if len(arquivos) == 1:
+            self.snapshot_path = snapshot_dir(arquivos[0])
+        else:
+            self.snapshot_path = os.path.join(os.path.dirname(os.path.abspath(arquivos[0])),
+                                              'scimago_edicoes.snapshot')
         
+        # Snapshot binário (tabela tipada, métricas e índices prontos) quando
+        # estiver atualizado; caso contrário, lê os CSVs e gera um novo snapshot
+        fingerprint = self._load_snapshot() if use_snapshot else None
+        if fingerprint is None:
+            self.load_editions()
+            self.prepare_data()
+            fontes = [_source_info(ano, arquivo) for ano, arquivo in self.editions.items()]
+            fingerprint = _combined_fingerprint(fontes)
+            if use_snapshot:
+                self._save_snapshot(fontes, fingerprint)
+        
+        # Cache persistente de correspondências, invalidado quando as edições mudam
+        self.match_cache = None
+        if use_cache:
+            cache_file = os.path.join(os.path.dirname(os.path.abspath(arquivos[0])),
+                                      'scimago_match_cache.json')
+            self.match_cache = MatchCache(cache_file, fingerprint)
+    
+    def _load_snapshot(self):
+        """Carrega o snapshot se ainda corresponder aos CSVs; retorna a impressão digital ou None"""
+        pasta = self.snapshot_path
+        meta_file = os.path.join(pasta, 'meta.json')
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != SNAPSHOT_VERSION:
+                return None
+            fontes = meta['sources']
+            if [(f['ano'], f['arquivo']) for f in fontes] != [
+                    (ano, os.path.abspath(arquivo)) for ano, arquivo in self.editions.items()]:
+                return None
+            
+            # Tamanho e data iguais dispensam o hash; se só a data mudou, o hash decide
+            alterado = False
+            for fonte in fontes:
+                stat = os.stat(fonte['arquivo'])
+                if (fonte['size'], fonte['mtime']) != (stat.st_size, stat.st_mtime_ns):
+                    if fonte['fingerprint'] != file_fingerprint(fonte['arquivo']):
+                        return None
+                    fonte['size'], fonte['mtime'] = stat.st_size, stat.st_mtime_ns
+                    alterado = True
+            if alterado:
+                _write_meta(meta_file, meta)
+            
+            self.scimago_df = pd.read_pickle(os.path.join(pasta, 'tabela.pkl'))
+            indices = pd.read_pickle(os.path.join(pasta, 'indices.pkl'))
+            self.title_index = indices['title_index']
+            self.issn_index = indices['issn_index']
+            self.journal_titles = indices['journal_titles']
+            # Tabela e índices são carregados por inteiro; os vetores numéricos
+            # (métricas e listas de trigramas) são mapeados em memória
+            self.year_metrics = np.load(os.path.join(pasta, 'metricas.npy'), mmap_mode='r')
+            self.year_source = np.load(os.path.join(pasta, 'edicoes.npy'), mmap_mode='r')
+            self.edition_quartile = np.load(os.path.join(pasta, 'quartis.npy'), mmap_mode='r')
+            self.journal_category = np.load(os.path.join(pasta, 'categorias.npy'), mmap_mode='r')
+            self.category_labels = indices['category_labels']
+            self.title_matcher = TitleMatcher(self.journal_titles, arrays=(
+                indices['gram_offsets'],
+                np.load(os.path.join(pasta, 'postings.npy'), mmap_mode='r'),
+                np.load(os.path.join(pasta, 'tamanhos.npy'), mmap_mode='r')
+            ))
+            return meta['fingerprint']
+        except (OSError, ValueError, KeyError, TypeError, pickle.UnpicklingError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Snapshot Scimago inválido, recriando: {e}")
+            return None
+    
+    def _save_snapshot(self, fontes, fingerprint):
+        """Grava o snapshot binário ao lado dos CSVs.
+
+        A tabela e os índices (título, ISSN, offsets dos trigramas) vão para
+        pickles; métricas, edições, quartis, categorias e listas de trigramas
+        vão para .npy, que podem ser mapeados em memória. meta.json é gravado
+        por último, de forma atômica, e só então o snapshot passa a valer.
+        """
+        pasta = self.snapshot_path
+        meta_file = os.path.join(pasta, 'meta.json')
+        try:
+            os.makedirs(pasta, exist_ok=True)
+            # Invalida o snapshot anterior antes de sobrescrever os dados
+            if os.path.exists(meta_file):
+                os.remove(meta_file)
+            offsets, flat, tamanhos = self.title_matcher.to_arrays()
+            self.scimago_df.to_pickle(os.path.join(pasta, 'tabela.pkl'))
+            pd.to_pickle({
+                'title_index': self.title_index,
+                'issn_index': self.issn_index,
+                'journal_titles': self.journal_titles,
+                'gram_offsets': offsets,
+                'category_labels': self.category_labels
+            }, os.path.join(pasta, 'indices.pkl'))
+            np.save(os.path.join(pasta, 'metricas.npy'), np.ascontiguousarray(self.year_metrics))
+            np.save(os.path.join(pasta, 'edicoes.npy'), np.ascontiguousarray(self.year_source))
+            np.save(os.path.join(pasta, 'quartis.npy'), np.ascontiguousarray(self.edition_quartile))
+            np.save(os.path.join(pasta, 'categorias.npy'), np.ascontiguousarray(self.journal_category))
+            np.save(os.path.join(pasta, 'postings.npy'), flat)
+            np.save(os.path.join(pasta, 'tamanhos.npy'), tamanhos)
+            
+            # meta.json por último: só marca o snapshot como válido depois dos dados
+            _write_meta(meta_file, {
+                'version': SNAPSHOT_VERSION,
+                'fingerprint': fingerprint,
+                'sources': fontes
+            })
+        except OSError as e:
+            print(f"Erro ao gravar snapshot Scimago: {e}")
+    
+    def load_editions(self):
+        """Lê as edições e monta a tabela de periódicos e a matriz periódico x edição x métrica"""
+        tabelas = []
+        for ano, arquivo in self.editions.items():
+            df = read_scimago_csv(arquivo)
+            df['Ano'] = ano
+            tabelas.append(df)
+        todas = pd.concat(tabelas, ignore_index=True)
+        
+        # Identificador do periódico entre edições: Sourceid, ou o título normalizado
+        chave = todas['Title'].map(normalize_title)
+        if 'Sourceid' in todas.columns:
+            chave = todas['Sourceid'].astype('string').fillna(chave)
+        
+        # Uma linha por periódico, da edição mais recente (na ordem do arquivo)
+        anos = todas['Ano'].to_numpy()
+        ordem = np.concatenate([np.flatnonzero(anos == ano) for ano in self.years[::-1]])
+        base = ~chave.iloc[ordem].duplicated().to_numpy()
+        self.scimago_df = todas.iloc[ordem[base]].reset_index(drop=True)
+        periodicos = pd.Index(chave.iloc[ordem[base]])
+        
+        # Métricas de cada edição; a linha extra (NaN) representa "sem correspondência"
+        ids = periodicos.get_indexer(chave)
+        edicoes = np.searchsorted(self.years, anos)
+        n_periodicos, n_edicoes = len(periodicos), len(self.years)
+        metricas = np.full((n_periodicos + 1, n_edicoes, len(METRIC_COLUMNS)), np.nan)
+        metricas[ids, edicoes] = todas[METRIC_COLUMNS].to_numpy(dtype='float64')
+        presente = np.zeros((n_periodicos + 1, n_edicoes), dtype=bool)
+        presente[ids, edicoes] = True
+        
+        # Quartil de cada edição como código em QUARTILES (-1 = sem quartil)
+        self.edition_quartile = np.full((n_periodicos + 1, n_edicoes), -1, dtype=np.int8)
+        if 'SJR Best Quartile' in todas.columns:
+            quartis = pd.Categorical(todas['SJR Best Quartile'].astype('string').str.strip(), categories=QUARTILES)
+            self.edition_quartile[ids, edicoes] = quartis.codes
+        
+        # Edição sem o periódico: usa a edição mais próxima em que ele aparece
+        # (empate -> a mais antiga); year_source guarda a edição usada (-1 = nenhuma)
+        self.year_metrics = np.full_like(metricas, np.nan)
+        self.year_source = np.full((n_periodicos + 1, n_edicoes), -1, dtype=np.int16)
+        for j in range(n_edicoes):
+            vizinhas = sorted(range(n_edicoes), key=lambda k: (abs(self.years[k] - self.years[j]), k))
+            for k in vizinhas:
+                faltando = (self.year_source[:, j] < 0) & presente[:, k]
+                self.year_metrics[faltando, j] = metricas[faltando, k]
+                self.year_source[faltando, j] = k
+    
     def prepare_data(self):
         """Prepara os dados do Scimago para busca eficiente"""
         # Converter títulos para minúsculo para comparação
         self.scimago_df['Title_lower'] = self.scimago_df['Title'].str.lower()
-        # Criar índice de busca
-        self.journal_titles = set(self.scimago_df['Title_lower'].dropna())
+        # Índice título normalizado -> posição da linha (primeira ocorrência)
+        self.title_index = {}
+        for pos, titulo in enumerate(self.scimago_df['Title'].map(normalize_title)):
+            if titulo:
+                self.title_index.setdefault(titulo, pos)
+        # Títulos candidatos para a busca aproximada
+        self.journal_titles = list(self.title_index)
+        self.title_matcher = TitleMatcher(self.journal_titles)
+        
+        # Índice ISSN -> posição da linha (a coluna Issn tem vários ISSNs separados por vírgula)
+        self.issn_index = {}
+        if 'Issn' in self.scimago_df.columns:
+            issns = self.scimago_df['Issn'].reset_index(drop=True).fillna('').astype(str).str.split(',').explode()
+            for pos, issn in zip(issns.index, issns.map(normalize_issn)):
+                if issn:
+                    self.issn_index.setdefault(issn, pos)
+        
+        # Categorias de cada periódico como código em category_labels (-1 = sem categorias)
+        if 'Categories' in self.scimago_df.columns:
+            categorias = self.scimago_df['Categories']
+        else:
+            categorias = pd.Series(None, index=self.scimago_df.index, dtype=object)
+        rotulos = categorias.map(lambda c: '; '.join(sorted(category_tokens(c))) or None)
+        codigos, self.category_labels = pd.factorize(rotulos)
+        self.category_labels = list(self.category_labels)
+        self.journal_category = np.append(codigos, -1).astype(np.int32)
     
-    def find_best_match(self, journal_name, min_score=0.85):
-        """Encontra o título mais próximo no Scimago"""
+    def _find_position(self, issn=None, journal_name=None, min_score=0.85):
+        """Posição da linha do periódico: ISSN primeiro, depois título exato e aproximado"""
+        pos = self.issn_index.get(normalize_issn(issn))
+        if pos is not None:
+            return pos
+        
         if not isinstance(journal_name, str):
             return None
-            
-        journal_lower = journal_name.lower()
+        journal_norm = normalize_title(journal_name)
+        if not journal_norm:
+            return None
+        
+        # Tentar match exato primeiro (O(1) pelo índice)
+        pos = self.title_index.get(journal_norm)
+        if pos is not None:
+            return pos
         
-        # Tentar match exato primeiro
-        exact_match = self.scimago_df[self.scimago_df['Title_lower'] == journal_lower]
-        if not exact_match.empty:
-            return exact_match.iloc[0]
+        # Match aproximado já resolvido em outra sessão (-1 = sem correspondência)
+        cache_key = MatchCache.key(journal_norm, min_score)
+        if self.match_cache is not None:
+            pos = self.match_cache.get(cache_key)
+            if pos is not None:
+                return pos if pos >= 0 else None
         
         # Procurar match aproximado
-        matches = difflib.get_close_matches(
-            journal_lower,
-            self.journal_titles,
-            n=1,
-            cutoff=min_score
-        )
+        match = self.title_matcher.best_match(journal_norm, min_score)
+        pos = self.title_index[match] if match is not None else None
+        if self.match_cache is not None:
+            self.match_cache.set(cache_key, -1 if pos is None else pos)
+        return pos
+    
+    def _row(self, pos):
+        return self.scimago_df.iloc[pos] if pos is not None else None
+    
+    def find_by_issn(self, issn):
+        """Busca o periódico pelo ISSN (O(1) pelo índice)"""
+        return self._row(self.issn_index.get(normalize_issn(issn)))
+    
+    def find_journal(self, issn=None, journal_name=None, min_score=0.85):
+        """Busca o periódico pelo ISSN e, se não encontrar, pelo título"""
+        return self._row(self._find_position(issn, journal_name, min_score))
+    
+    def find_best_match(self, journal_name, min_score=0.85):
+        """Encontra o título mais próximo no Scimago"""
+        return self._row(self._find_position(None, journal_name, min_score))
+    
+    def save_match_cache(self):
+        """Grava as novas correspondências aproximadas (ao fim de um lote ou ao fechar)"""
+        if self.match_cache is not None:
+            self.match_cache.save()
+    
+    def match_positions(self, articles_df):
+        """Resolve a linha Scimago de cada artigo (-1 quando não há correspondência).
+
+        Cada par (ISSN, REVISTA) distinto é resolvido uma única vez. As novas
+        correspondências ficam no cache em memória até save_match_cache.
+        """
+        if articles_df.empty:
+            return np.empty(0, dtype=np.int64)
         
-        if matches:
-            return self.scimago_df[
-                self.scimago_df['Title_lower'] == matches[0]
-            ].iloc[0]
-            
-        return None
+        chaves = pd.DataFrame({
+            col: articles_df[col] if col in articles_df.columns else None
+            for col in ['ISSN', 'REVISTA']
+        }, index=articles_df.index).astype(object).where(lambda df: df.notna(), None)
+        codigos, unicos = pd.MultiIndex.from_frame(chaves).factorize()
+        
+        posicoes = np.array([
+            -1 if pos is None else pos
+            for pos in (self._find_position(issn, revista) for issn, revista in unicos)
+        ], dtype=np.int64)
+        return posicoes[codigos]
+    
+    def edition_positions(self, anos):
+        """Índice da edição mais próxima de cada ano (empate -> a mais antiga).
+
+        Anos ausentes ou inválidos usam a edição mais recente.
+        """
+        anos = pd.to_numeric(pd.Series(anos, dtype=object), errors='coerce').to_numpy(dtype='float64')
+        ultima = len(self.years) - 1
+        edicoes = np.full(len(anos), ultima, dtype=np.int64)
+        validos = ~np.isnan(anos)
+        direita = np.searchsorted(self.years, anos[validos]).clip(0, ultima)
+        esquerda = (direita - 1).clip(0)
+        mais_perto = np.abs(anos[validos] - self.years[esquerda]) <= np.abs(self.years[direita] - anos[validos])
+        edicoes[validos] = np.where(mais_perto, esquerda, direita)
+        return edicoes
     
     def enrich_article_data(self, articles_df):
-        """Adiciona métricas do Scimago aos artigos"""
-        # Criar colunas para métricas do Scimago
-        new_columns = {
-            'SJR': [],
-            'H index': [],
-            'Total Docs. (2023)': [],
-            'Total Refs.': [],
-            'Total Cites (3years)': [],
-            'Citable Docs. (3years)': [],
-            'Cites / Doc. (2years)': [],
-            'Ref. / Doc.': []
-        }
-        
-        # Para cada artigo, buscar informações do periódico
-        for _, row in articles_df.iterrows():
-            journal_name = row.get('REVISTA', '')
-            match = self.find_best_match(journal_name)
-            
-            if match is not None:
-                for col in new_columns:
-                    try:
-                        value = float(match[col])
-                    except (ValueError, TypeError):
-                        value = None
-                    new_columns[col].append(value)
-            else:
-                for col in new_columns:
-                    new_columns[col].append(None)
+        """Adiciona métricas do Scimago aos artigos, da edição mais próxima do ANO de cada um.
+
+        Aceita qualquer índice (inclusive o DataFrame concatenado de todos os
+        docentes): as colunas são atribuídas por posição.
+        """
+        anos = articles_df['ANO'] if 'ANO' in articles_df.columns else [None] * len(articles_df)
+        self._assign_metrics(articles_df, self.match_positions(articles_df), self.edition_positions(anos))
+        return articles_df
+    
+    def enrich_article_frames(self, frames):
+        """Enriquece vários DataFrames de artigos resolvendo os periódicos em conjunto.
+
+        Só as colunas ISSN/REVISTA/ANO são concatenadas, de modo que cada DataFrame
+        mantém seus próprios tipos e índice.
+        """
+        frames = list(frames)
+        if not frames:
+            return frames
+        chaves = pd.concat([df.reindex(columns=['ISSN', 'REVISTA', 'ANO']).astype(object) for df in frames],
+                           ignore_index=True)
+        posicoes = self.match_positions(chaves)
+        edicoes = self.edition_positions(chaves['ANO'])
+        inicio = 0
+        for df in frames:
+            fim = inicio + len(df)
+            self._assign_metrics(df, posicoes[inicio:fim], edicoes[inicio:fim])
+            inicio = fim
+        self.save_match_cache()
+        return frames
+    
+    def _assign_metrics(self, articles_df, posicoes, edicoes):
+        bloco = self.year_metrics[posicoes, edicoes]
+        fontes = self.year_source[posicoes, edicoes]
         
         # Adicionar novas colunas ao DataFrame como tipo float
-        for col, values in new_columns.items():
+        for j, col in enumerate(METRIC_COLUMNS):
             col_name = f'SCIMAGO_{col.replace(" ", "_")}'
-            articles_df[col_name] = pd.Series(values, dtype='float64')
+            articles_df[col_name] = bloco[:, j]
         
-        return articles_df
+        # Edição de onde vieram as métricas
+        anos = pd.array(self.years[fontes], dtype='Int64')
+        anos[fontes < 0] = pd.NA
+        articles_df['SCIMAGO_Ano'] = anos
+        
+        # Quartil da mesma edição e categorias do periódico, como Categorical
+        quartis = np.where(fontes >= 0, self.edition_quartile[posicoes, fontes], -1)
+        articles_df['SCIMAGO_Quartile'] = pd.Categorical.from_codes(quartis, categories=QUARTILES, ordered=True)
+        articles_df['SCIMAGO_Categories'] = pd.Categorical.from_codes(
+            self.journal_category[posicoes], categories=self.category_labels
+        )
 
 def load_scimago_data():
-    """Carrega e retorna uma instância de ScimagoData"""
+    """Carrega as edições do Scimago disponíveis ('scimagojr ANO.csv') em uma instância de ScimagoData"""
     try:
-        scimago_file = 'scimagojr 2023.csv'
-        return ScimagoData(scimago_file)
+        arquivos = sorted(glob.glob('scimagojr *.csv'))
+        if not arquivos:
+            raise FileNotFoundError("nenhum arquivo 'scimagojr ANO.csv' encontrado")
+        return ScimagoData(arquivos)
     except Exception as e:
         print(f"Erro ao carregar dados Scimago: {e}")
         return None
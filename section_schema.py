@@ -0,0 +1,60 @@
+import pandas as pd
+from collections import defaultdict
+
+# Tipos usados nas seções
+ANO = 'Int64'           # anos como inteiros anuláveis
+CATEGORIA = 'category'  # campos de baixa cardinalidade
+TEXTO = str             # texto livre (sem inferência: CPF, ISSN e ISBN mantêm zeros e hífens)
+
+ANO_COLUMNS = ['ANO', 'ANO-INICIO', 'ANO-CONCLUSAO', 'ANO-FIM']
+CATEGORICAL_COLUMNS = ['NIVEL', 'STATUS', 'TIPO', 'UF', 'SITUACAO', 'NATUREZA', 'IDIOMA', 'PAIS',
+                       'PAIS-DE-NASCIMENTO', 'TIPO-VINCULO', 'GRANDE-AREA', 'SETOR']
+
+def column_type(col):
+    """Tipo de uma coluna pelo nome (o mesmo em todas as seções)"""
+    if col in ANO_COLUMNS:
+        return ANO
+    if col in CATEGORICAL_COLUMNS:
+        return CATEGORIA
+    return TEXTO
+
+def csv_dtypes():
+    """Tipos para o parser de CSV: anos e categóricas pelo nome, as demais colunas como texto.
+
+    Vale para qualquer seção, sem lista de colunas por seção: as colunas
+    são as que extract_curriculo_data gravou.
+    """
+    tipos = {col: ANO for col in ANO_COLUMNS}
+    tipos.update({col: CATEGORIA for col in CATEGORICAL_COLUMNS})
+    return defaultdict(lambda: TEXTO, tipos)
+
+def apply_schema(df):
+    """Converte as colunas de ano e categóricas de df (valores inválidos viram ausentes).
+
+    Os tipos são os mesmos em todas as seções, então basta o nome da coluna;
+    colunas de texto e colunas fora do registro (ex.: métricas Scimago) não
+    são alteradas.
+    """
+    for col in df.columns:
+        dtype = column_type(col)
+        if dtype == TEXTO or str(df[col].dtype) == dtype:
+            continue
+        if dtype == ANO:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64').round().astype(ANO)
+        else:
+            df[col] = df[col].astype(CATEGORIA)
+    return df
+
+def read_section_csv(file):
+    """Lê o CSV de uma seção já com os tipos do registro.
+
+    Os tipos são passados ao parser; se algum valor não couber (ex.: ano
+    inválido), o arquivo é lido como texto e convertido por apply_schema.
+    """
+    try:
+        return pd.read_csv(file, dtype=csv_dtypes())
+    except (ValueError, TypeError):
+        if hasattr(file, 'seek'):
+            # Arquivo aberto: relê do início
+            file.seek(0)
+        return apply_schema(pd.read_csv(file, dtype=TEXTO))
@@ -3,6 +3,10 @@ import numpy as np
 from collections import Counter, defaultdict
 from datetime import datetime
 
+# Seções lidas por CurriculoAnalyzer.analyze_dashboard
+DASHBOARD_SECTIONS = ['ARTIGOS-PUBLICADOS', 'LIVROS-PUBLICADOS', 'CAPITULOS-LIVROS',
+                      'TRABALHOS-EVENTOS', 'AREAS-DE-ATUACAO']
+
 class CurriculoAnalyzer:
     def __init__(self, dataframes):
         self.dataframes = dataframes
@@ -54,6 +58,65 @@ class CurriculoAnalyzer:
         }
         return stats
 
+    def analyze_dashboard(self):
+        """Totais usados pelo painel global (StatsDashboard), sem widgets.
+
+        Só lê as seções de DASHBOARD_SECTIONS. Pode ser chamado fora da
+        thread da interface; o painel só desenha os gráficos a partir do
+        dicionário retornado.
+        """
+        producao = {'Artigos': 0, 'Livros': 0, 'Capítulos': 0, 'Eventos': 0}
+        secoes_producao = {
+            'Artigos': 'ARTIGOS-PUBLICADOS',
+            'Livros': 'LIVROS-PUBLICADOS',
+            'Capítulos': 'CAPITULOS-LIVROS',
+            'Eventos': 'TRABALHOS-EVENTOS'
+        }
+        producao_anual = Counter()
+        areas = Counter()
+        total_citacoes = 0
+        sjr_values = []
+        impacto = []
+
+        for dados in self.dataframes.values():
+            for rotulo, tipo in secoes_producao.items():
+                if tipo in dados:
+                    producao[rotulo] += len(dados[tipo])
+
+            if 'ARTIGOS-PUBLICADOS' in dados:
+                df = dados['ARTIGOS-PUBLICADOS']
+                anos = pd.to_numeric(df['ANO'], errors='coerce') if 'ANO' in df.columns else None
+                if anos is not None:
+                    producao_anual.update(anos.dropna().astype(int).tolist())
+                if 'SCIMAGO_Total_Cites_(3years)' in df.columns:
+                    total_citacoes += df['SCIMAGO_Total_Cites_(3years)'].sum()
+                if 'SCIMAGO_SJR' in df.columns:
+                    sjr = pd.to_numeric(df['SCIMAGO_SJR'], errors='coerce')
+                    sjr_values.extend(sjr.dropna())
+                    if anos is not None:
+                        impacto.append(pd.DataFrame({'ANO': anos, 'SJR': sjr}).dropna())
+
+            if 'AREAS-DE-ATUACAO' in dados:
+                df = dados['AREAS-DE-ATUACAO']
+                if 'AREA' in df.columns:
+                    areas.update(df['AREA'].dropna())
+
+        impacto_por_ano = {}
+        if impacto:
+            impacto = pd.concat(impacto, ignore_index=True)
+            impacto_por_ano = impacto.groupby(impacto['ANO'].astype(int))['SJR'].mean().to_dict()
+
+        return {
+            'total_docentes': len(self.dataframes),
+            'total_artigos': producao['Artigos'],
+            'total_citacoes': int(total_citacoes),
+            'media_sjr': np.mean(sjr_values) if sjr_values else 0,
+            'producao': producao,
+            'producao_anual': dict(producao_anual),
+            'areas': areas,
+            'impacto_por_ano': impacto_por_ano
+        }
+
     def _get_resumo_geral(self):
         """Resumo geral do corpo docente"""
         total_docentes = len(self.dataframes)
@@ -182,7 +245,7 @@ class CurriculoAnalyzer:
                     sjr_values.extend([float(v) for v in valores if float(v) > 0])
                 
                 if 'SCIMAGO_Quartile' in df.columns:
-                    artigos_q1 += len(df[df['SCIMAGO_Quartile'] == 'Q1'])
+                    artigos_q1 += int((df['SCIMAGO_Quartile'] == 'Q1').sum())
         
         # Garantir valores default para evitar erros
         if not citacoes:
@@ -275,7 +338,7 @@ class CurriculoAnalyzer:
             if 'ARTIGOS-PUBLICADOS' in dados and 'SCIMAGO_Quartile' in dados['ARTIGOS-PUBLICADOS'].columns:
                 df = dados['ARTIGOS-PUBLICADOS']
                 total_artigos += len(df)
-                artigos_q1 += len(df[df['SCIMAGO_Quartile'] == 'Q1'])
+                artigos_q1 += int((df['SCIMAGO_Quartile'] == 'Q1').sum())
         
         return (artigos_q1 / total_artigos * 100) if total_artigos > 0 else 0
 
@@ -6,15 +6,23 @@ from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from PyQt5.QtCore import Qt
-from collections import defaultdict, Counter
+from collections import defaultdict
 import pandas as pd
 from datetime import datetime
 from scholarly import scholarly
 
 class StatsDashboard:
-    def __init__(self, dataframes, analyzer):
+    def __init__(self, dataframes, analyzer, resumo=None):
         self.dataframes = dataframes
         self.analyzer = analyzer
+        # Totais do painel global (CurriculoAnalyzer.analyze_dashboard), calculados
+        # na carga pela thread de trabalho; sem eles, são calculados aqui
+        self.resumo = resumo
+
+    def _resumo(self):
+        if self.resumo is None:
+            self.resumo = self.analyzer.analyze_dashboard()
+        return self.resumo
         
     def create_global_analysis(self):
         """Cria painel de análise global"""
@@ -230,53 +238,33 @@ class StatsDashboard:
         """Cria painel com métricas principais"""
         widget = QWidget()
         layout = QHBoxLayout(widget)
+        resumo = self._resumo()
         
         # Total de docentes
-        total_docentes = len(self.dataframes)
         layout.addWidget(self._create_metric_card(
             "Total de Docentes",
-            total_docentes,
+            resumo['total_docentes'],
             "👥"
         ))
         
         # Total de artigos
-        total_artigos = sum(
-            len(dados['ARTIGOS-PUBLICADOS']) 
-            for dados in self.dataframes.values() 
-            if 'ARTIGOS-PUBLICADOS' in dados
-        )
         layout.addWidget(self._create_metric_card(
             "Total de Artigos",
-            total_artigos,
+            resumo['total_artigos'],
             "📚"
         ))
         
         # Total de citações
-        total_citacoes = 0
-        for dados in self.dataframes.values():
-            if 'ARTIGOS-PUBLICADOS' in dados:
-                df = dados['ARTIGOS-PUBLICADOS']
-                if 'SCIMAGO_Total_Cites_(3years)' in df.columns:
-                    total_citacoes += df['SCIMAGO_Total_Cites_(3years)'].sum()
-        
         layout.addWidget(self._create_metric_card(
             "Total de Citações",
-            int(total_citacoes),
+            resumo['total_citacoes'],
             "📊"
         ))
         
         # Média SJR
-        sjr_values = []
-        for dados in self.dataframes.values():
-            if 'ARTIGOS-PUBLICADOS' in dados:
-                df = dados['ARTIGOS-PUBLICADOS']
-                if 'SCIMAGO_SJR' in df.columns:
-                    sjr_values.extend(df['SCIMAGO_SJR'].dropna())
-        
-        media_sjr = np.mean(sjr_values) if sjr_values else 0
         layout.addWidget(self._create_metric_card(
             "SJR Médio",
-            f"{media_sjr:.2f}",
+            f"{resumo['media_sjr']:.2f}",
             "⭐"
         ))
         
@@ -288,23 +276,8 @@ class StatsDashboard:
         canvas = FigureCanvas(fig)
         ax = fig.add_subplot(111)
         
-        # Coletar dados de produção
-        producao = {
-            'Artigos': 0,
-            'Livros': 0,
-            'Capítulos': 0,
-            'Eventos': 0
-        }
-        
-        for dados in self.dataframes.values():
-            if 'ARTIGOS-PUBLICADOS' in dados:
-                producao['Artigos'] += len(dados['ARTIGOS-PUBLICADOS'])
-            if 'LIVROS-PUBLICADOS' in dados:
-                producao['Livros'] += len(dados['LIVROS-PUBLICADOS'])
-            if 'CAPITULOS-LIVROS' in dados:
-                producao['Capítulos'] += len(dados['CAPITULOS-LIVROS'])
-            if 'TRABALHOS-EVENTOS' in dados:
-                producao['Eventos'] += len(dados['TRABALHOS-EVENTOS'])
+        # Dados de produção
+        producao = self._resumo()['producao']
         
         # Criar gráfico
         colors = ['#3498db', '#2ecc71', '#e74c3c', '#f1c40f']
@@ -331,18 +304,8 @@ class StatsDashboard:
         canvas = FigureCanvas(fig)
         ax = fig.add_subplot(111)
         
-        # Coletar dados temporais
-        producao_anual = defaultdict(int)
-        
-        for dados in self.dataframes.values():
-            if 'ARTIGOS-PUBLICADOS' in dados:
-                df = dados['ARTIGOS-PUBLICADOS']
-                if 'ANO' in df.columns:
-                    for ano in df['ANO'].dropna():
-                        try:
-                            producao_anual[int(ano)] += 1
-                        except ValueError:
-                            continue
+        # Dados temporais
+        producao_anual = self._resumo()['producao_anual']
         
         if producao_anual:
             anos = sorted(producao_anual.keys())
@@ -371,14 +334,8 @@ class StatsDashboard:
         canvas = FigureCanvas(fig)
         ax = fig.add_subplot(111)
         
-        # Coletar áreas
-        areas = Counter()
-        for dados in self.dataframes.values():
-            if 'AREAS-DE-ATUACAO' in dados:
-                df = dados['AREAS-DE-ATUACAO']
-                if 'AREA' in df.columns:
-                    for area in df['AREA'].dropna():
-                        areas[area] += 1
+        # Áreas
+        areas = self._resumo()['areas']
         
         if areas:
             # Pegar top 5 áreas
@@ -405,21 +362,12 @@ class StatsDashboard:
         canvas = FigureCanvas(fig)
         ax = fig.add_subplot(111)
         
-        # Coletar dados de impacto
-        impacto_por_ano = defaultdict(list)
-        
-        for dados in self.dataframes.values():
-            if 'ARTIGOS-PUBLICADOS' in dados:
-                df = dados['ARTIGOS-PUBLICADOS']
-                if 'ANO' in df.columns and 'SCIMAGO_SJR' in df.columns:
-                    for _, row in df.iterrows():
-                        if pd.notna(row['ANO']) and pd.notna(row['SCIMAGO_SJR']):
-                            ano = int(row['ANO'])
-                            impacto_por_ano[ano].append(float(row['SCIMAGO_SJR']))
+        # SJR médio por ano
+        impacto_por_ano = self._resumo()['impacto_por_ano']
         
         if impacto_por_ano:
             anos = sorted(impacto_por_ano.keys())
-            medias = [np.mean(impacto_por_ano[ano]) for ano in anos]
+            medias = [impacto_por_ano[ano] for ano in anos]
             
             ax.plot(anos, medias, marker='o', color='#e74c3c', linewidth=2)
             ax.set_xlabel('Ano')
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+class TableData:
+    """Ordenação e filtro por texto de um DataFrame exibido em tabela, sem Qt.
+
+    A ordenação é feita com argsort sobre a coluna e o filtro com uma máscara
+    vetorizada; ambos só trocam o vetor ordem, com a posição no DataFrame de
+    cada linha exibida. O DataFrameModel (table_model.py) só avisa a view.
+    """
+
+    def __init__(self, df=None):
+        self.filtro = ''
+        self.set_frame(pd.DataFrame() if df is None else df)
+
+    def set_frame(self, df):
+        """Troca o DataFrame; o filtro atual é mantido e a ordenação volta à original"""
+        self.df = df
+        # Arrays por coluna: sem cópia para colunas numéricas
+        self.valores = [df.iloc[:, j].to_numpy() for j in range(df.shape[1])]
+        self.ausentes = [pd.isna(valores) for valores in self.valores]
+        # Todas as posições na ordem atual e, delas, as que passam no filtro
+        self._permutacao = np.arange(len(df))
+        self._mascara = self.contains_mask(self.filtro) if self.filtro else None
+        self.ordem = self._visible(self._permutacao)
+
+    def _visible(self, permutacao):
+        """Posições de permutacao que passam no filtro atual"""
+        return permutacao if self._mascara is None else permutacao[self._mascara[permutacao]]
+
+    def __len__(self):
+        return len(self.ordem)
+
+    def source_row(self, row):
+        """Posição no DataFrame da linha exibida em row"""
+        return int(self.ordem[row])
+
+    def set_filter_text(self, texto):
+        """Mantém só as linhas com texto em alguma coluna (vazio remove o filtro)"""
+        texto = texto.strip()
+        if texto == self.filtro:
+            return
+        if not texto:
+            self._mascara = None
+        elif self._mascara is not None and self.filtro.lower() in texto.lower():
+            # O texto só cresceu: basta testar as linhas que já passavam
+            candidatas = np.flatnonzero(self._mascara)
+            self._mascara = np.zeros(len(self.df), dtype=bool)
+            self._mascara[candidatas[self.contains_mask(texto, candidatas)]] = True
+        else:
+            self._mascara = self.contains_mask(texto)
+        self.filtro = texto
+        self.ordem = self._visible(self._permutacao)
+
+    def sort(self, column, descending=False):
+        """Ordena pela coluna (ausentes sempre no fim) reordenando só a permutação"""
+        valores = self.valores[column]
+        ausentes = self.ausentes[column]
+        presentes = np.flatnonzero(~ausentes)
+        serie = self.df.iloc[:, column]
+        if pd.api.types.is_numeric_dtype(serie.dtype):
+            # Inclui os inteiros anuláveis (Int64), que chegam aqui como object
+            chaves = serie.to_numpy(dtype='float64', na_value=np.nan)[presentes]
+        else:
+            chaves = valores[presentes]
+        if chaves.dtype == object:
+            # Colunas mistas/texto: compara como texto
+            chaves = chaves.astype(str)
+        ordem = presentes[np.argsort(chaves, kind='stable')]
+        if descending:
+            ordem = ordem[::-1]
+        self._permutacao = np.concatenate([ordem, np.flatnonzero(ausentes)])
+        self.ordem = self._visible(self._permutacao)
+
+    def contains_mask(self, texto, posicoes=None):
+        """Máscara das linhas com texto em alguma coluna (todas, ou só as de posicoes)"""
+        texto = texto.lower()
+        if posicoes is None:
+            posicoes = slice(None)
+            mascara = np.zeros(len(self.df), dtype=bool)
+        else:
+            mascara = np.zeros(len(posicoes), dtype=bool)
+        for j in range(len(self.valores)):
+            coluna = pd.Series(self.valores[j][posicoes]).astype(str).str.lower()
+            mascara |= coluna.str.contains(texto, regex=False).to_numpy() & ~self.ausentes[j][posicoes]
+        return mascara
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+
+from table_data import TableData
+
+class DataFrameModel(QAbstractTableModel):
+    """Modelo somente leitura sobre um DataFrame, sem um item Qt por célula.
+
+    As células são formatadas na hora em que a view pede (apenas as linhas
+    visíveis). Ordenação e filtro ficam no TableData (table_data.py), que só
+    troca o vetor de posições das linhas exibidas; aqui apenas se avisa a view.
+    """
+
+    def __init__(self, df=None, headers=None, missing_text='', float_format=None, parent=None):
+        super().__init__(parent)
+        self.missing_text = missing_text
+        self.float_format = float_format
+        self._dados = TableData()
+        self.set_frame(pd.DataFrame() if df is None else df, headers)
+
+    @property
+    def df(self):
+        return self._dados.df
+
+    def set_frame(self, df, headers=None):
+        """Troca o DataFrame exibido (headers: nomes de exibição das colunas); o filtro atual é mantido"""
+        self.beginResetModel()
+        self._headers = list(headers) if headers is not None else [str(col) for col in df.columns]
+        self._dados.set_frame(df)
+        self.endResetModel()
+
+    def set_filter_text(self, texto):
+        """Exibe só as linhas com texto em alguma coluna (vazio remove o filtro)"""
+        if texto.strip() == self._dados.filtro:
+            return
+        self.beginResetModel()
+        self._dados.set_filter_text(texto)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._dados)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._dados.valores)
+
+    def source_row(self, row):
+        """Posição no DataFrame da linha exibida em row"""
+        return self._dados.source_row(row)
+
+    def _text(self, posicao, coluna):
+        if self._dados.ausentes[coluna][posicao]:
+            return self.missing_text
+        valor = self._dados.valores[coluna][posicao]
+        if self.float_format and isinstance(valor, (float, np.floating)):
+            return self.float_format.format(valor)
+        return str(valor)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        posicao = self._dados.ordem[index.row()]
+        coluna = index.column()
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._text(posicao, coluna)
+        if role == Qt.ForegroundRole and self._dados.ausentes[coluna][posicao] and self.missing_text:
+            return QColor(Qt.gray)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return str(section + 1)
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Ordena pela coluna (ausentes sempre no fim)"""
+        if column < 0 or column >= len(self._dados.valores):
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._dados.sort(column, descending=order == Qt.DescendingOrder)
+        self.layoutChanged.emit()
+
+    def contains_mask(self, texto, posicoes=None):
+        """Máscara das linhas com texto em alguma coluna (todas, ou só as de posicoes)"""
+        return self._dados.contains_mask(texto, posicoes)
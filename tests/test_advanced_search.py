@@ -0,0 +1,290 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from advanced_search import ArticleSearch, ResultSet, TitleIndex, parse_range
+from scimago_data import normalize_title
+
+TITULOS = [
+    'Redes neurais para busca em currículos',
+    'Busca de currículos com redes bayesianas',
+    'Análise de redes sociais acadêmicas',
+    'Redes redes redes: repetição no título',
+    'Métodos de busca em grafos',
+    'Currículos Lattes e produção científica',
+    'Produção científica em redes de colaboração',
+    'Busca',
+]
+
+
+def _tokens(titulo):
+    return normalize_title(titulo).split()
+
+
+def _termos(query):
+    """Termos da consulta como o TitleIndex os interpreta: [tokens, prefixo, frase]"""
+    return TitleIndex._parse(query)
+
+
+def _casa(titulo, query):
+    """Busca ingênua: cada termo (palavra, prefixo ou frase) conferido no título inteiro"""
+    tokens = _tokens(titulo)
+    texto = ' ' + ' '.join(tokens) + ' '
+    for palavras, prefixo, _ in _termos(query):
+        trecho = ' ' + ' '.join(palavras) + ('' if prefixo else ' ')
+        if trecho not in texto:
+            return False
+    return True
+
+
+def _bm25(titulos, query, k1=TitleIndex.k1, b=TitleIndex.b):
+    """Escores BM25 calculados título a título (prefixos expandidos pelo vocabulário)"""
+    docs = [_tokens(titulo) for titulo in titulos]
+    vocabulario = {token for doc in docs for token in doc}
+    termos = set()
+    for palavras, prefixo, _ in _termos(query):
+        termos.update(palavras[:-1])
+        if prefixo:
+            termos.update(t for t in vocabulario if t.startswith(palavras[-1]))
+        else:
+            termos.add(palavras[-1])
+    n_docs = len(docs)
+    media = sum(len(doc) for doc in docs) / n_docs
+    escores = []
+    for doc in docs:
+        escore = 0.0
+        for termo in termos:
+            df = sum(1 for d in docs if termo in d)
+            tf = doc.count(termo)
+            if not df or not tf:
+                continue
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            escore += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / media))
+        escores.append(escore)
+    return escores
+
+
+@pytest.mark.parametrize('query', [
+    'redes', 'redes busca', 'busca curr', 'curriculos', 'red*', '"redes neurais"',
+    '"producao cientifica" redes', '"busca em"', 'inexistente', 'redes "curric',
+])
+def test_title_search_igual_a_varredura(query):
+    index = TitleIndex(TITULOS)
+    esperado = [pos for pos, titulo in enumerate(TITULOS) if _casa(titulo, query)]
+    assert index.search(query).tolist() == esperado
+    assert index.estimate(query) >= len(esperado)
+
+
+def test_title_search_consulta_vazia_e_candidatos():
+    index = TitleIndex(TITULOS)
+    assert index.search('  ') is None
+    assert index.search('redes', candidatos=[1, 2, 4]).tolist() == [1, 2]
+
+
+@pytest.mark.parametrize('query', ['redes', 'busca curr', 'red', 'producao cientifica'])
+def test_rank_segue_bm25(query):
+    index = TitleIndex(TITULOS)
+    escores = _bm25(TITULOS, query)
+    encontrados = [pos for pos, titulo in enumerate(TITULOS) if _casa(titulo, query)]
+    # Empates mantêm a ordem das posições (como sorted estável)
+    esperado = sorted(encontrados, key=lambda pos: -escores[pos])
+
+    posicoes, valores = index.rank(query)
+    assert posicoes.tolist() == esperado
+    assert valores == pytest.approx([escores[pos] for pos in esperado])
+
+    posicoes, _ = index.rank(query, k=2)
+    assert posicoes.tolist() == esperado[:2]
+
+
+def test_title_index_incremental_igual_a_reconstrucao():
+    index = TitleIndex(TITULOS[:3])
+    index.add(TITULOS[3:])
+    index.remove([1, 4])
+    # Reconstrução só com os títulos restantes (posições renumeradas)
+    restantes = [pos for pos in range(len(TITULOS)) if pos not in (1, 4)]
+    novo = TitleIndex([TITULOS[pos] for pos in restantes])
+
+    assert index.vocabulary == novo.vocabulary
+    assert index.doc_count == novo.doc_count
+    assert index.avg_length == pytest.approx(novo.avg_length)
+    for query in ['redes', 'busca', 'curr', '"redes sociais"']:
+        assert index.search(query).tolist() == [restantes[pos] for pos in novo.search(query)]
+        posicoes, escores = index.rank(query)
+        posicoes_novo, escores_novo = novo.rank(query)
+        assert posicoes.tolist() == [restantes[pos] for pos in posicoes_novo]
+        assert escores == pytest.approx(escores_novo)
+
+
+def test_parse_range():
+    assert parse_range('') is None
+    assert parse_range(None) is None
+    assert parse_range('2020') == (2020.0, 2020.0)
+    assert parse_range('2018-2020') == (2018.0, 2020.0)
+    assert parse_range('1,5-') == (1.5, None)
+    assert parse_range('-10') == (None, 10.0)
+    with pytest.raises(ValueError):
+        parse_range('abc')
+    with pytest.raises(ValueError):
+        parse_range('2020-2018')
+
+
+def test_result_set_filtra_sem_copiar():
+    df = pd.DataFrame({'A': [10, 20, 30, 40], 'B': list('wxyz')})
+    resultado = ResultSet(df, [3, 1, 2], columns=['B'])
+    assert len(resultado) == 3 and resultado.total == 3
+    assert resultado.matches.tolist() == [1, 2, 3]
+    assert resultado.column('A').tolist() == [40, 20, 30]
+    filtrado = resultado.where(resultado.column('A') > 25)
+    assert filtrado.positions.tolist() == [3, 2]
+    assert resultado.intersect([2, 1]).positions.tolist() == [1, 2]
+    assert resultado.to_frame().columns.tolist() == ['B']
+    assert resultado.to_frame().index.tolist() == [3, 1, 2]
+    assert ResultSet(df, []).empty
+
+
+def _artigos(titulos, anos, issns, dois, sjrs):
+    return pd.DataFrame({'TITULO': titulos, 'ANO': anos, 'ISSN': issns, 'DOI': dois,
+                         'SCIMAGO_SJR': sjrs, 'SCIMAGO_H_index': [10.0 * s for s in sjrs]})
+
+
+def _curriculos():
+    return {
+        'A': _artigos(TITULOS[:3], [2019, 2020, 2021], ['0317-8471', '1234-5679', None],
+                      ['10.1/a1', 'https://doi.org/10.1/X', None], [0.5, 1.5, 2.5]),
+        'B': _artigos(TITULOS[3:5], [2020, 2022], ['03178471', '1234-5678'],
+                      ['doi:10.1/x', '10.1/b2'], [1.0, 3.0]),
+        'C': _artigos(TITULOS[5:], [2018, 2020, 2021], ['1234-5679', None, '0317-8471'],
+                      [None, '10.1/c2', '10.1/c3'], [0.2, 2.0, 1.2]),
+    }
+
+
+def _busca(curriculos):
+    search = ArticleSearch(None)
+    search.set_articles_data({cv: {'ARTIGOS-PUBLICADOS': df} for cv, df in curriculos.items()})
+    return search
+
+
+def _chaves(resultado):
+    if resultado is None:
+        return []
+    df = resultado.to_frame()
+    return sorted(zip(df['CURRICULO_ID'], df['TITULO']))
+
+
+CONSULTAS = [
+    {'title': 'redes'},
+    {'title': 'busca curr'},
+    {'title': '"redes sociais"'},
+    {'issn': '0317-8471'},
+    {'issn': '1234-5678'},  # dígito verificador errado: não casa com nada
+    {'doi': 'https://dx.doi.org/10.1/x'},
+    {'anos': (2020, None)},
+    {'anos': (2019, 2020), 'sjr': (1.0, None)},
+    {'title': 'redes', 'anos': (2020, 2021)},
+    {'h_index': (None, 15)},
+    {'title': 'busca', 'curriculos': ['A', 'C']},
+]
+
+
+@pytest.mark.parametrize('consulta', CONSULTAS)
+def test_query_igual_a_filtro_direto(consulta):
+    curriculos = _curriculos()
+    search = _busca(curriculos)
+    todos = pd.concat([df.assign(CURRICULO_ID=cv) for cv, df in curriculos.items()], ignore_index=True)
+    mascara = np.ones(len(todos), dtype=bool)
+    if 'title' in consulta:
+        mascara &= todos['TITULO'].map(lambda titulo: _casa(titulo, consulta['title'])).to_numpy()
+    if 'issn' in consulta:
+        chave = consulta['issn'].replace('-', '')
+        valido = chave == '03178471'
+        mascara &= valido & (todos['ISSN'].fillna('').str.replace('-', '') == chave).to_numpy()
+    if 'doi' in consulta:
+        mascara &= todos['DOI'].fillna('').str.lower().str.endswith('10.1/x').to_numpy()
+    for col, chave in [('ANO', 'anos'), ('SCIMAGO_SJR', 'sjr'), ('SCIMAGO_H_index', 'h_index')]:
+        if chave in consulta:
+            minimo, maximo = consulta[chave]
+            if minimo is not None:
+                mascara &= (todos[col] >= minimo).to_numpy()
+            if maximo is not None:
+                mascara &= (todos[col] <= maximo).to_numpy()
+    if 'curriculos' in consulta:
+        mascara &= todos['CURRICULO_ID'].isin(consulta['curriculos']).to_numpy()
+    esperado = sorted(zip(todos['CURRICULO_ID'][mascara], todos['TITULO'][mascara]))
+
+    resultado = search.query(**consulta)
+    assert _chaves(resultado) == esperado
+    if resultado is not None:
+        assert resultado.total == len(esperado)
+
+
+def test_query_within_e_limite():
+    search = _busca(_curriculos())
+    amplo = search.query(title='redes', ranked=False)
+    restrito = search.query(anos=(2021, None), within=amplo.matches)
+    assert _chaves(restrito) == _chaves(search.query(title='redes', anos=(2021, None)))
+
+    limitado = search.query(title='redes', limit=2)
+    assert len(limitado) == 2 and limitado.total == len(amplo)
+    assert set(limitado.positions) <= set(amplo.matches)
+
+
+def _equivalente_a_reconstrucao(search, curriculos):
+    nova = _busca(curriculos)
+    for consulta in CONSULTAS + [{}]:
+        if 'curriculos' in consulta:
+            consulta = dict(consulta, curriculos=[cv for cv in consulta['curriculos'] if cv in curriculos])
+        assert _chaves(search.query(**consulta)) == _chaves(nova.query(**consulta)), consulta
+    for campo, valor in [('title', 'redes'), ('issn', '0317-8471'), ('doi', '10.1/X'), ('year', '2020')]:
+        assert (_chaves(search.search_by_criteria(valor, campo)) ==
+                _chaves(nova.search_by_criteria(valor, campo))), campo
+    assert _chaves(search.all_results()) == _chaves(nova.all_results())
+
+
+def test_add_remove_replace_igual_a_reconstrucao():
+    curriculos = _curriculos()
+    search = _busca({'A': curriculos['A']})
+    versao = search.version
+
+    search.add_curriculo('B', curriculos['B'])
+    search.add_curriculo('C', curriculos['C'])
+    assert search.version > versao
+    _equivalente_a_reconstrucao(search, curriculos)
+
+    novo_c = _artigos(['Redes complexas', 'Busca local'], [2023, 2023], ['0317-8471', None],
+                      ['10.1/n1', None], [0.9, 0.1])
+    search.replace_curriculo('C', novo_c)
+    curriculos['C'] = novo_c
+    _equivalente_a_reconstrucao(search, curriculos)
+
+    search.remove_curriculo('A')
+    del curriculos['A']
+    _equivalente_a_reconstrucao(search, curriculos)
+
+
+def test_mascara_de_ativos_apos_remocao():
+    curriculos = _curriculos()
+    search = _busca(curriculos)
+    posicoes_b = search._posicoes['B'].copy()
+    n_linhas = len(search.all_articles)
+
+    search.remove_curriculo('B')
+    # Poucas linhas removidas: ficam inativas no lugar, sem reconstrução
+    assert len(search.all_articles) == n_linhas
+    assert np.flatnonzero(~search._ativos).tolist() == posicoes_b.tolist()
+    assert 'B' not in set(search.all_results().to_frame()['CURRICULO_ID'])
+
+    # Mais da metade das linhas inativas: reconstrói só com as ativas
+    search.remove_curriculo('C')
+    assert search._ativos.all()
+    assert set(search.all_articles['CURRICULO_ID']) == {'A'}
+    _equivalente_a_reconstrucao(search, {'A': curriculos['A']})
+
+
+def test_find_duplicates_entre_curriculos():
+    search = _busca(_curriculos())
+    duplicados = search.find_duplicates('doi')
+    assert set(duplicados['CHAVE']) == {'10.1/x'}
+    assert sorted(duplicados['CURRICULO_ID']) == ['A', 'B']
@@ -0,0 +1,235 @@
+import json
+import os
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scimago_data
+from scimago_data import (MatchCache, ScimagoData, TitleMatcher, category_mask, normalize_issn,
+                          normalize_title, snapshot_dir)
+
+# Periódicos por edição: (Sourceid, Title, Issn, SJR, quartil, H index, categorias)
+EDICOES = {
+    2020: [
+        (1, 'Journal of Testing', '03178471, 12345679', '1,5', 'Q2', 40, 'Testing (Q2); Software (Q3)'),
+        (2, 'Revista Brasileira de Exemplos', '00000019', '0,8', 'Q3', 12, 'Education (Q3)'),
+    ],
+    2022: [
+        (1, 'Journal of Testing', '03178471, 12345679', '2,5', 'Q1', 45, 'Testing (Q1); Software (Q2)'),
+        (3, 'Applied Synthetic Studies', '0000006X', '3,0', 'Q1', 70, 'Chemistry (Q1)'),
+    ],
+}
+
+
+def _gravar_edicao(pasta, ano, periodicos):
+    linhas = ['Sourceid;Title;Issn;SJR;SJR Best Quartile;H index;Total Docs. ({0});Total Refs.;'
+              'Total Cites (3years);Citable Docs. (3years);Cites / Doc. (2years);Ref. / Doc.;'
+              'Categories'.format(ano)]
+    for sourceid, titulo, issn, sjr, quartil, h_index, categorias in periodicos:
+        linhas.append(f'{sourceid};{titulo};"{issn}";{sjr};{quartil};{h_index};10;100;'
+                      f'50;9;"1,2";10;"{categorias}"')
+    arquivo = os.path.join(pasta, f'scimagojr {ano}.csv')
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(linhas) + '\n')
+    return arquivo
+
+
+@pytest.fixture
+def edicoes(tmp_path):
+    return [_gravar_edicao(str(tmp_path), ano, periodicos) for ano, periodicos in EDICOES.items()]
+
+
+def _artigos():
+    return pd.DataFrame({
+        'TITULO': ['a', 'b', 'c', 'd', 'e', 'f'],
+        'ISSN': ['0317-8471', None, None, '1234-5679', '9999-9999', None],
+        'REVISTA': [None, 'Revista Brasileira de Exemplos', 'Applied Synthetic Studes',
+                    None, 'Sem Correspondência Alguma', 'Journal of Testing'],
+        'ANO': pd.array([2021, 2022, 2020, None, 2022, 2023], dtype='Int64'),
+    })
+
+
+@pytest.mark.parametrize('valor, esperado', [
+    ('0317-8471', '03178471'),
+    (' 0317 8471 ', '03178471'),
+    ('0000-006x', '0000006X'),
+    (3178471, '03178471'),
+    (3178471.0, '03178471'),
+    ('0317-8472', None),
+    ('0317-847', None),
+    ('ABCD-EFGH', None),
+    ('', None),
+    (None, None),
+    (float('nan'), None),
+])
+def test_normalize_issn(valor, esperado):
+    assert normalize_issn(valor) == esperado
+
+
+def test_normalize_title():
+    assert normalize_title('  Revista  Brasileira de Ciências—Exatas ') == 'revista brasileira de ciencias exatas'
+    assert normalize_title(None) == ''
+
+
+TITULOS = [normalize_title(t) for t in [
+    'Journal of Testing', 'Journal of Software Testing', 'Revista Brasileira de Exemplos',
+    'Applied Synthetic Studies', 'Applied Synthetic Biology', 'Testing Letters',
+]]
+
+
+def _melhor_por_varredura(query, min_score):
+    """Título com maior SequenceMatcher.ratio >= min_score (o primeiro em caso de empate)"""
+    melhor, melhor_score = None, min_score
+    for titulo in TITULOS:
+        score = SequenceMatcher(None, titulo, query).ratio()
+        if score > melhor_score or (melhor is None and score >= melhor_score):
+            melhor, melhor_score = titulo, score
+    return melhor
+
+
+@pytest.mark.parametrize('query', [
+    'journal of testing', 'jornal of testing', 'journal of sofware testing',
+    'applied synthetic studes', 'applied synthetic biologie', 'testing leters',
+    'revista brasileira exemplos', 'completely unrelated',
+])
+@pytest.mark.parametrize('min_score', [0.85, 0.95, 0.6])
+def test_title_matcher_igual_a_varredura(query, min_score):
+    matcher = TitleMatcher(TITULOS)
+    assert matcher.best_match(query, min_score) == _melhor_por_varredura(query, min_score)
+
+
+def test_title_matcher_arrays_equivalentes():
+    matcher = TitleMatcher(TITULOS)
+    copia = TitleMatcher(TITULOS, arrays=matcher.to_arrays())
+    for query in ['jornal of testing', 'applied synthetic studes', 'nada']:
+        assert copia.best_match(query) == matcher.best_match(query)
+
+
+def test_match_cache_grava_e_invalida(tmp_path):
+    cache_file = str(tmp_path / 'cache.json')
+    cache = MatchCache(cache_file, 'v1')
+    cache.save()
+    # Sem alterações não há gravação
+    assert not os.path.exists(cache_file)
+
+    cache.set(MatchCache.key('journal', 0.85), 3)
+    cache.set(MatchCache.key('outro', 0.85), -1)
+    cache.save()
+    assert MatchCache(cache_file, 'v1').get(MatchCache.key('journal', 0.85)) == 3
+    assert MatchCache(cache_file, 'v1').get(MatchCache.key('outro', 0.85)) == -1
+    assert MatchCache(cache_file, 'v1').get(MatchCache.key('journal', 0.9)) is None
+    # Outra edição do Scimago descarta o cache
+    assert MatchCache(cache_file, 'v2').matches == {}
+
+    with open(cache_file, 'w') as f:
+        f.write('{corrompido')
+    assert MatchCache(cache_file, 'v1').matches == {}
+
+
+def test_load_editions_usa_edicao_mais_proxima(edicoes):
+    scimago = ScimagoData(edicoes, use_cache=False, use_snapshot=False)
+    assert scimago.years.tolist() == [2020, 2022]
+    # Uma linha por periódico, da edição mais recente em que aparece
+    assert sorted(scimago.scimago_df['Title']) == [
+        'Applied Synthetic Studies', 'Journal of Testing', 'Revista Brasileira de Exemplos']
+    testing = scimago.find_by_issn('1234-5679')
+    assert testing['SJR'] == 2.5
+
+    sjr = scimago_data.METRIC_COLUMNS.index('SJR')
+    pos = {titulo: i for i, titulo in enumerate(scimago.scimago_df['Title'])}
+    # Periódico presente nas duas edições
+    assert scimago.year_metrics[pos['Journal of Testing'], :, sjr].tolist() == [1.5, 2.5]
+    assert scimago.year_source[pos['Journal of Testing']].tolist() == [0, 1]
+    # Ausente em uma edição: métricas da outra
+    assert scimago.year_metrics[pos['Revista Brasileira de Exemplos'], :, sjr].tolist() == [0.8, 0.8]
+    assert scimago.year_source[pos['Revista Brasileira de Exemplos']].tolist() == [0, 0]
+    assert scimago.year_source[pos['Applied Synthetic Studies']].tolist() == [1, 1]
+    assert scimago.find_by_issn('0000-0019')['Title'] == 'Revista Brasileira de Exemplos'
+    # Linha extra: sem correspondência
+    assert np.isnan(scimago.year_metrics[-1]).all()
+    assert (scimago.year_source[-1] == -1).all()
+
+
+def test_edition_positions_empate_usa_a_mais_antiga(edicoes):
+    scimago = ScimagoData(edicoes, use_cache=False, use_snapshot=False)
+    assert scimago.edition_positions([2019, 2020, 2021, 2022, 2030, None, 'x']).tolist() == [0, 0, 0, 1, 1, 1, 1]
+
+
+def test_enrich_article_data(edicoes):
+    scimago = ScimagoData(edicoes, use_cache=False, use_snapshot=False)
+    artigos = scimago.enrich_article_data(_artigos())
+
+    assert artigos['SCIMAGO_SJR'].tolist()[:4] == [1.5, 0.8, 3.0, 2.5]
+    assert np.isnan(artigos['SCIMAGO_SJR'].iloc[4])
+    assert artigos['SCIMAGO_SJR'].iloc[5] == 2.5
+    assert artigos['SCIMAGO_Ano'].tolist()[:4] == [2020, 2020, 2022, 2022]
+    assert artigos['SCIMAGO_Ano'].isna().tolist()[4]
+    assert artigos['SCIMAGO_Quartile'].astype(object).tolist()[:4] == ['Q2', 'Q3', 'Q1', 'Q1']
+    assert artigos['SCIMAGO_Categories'].iloc[0] == 'Software; Testing'
+    assert category_mask(artigos['SCIMAGO_Categories'], 'soft').tolist() == [
+        True, False, False, True, False, True]
+
+
+def test_enrich_article_frames_igual_a_um_por_vez(edicoes):
+    scimago = ScimagoData(edicoes, use_snapshot=False)
+    artigos = _artigos()
+    frames = [artigos.iloc[:2].copy(), artigos.iloc[2:].copy(), artigos.iloc[:0].copy()]
+    scimago.enrich_article_frames(frames)
+    esperado = ScimagoData(edicoes, use_cache=False, use_snapshot=False).enrich_article_data(_artigos())
+
+    pd.testing.assert_frame_equal(pd.concat(frames[:2]), esperado)
+    # O lote grava o cache com a correspondência aproximada e a negativa
+    cache = MatchCache(scimago.match_cache.cache_file, scimago.match_cache.fingerprint)
+    assert cache.get(MatchCache.key('applied synthetic studes', 0.85)) is not None
+    assert cache.get(MatchCache.key('sem correspondencia alguma', 0.85)) == -1
+
+
+def test_snapshot_reaproveitado_e_invalidado(edicoes, monkeypatch):
+    original = ScimagoData(edicoes, use_cache=False)
+    esperado = original.enrich_article_data(_artigos())
+    meta_file = os.path.join(original.snapshot_path, 'meta.json')
+    assert os.path.exists(meta_file)
+
+    chamadas = []
+    load_editions = ScimagoData.load_editions
+    def contar(self):
+        chamadas.append(1)
+        load_editions(self)
+    monkeypatch.setattr(ScimagoData, 'load_editions', contar)
+
+    # Snapshot válido: nada é relido dos CSVs e o resultado é o mesmo
+    do_snapshot = ScimagoData(edicoes, use_cache=False)
+    assert chamadas == []
+    assert isinstance(do_snapshot.year_metrics, np.memmap)
+    pd.testing.assert_frame_equal(do_snapshot.enrich_article_data(_artigos()), esperado)
+
+    # Só a data mudou: o hash confirma e o meta.json é atualizado
+    stat = os.stat(edicoes[0])
+    os.utime(edicoes[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    ScimagoData(edicoes, use_cache=False)
+    assert chamadas == []
+    with open(meta_file) as f:
+        assert json.load(f)['sources'][0]['mtime'] == os.stat(edicoes[0]).st_mtime_ns
+
+    # Outra versão do formato: recriado
+    monkeypatch.setattr(scimago_data, 'SNAPSHOT_VERSION', scimago_data.SNAPSHOT_VERSION + 1)
+    ScimagoData(edicoes, use_cache=False)
+    assert chamadas == [1]
+    ScimagoData(edicoes, use_cache=False)
+    assert chamadas == [1]
+
+    # Conteúdo alterado: recriado com os novos valores
+    with open(edicoes[1], encoding='utf-8') as f:
+        conteudo = f.read()
+    with open(edicoes[1], 'w', encoding='utf-8') as f:
+        f.write(conteudo.replace(';2,5;', ';4,5;'))
+    atualizado = ScimagoData(edicoes, use_cache=False)
+    assert chamadas == [1, 1]
+    assert atualizado.find_by_issn('03178471')['SJR'] == 4.5
+
+
+def test_snapshot_dir_por_edicao(edicoes):
+    assert snapshot_dir(edicoes[0]).endswith('scimagojr 2020.snapshot')
+    assert ScimagoData(edicoes[0], use_cache=False).snapshot_path == snapshot_dir(edicoes[0])
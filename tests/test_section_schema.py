@@ -0,0 +1,88 @@
+import glob
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from section_schema import (ANO, ANO_COLUMNS, CATEGORIA, CATEGORICAL_COLUMNS, TEXTO, apply_schema,
+                            column_type, csv_dtypes, read_section_csv)
+
+
+def test_column_type():
+    assert column_type('ANO-INICIO') == ANO
+    assert column_type('UF') == CATEGORIA
+    assert column_type('ISSN') is str
+    assert csv_dtypes()['COLUNA-QUALQUER'] is str
+
+
+def test_apply_schema_converte_anos_e_categorias():
+    df = apply_schema(pd.DataFrame({
+        'ANO': ['2020', '2021.0', 'sem ano', None],
+        'NIVEL': ['MESTRADO', 'DOUTORADO', 'MESTRADO', None],
+        'ISSN': ['0012-3456', '00123456', None, '1'],
+        'SCIMAGO_SJR': [1.0, 2.0, 3.0, 4.0],
+    }))
+    assert str(df['ANO'].dtype) == ANO
+    # Ano inválido vira ausente em vez de falhar
+    assert df['ANO'].tolist()[:2] == [2020, 2021]
+    assert df['ANO'].isna().tolist()[2:] == [True, True]
+    assert str(df['NIVEL'].dtype) == CATEGORIA
+    assert sorted(df['NIVEL'].cat.categories) == ['DOUTORADO', 'MESTRADO']
+    # Texto e colunas fora do registro não mudam
+    assert df['ISSN'].tolist()[:2] == ['0012-3456', '00123456']
+    assert df['SCIMAGO_SJR'].dtype == 'float64'
+
+
+def test_apply_schema_idempotente():
+    df = apply_schema(pd.DataFrame({'ANO': ['2020'], 'UF': ['SP']}))
+    pd.testing.assert_frame_equal(apply_schema(df.copy()), df)
+
+
+def test_read_section_csv_tipado():
+    csv = 'ANO,UF,ISSN,CPF\n2020,SP,00123456,01234567890\n,RJ,,\n'
+    df = read_section_csv(io.StringIO(csv))
+    assert str(df['ANO'].dtype) == ANO
+    assert df['ANO'].tolist()[0] == 2020 and pd.isna(df['ANO'].iloc[1])
+    assert str(df['UF'].dtype) == CATEGORIA
+    # Sem inferência: zeros à esquerda mantidos
+    assert df['ISSN'].iloc[0] == '00123456'
+    assert df['CPF'].iloc[0] == '01234567890'
+
+
+def test_read_section_csv_ano_invalido_usa_fallback():
+    csv = 'ANO,NATUREZA,ISBN\n2020,COMPLETO,0123456789\nxxxx,RESUMO,0987654321\n'
+    df = read_section_csv(io.StringIO(csv))
+    assert str(df['ANO'].dtype) == ANO
+    assert df['ANO'].iloc[0] == 2020 and pd.isna(df['ANO'].iloc[1])
+    assert str(df['NATUREZA'].dtype) == CATEGORIA
+    assert df['ISBN'].tolist() == ['0123456789', '0987654321']
+
+
+ESPERADO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'esperado')
+
+
+def _csvs_exemplo():
+    return sorted(glob.glob(os.path.join(ESPERADO, '*.csv')))
+
+
+@pytest.mark.parametrize('csv_file', _csvs_exemplo(), ids=os.path.basename)
+def test_csvs_do_conversor_lidos_com_os_tipos_do_registro(csv_file):
+    df = read_section_csv(csv_file)
+    for col in df.columns:
+        # Coluna de ano nova no conversor precisa entrar em ANO_COLUMNS
+        if col.startswith('ANO'):
+            assert col in ANO_COLUMNS, col
+        dtype = column_type(col)
+        if dtype == TEXTO:
+            assert pd.api.types.is_string_dtype(df[col].dtype), col
+        else:
+            assert str(df[col].dtype) == dtype, col
+
+
+def test_colunas_do_registro_existem_no_conversor():
+    # Nomes que o conversor deixou de gravar não ficam esquecidos nas listas
+    colunas = set()
+    for csv_file in _csvs_exemplo():
+        colunas.update(pd.read_csv(csv_file, nrows=0).columns)
+    assert not set(ANO_COLUMNS + CATEGORICAL_COLUMNS) - colunas
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from table_data import TableData
+
+
+def _frame():
+    return pd.DataFrame({
+        'TITULO': ['Busca', None, 'ranking', 'Alfa', 'busca textual', 'Beta'],
+        'ANO': pd.array([2021, 2019, None, 2021, 2018, None], dtype='Int64'),
+        'SJR': [1.5, np.nan, 0.2, 10.0, 2.0, 0.2],
+        'REVISTA': ['Revista A', 'Revista B', 'Journal', None, 'Revista A', 'Journal'],
+    })
+
+
+def _exibidas(dados):
+    return [dados.source_row(i) for i in range(len(dados))]
+
+
+def _ordem_ingenua(df, coluna, descending=False):
+    """Ordenação de referência: presentes pelo valor (estável), ausentes no fim na ordem original"""
+    serie = df.iloc[:, coluna]
+    presentes = [i for i in range(len(df)) if not pd.isna(serie.iloc[i])]
+    ausentes = [i for i in range(len(df)) if pd.isna(serie.iloc[i])]
+    ordem = sorted(presentes, key=lambda i: serie.iloc[i])
+    if descending:
+        ordem.reverse()
+    return ordem + ausentes
+
+
+def _filtro_ingenuo(df, texto):
+    texto = texto.lower()
+    return [i for i in range(len(df))
+            if any(not pd.isna(v) and texto in str(v).lower() for v in df.iloc[i])]
+
+
+@pytest.mark.parametrize('coluna', range(4))
+@pytest.mark.parametrize('descending', [False, True])
+def test_sort_ausentes_no_fim(coluna, descending):
+    df = _frame()
+    dados = TableData(df)
+    dados.sort(coluna, descending)
+    assert _exibidas(dados) == _ordem_ingenua(df, coluna, descending)
+
+
+def test_sort_numerico_nao_compara_como_texto():
+    dados = TableData(pd.DataFrame({'N': pd.array([10, 9, None, 100], dtype='Int64'),
+                                    'F': [10.0, 9.0, 100.0, np.nan]}))
+    dados.sort(0)
+    assert _exibidas(dados) == [1, 0, 3, 2]
+    dados.sort(1, descending=True)
+    assert _exibidas(dados) == [2, 0, 1, 3]
+
+
+def test_sort_coluna_mista_compara_como_texto():
+    dados = TableData(pd.DataFrame({'X': [10, 'b', 9, None, 'a']}, dtype=object))
+    dados.sort(0)
+    assert _exibidas(dados) == [0, 2, 4, 1, 3]
+
+
+def test_contains_mask():
+    df = _frame()
+    dados = TableData(df)
+    # Ausentes não casam com 'nan'/'<NA>'
+    assert not dados.contains_mask('nan').any()
+    assert not dados.contains_mask('<na>').any()
+    assert dados.contains_mask('BUSCA').tolist() == [True, False, False, False, True, False]
+    assert dados.contains_mask('2021').tolist() == [True, False, False, True, False, False]
+    posicoes = np.array([4, 1, 0])
+    assert dados.contains_mask('revista a', posicoes).tolist() == [True, False, True]
+
+
+@pytest.mark.parametrize('textos', [
+    ['r', 're', 'rev', 'revista', 'revista a'],
+    ['b', 'bu', 'busca', 'busca t'],
+    ['busca', 'Busca', 'BUSCA textual'],
+    ['revista', 'vista', 'journal', 'j', ''],
+    ['0', '0.2', '2', '20', '2021'],
+])
+def test_filtro_incremental_igual_ao_completo(textos):
+    df = _frame()
+    dados = TableData(df)
+    for texto in textos:
+        dados.set_filter_text(texto)
+        assert _exibidas(dados) == _filtro_ingenuo(df, texto.strip()), texto
+        completo = TableData(df)
+        completo.set_filter_text(texto)
+        assert _exibidas(dados) == _exibidas(completo), texto
+
+
+def test_sort_e_filtro_combinados():
+    df = _frame()
+    dados = TableData(df)
+    dados.sort(2, descending=True)
+    dados.set_filter_text('revista')
+    esperado = [i for i in _ordem_ingenua(df, 2, True) if i in _filtro_ingenuo(df, 'revista')]
+    assert _exibidas(dados) == esperado
+
+    # Ordenar com filtro ativo mantém o filtro; remover o filtro mantém a ordem
+    dados.sort(1)
+    assert _exibidas(dados) == [i for i in _ordem_ingenua(df, 1) if i in _filtro_ingenuo(df, 'revista')]
+    dados.set_filter_text('  ')
+    assert _exibidas(dados) == _ordem_ingenua(df, 1)
+
+
+def test_set_frame_mantem_filtro_e_reinicia_ordem():
+    dados = TableData(_frame())
+    dados.set_filter_text('journal')
+    dados.sort(0)
+    novo = pd.DataFrame({'REVISTA': ['Journal X', 'Outra', 'journal y']})
+    dados.set_frame(novo)
+    assert dados.filtro == 'journal'
+    assert _exibidas(dados) == [0, 2]
+
+
+def test_frame_vazio():
+    dados = TableData()
+    assert len(dados) == 0
+    dados.set_filter_text('x')
+    assert len(dados) == 0
@@ -0,0 +1,143 @@
+import functools
+import glob
+import os
+import shutil
+
+import pytest
+
+import xml_to_csv_converter as conversor
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+XML_EXEMPLO = os.path.join(FIXTURES, 'curriculo_exemplo.xml')
+ESPERADO = os.path.join(FIXTURES, 'esperado')
+
+# Ano fixo para a janela de 5 anos dos artigos não depender da data da execução
+ANO_REFERENCIA = 2025
+
+
+@pytest.fixture
+def ano_fixo(monkeypatch):
+    extrator = functools.partial(conversor.extract_curriculo_data, ano_atual=ANO_REFERENCIA)
+    monkeypatch.setattr(conversor, 'extract_curriculo_data', extrator)
+
+
+@pytest.fixture
+def entrada(tmp_path):
+    """Pasta de entrada com uma cópia do XML de exemplo e pasta de saída vazia"""
+    input_dir = tmp_path / 'xml_input'
+    output_dir = tmp_path / 'csv_output'
+    input_dir.mkdir()
+    output_dir.mkdir()
+    xml_file = input_dir / 'curriculo_exemplo.xml'
+    shutil.copy(XML_EXEMPLO, xml_file)
+    return str(xml_file), str(output_dir)
+
+
+def _ler(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_extract_filtra_registros():
+    dados = conversor.extract_curriculo_data(XML_EXEMPLO, ano_atual=ANO_REFERENCIA)
+
+    # Formação em ordem de nível, sem cursos incompletos
+    assert [f['NIVEL'] for f in dados['FORMACAO-ACADEMICA']] == ['GRADUACAO', 'MESTRADO', 'DOUTORADO']
+    # Só vínculos ativos, só artigos dos últimos 5 anos, só áreas com nome
+    assert [a['TIPO-VINCULO'] for a in dados['ATUACOES-PROFISSIONAIS']] == ['SERVIDOR_PUBLICO']
+    assert [a['TITULO'] for a in dados['ARTIGOS-PUBLICADOS']] == ['Busca em currículos']
+    assert len(dados['AREAS-DE-ATUACAO']) == 1
+    # Setor de aplicação vem do avô da palavra-chave, quando ele o declara
+    assert dados['PALAVRAS-CHAVES'] == [
+        {'PALAVRA': 'Mineração de dados', 'SETOR': 'Educação'},
+        {'PALAVRA': 'Currículo Lattes', 'SETOR': None},
+    ]
+    # Valores vazios viram None e seções vazias não aparecem
+    assert dados['DADOS-GERAIS'][0]['EMAIL'] is None
+    assert 'ORIENTACOES-DOUTORADO' not in dados
+
+
+def test_convert_file_gera_csvs_esperados(ano_fixo, entrada):
+    xml_file, output_dir = entrada
+    resultado = conversor.convert_file(xml_file, output_dir)
+
+    assert resultado['erro'] is None
+    esperados = sorted(os.path.basename(p) for p in glob.glob(os.path.join(ESPERADO, '*.csv')))
+    assert sorted(resultado['secoes'].values()) == esperados
+    for csv_file in esperados:
+        assert _ler(os.path.join(output_dir, csv_file)) == _ler(os.path.join(ESPERADO, csv_file)), csv_file
+
+
+def test_convert_batch_converte_e_registra_manifesto(ano_fixo, entrada):
+    xml_file, output_dir = entrada
+    resumo = conversor.convert_batch([xml_file], output_dir, workers=1, incremental=True)
+
+    assert resumo['convertidos'] == 1
+    assert resumo['erros'] == {}
+    manifest = conversor.load_manifest(output_dir)
+    entrada_manifesto = manifest['curriculo_exemplo.xml']
+    assert entrada_manifesto['hash'] == conversor.file_hash(xml_file)
+    assert sorted(entrada_manifesto['secoes'].values()) == sorted(os.listdir(ESPERADO))
+
+
+def test_convert_batch_ignora_xml_sem_alteracao(ano_fixo, entrada, monkeypatch):
+    xml_file, output_dir = entrada
+    conversor.convert_batch([xml_file], output_dir, workers=1, incremental=True)
+
+    # Mesmo conteúdo com nova data: decide pelo hash e atualiza a assinatura
+    stat = os.stat(xml_file)
+    os.utime(xml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    resumo = conversor.convert_batch([xml_file], output_dir, workers=1, incremental=True)
+    assert resumo['ignorados'] == ['curriculo_exemplo.xml']
+    assert resumo['convertidos'] == 0
+    assert conversor.load_manifest(output_dir)['curriculo_exemplo.xml']['mtime'] == os.stat(xml_file).st_mtime_ns
+
+    # Na execução seguinte basta tamanho/data: o hash não é recalculado
+    def sem_hash(path):
+        raise AssertionError('hash recalculado para arquivo inalterado')
+    monkeypatch.setattr(conversor, 'file_hash', sem_hash)
+    resumo = conversor.convert_batch([xml_file], output_dir, workers=1, incremental=True)
+    assert resumo['ignorados'] == ['curriculo_exemplo.xml']
+
+
+def test_convert_batch_reconverte_xml_alterado(ano_fixo, entrada):
+    xml_file, output_dir = entrada
+    conversor.convert_batch([xml_file], output_dir, workers=1, incremental=True)
+
+    # Remove as orientações: o XML muda e os CSVs das seções sumidas são removidos
+    conteudo = _ler(xml_file)
+    inicio = conteudo.index('<OUTRA-PRODUCAO>')
+    fim = conteudo.index('</OUTRA-PRODUCAO>') + len('</OUTRA-PRODUCAO>')
+    with open(xml_file, 'w', encoding='utf-8') as f:
+        f.write(conteudo[:inicio] + conteudo[fim:])
+
+    resumo = conversor.convert_batch([xml_file], output_dir, workers=1, incremental=True)
+    assert resumo['convertidos'] == 1
+    assert sorted(resumo['removidos']) == ['curriculo_exemplo_ORIENTACOES-MESTRADO.csv',
+                                          'curriculo_exemplo_OUTRAS-ORIENTACOES.csv']
+    assert not os.path.exists(os.path.join(output_dir, 'curriculo_exemplo_ORIENTACOES-MESTRADO.csv'))
+
+
+def test_convert_batch_completo_grava_manifesto(ano_fixo, entrada, monkeypatch):
+    xml_file, output_dir = entrada
+    resumo = conversor.convert_batch([xml_file], output_dir, workers=1, incremental=False)
+    assert resumo['convertidos'] == 1
+    assert 'curriculo_exemplo.xml' in conversor.load_manifest(output_dir)
+
+    # A execução incremental seguinte aproveita o manifesto da conversão completa
+    monkeypatch.setattr(conversor, 'convert_file', None)
+    resumo = conversor.convert_batch([xml_file], output_dir, workers=1, incremental=True)
+    assert resumo['ignorados'] == ['curriculo_exemplo.xml']
+
+
+def test_refresh_store_retorna_csvs_com_erro(ano_fixo, entrada, tmp_path):
+    xml_file, output_dir = entrada
+    assert conversor.refresh_store(str(tmp_path), output_dir) is None
+
+    conversor.convert_batch([xml_file], output_dir, workers=1, incremental=True)
+    vazio = os.path.join(output_dir, 'outro_DADOS-GERAIS.csv')
+    open(vazio, 'w').close()
+    open(os.path.join(str(tmp_path), conversor.DB_FILE), 'w').close()
+
+    erros = conversor.refresh_store(str(tmp_path), output_dir)
+    assert list(erros) == [vazio]
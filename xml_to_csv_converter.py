@@ -3,6 +3,15 @@ import xml.etree.ElementTree as ET
 import pandas as pd
 import glob
 import shutil
+import argparse
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections import Counter, defaultdict
+from section_schema import apply_schema
+from curriculo_store import CurriculoStore, DB_FILE
+
+MANIFEST_FILE = 'manifest.json'
 
 def create_directories():
     # Cria diretórios para organização
@@ -16,6 +25,12 @@ def create_directories():
     
     return base_dir, input_dir, output_dir
 
+def parquet_output_dir(base_dir):
+    """Diretório dos datasets colunares (um arquivo Parquet por seção)"""
+    output_dir = os.path.join(base_dir, 'parquet_output')
+    os.makedirs(output_dir, exist_ok=True)
+    return output_dir
+
 def move_xml_files(base_dir, input_dir):
     # Move arquivos XML do diretório base para input_dir
     xml_files = glob.glob(os.path.join(base_dir, '*.xml'))
@@ -26,10 +41,194 @@ def move_xml_files(base_dir, input_dir):
             shutil.move(xml_file, destination)
             print(f'Movido: {filename} para pasta de entrada')
 
-def extract_curriculo_data(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
-    
+NIVEIS_FORMACAO = ['GRADUACAO', 'ESPECIALIZACAO', 'MESTRADO', 'DOUTORADO', 'POS-DOUTORADO']
+NIVEIS_ORIENTACAO = ['MESTRADO', 'DOUTORADO', 'POS-DOUTORADO']
+
+def clean_value(value):
+    if not value or value.lower() in ['', 'nan', 'none', 'nao_informado', 'nao informado']:
+        return None
+    return value
+
+def _extrair_artigo(artigo, ano_atual):
+    # Artigos Publicados - últimos 5 anos
+    dados = artigo.find('.//DADOS-BASICOS-DO-ARTIGO')
+    if dados is None:
+        return None
+    ano = clean_value(dados.get('ANO-DO-ARTIGO'))
+    if not ano or int(ano) < (ano_atual - 5):
+        return None
+    detalhes = artigo.find('.//DETALHAMENTO-DO-ARTIGO')
+    return {
+        'TITULO': clean_value(dados.get('TITULO-DO-ARTIGO')),
+        'ANO': ano,
+        'REVISTA': clean_value(detalhes.get('TITULO-DO-PERIODICO-OU-REVISTA')) if detalhes is not None else None,
+        'ISSN': clean_value(detalhes.get('ISSN')) if detalhes is not None else None,
+        'DOI': clean_value(dados.get('DOI')),
+        'IDIOMA': clean_value(dados.get('IDIOMA'))
+    }
+
+def _extrair_livro(livro, ano_atual):
+    dados = livro.find('.//DADOS-BASICOS-DO-LIVRO')
+    if dados is None:
+        return None
+    ano = clean_value(dados.get('ANO'))
+    if not ano:
+        return None
+    detalhes = livro.find('.//DETALHAMENTO-DO-LIVRO')
+    return {
+        'TITULO': clean_value(dados.get('TITULO-DO-LIVRO')),
+        'ANO': ano,
+        'EDITORA': clean_value(detalhes.get('NOME-DA-EDITORA')) if detalhes is not None else None,
+        'ISBN': clean_value(detalhes.get('ISBN')) if detalhes is not None else None,
+        'TIPO': clean_value(dados.get('TIPO'))
+    }
+
+def _extrair_capitulo(capitulo, ano_atual):
+    dados = capitulo.find('.//DADOS-BASICOS-DO-CAPITULO')
+    if dados is None:
+        return None
+    ano = clean_value(dados.get('ANO'))
+    if not ano:
+        return None
+    detalhes = capitulo.find('.//DETALHAMENTO-DO-CAPITULO')
+    return {
+        'TITULO-CAPITULO': clean_value(dados.get('TITULO-DO-CAPITULO-DO-LIVRO')),
+        'TITULO-LIVRO': clean_value(detalhes.get('TITULO-DO-LIVRO')) if detalhes is not None else None,
+        'ANO': ano,
+        'EDITORA': clean_value(detalhes.get('NOME-DA-EDITORA')) if detalhes is not None else None,
+        'ISBN': clean_value(detalhes.get('ISBN')) if detalhes is not None else None
+    }
+
+def _extrair_trabalho_evento(trabalho, ano_atual):
+    dados = trabalho.find('.//DADOS-BASICOS-DO-TRABALHO')
+    if dados is None:
+        return None
+    ano = clean_value(dados.get('ANO-DO-TRABALHO'))
+    if not ano:
+        return None
+    detalhes = trabalho.find('.//DETALHAMENTO-DO-TRABALHO')
+    return {
+        'TITULO': clean_value(dados.get('TITULO-DO-TRABALHO')),
+        'ANO': ano,
+        'EVENTO': clean_value(detalhes.get('NOME-DO-EVENTO')) if detalhes is not None else None,
+        'TIPO': clean_value(dados.get('NATUREZA')),
+        'PAIS': clean_value(dados.get('PAIS-DO-EVENTO'))
+    }
+
+def _extrair_software(software, ano_atual):
+    dados = software.find('.//DADOS-BASICOS-DO-SOFTWARE')
+    if dados is None:
+        return None
+    return {
+        'TITULO': clean_value(dados.get('TITULO-DO-SOFTWARE')),
+        'ANO': clean_value(dados.get('ANO')),
+        'SITUACAO': clean_value(software.find('.//DETALHAMENTO-DO-SOFTWARE').get('SITUACAO')),
+        'NATUREZA': clean_value(dados.get('NATUREZA'))
+    }
+
+def _extrair_patente(patente, ano_atual):
+    dados = patente.find('.//DADOS-BASICOS-DA-PATENTE')
+    if dados is None:
+        return None
+    return {
+        'TITULO': clean_value(dados.get('TITULO')),
+        'ANO': clean_value(dados.get('ANO-DESENVOLVIMENTO')),
+        'SITUACAO': clean_value(patente.find('.//DETALHAMENTO-DA-PATENTE').get('STATUS')),
+        'TIPO': clean_value(dados.get('TIPO'))
+    }
+
+def _extrair_produto(produto, ano_atual):
+    dados = produto.find('.//DADOS-BASICOS-DO-PRODUTO-TECNOLOGICO')
+    if dados is None:
+        return None
+    return {
+        'TITULO': clean_value(dados.get('TITULO-DO-PRODUTO')),
+        'ANO': clean_value(dados.get('ANO')),
+        'TIPO': clean_value(dados.get('TIPO')),
+        'SITUACAO': clean_value(produto.find('.//DETALHAMENTO-DO-PRODUTO-TECNOLOGICO').get('FINALIDADE'))
+    }
+
+def _extrair_trabalho_tecnico(trabalho, ano_atual):
+    dados = trabalho.find('.//DADOS-BASICOS-DO-TRABALHO-TECNICO')
+    if dados is None:
+        return None
+    return {
+        'TITULO': clean_value(dados.get('TITULO-DO-TRABALHO-TECNICO')),
+        'ANO': clean_value(dados.get('ANO')),
+        'TIPO': clean_value(dados.get('NATUREZA')),
+        'INSTITUICAO': clean_value(trabalho.find('.//DETALHAMENTO-DO-TRABALHO-TECNICO').get('INSTITUICAO'))
+    }
+
+def _extrair_demais_producao(producao, ano_atual):
+    dados = producao.find('.//DADOS-BASICOS-DE-OUTRA-PRODUCAO')
+    if dados is None:
+        return None
+    return {
+        'TITULO': clean_value(dados.get('TITULO')),
+        'ANO': clean_value(dados.get('ANO')),
+        'NATUREZA': clean_value(dados.get('NATUREZA')),
+        'TIPO': producao.tag
+    }
+
+def _extrair_orientacao(orientacao, ano_atual):
+    nivel = orientacao.tag
+    dados = orientacao.find(f'.//DADOS-BASICOS-DE-ORIENTACOES-CONCLUIDAS-PARA-{nivel}')
+    if dados is None:
+        return None
+    return {
+        'TITULO': clean_value(dados.get('TITULO')),
+        'ANO': clean_value(dados.get('ANO')),
+        'TIPO': clean_value(dados.get('NATUREZA')),
+        'ORIENTANDO': clean_value(orientacao.find(f'.//DETALHAMENTO-DE-ORIENTACOES-CONCLUIDAS-PARA-{nivel}').get('NOME-DO-ORIENTANDO'))
+    }
+
+def _extrair_outra_orientacao(orientacao, ano_atual):
+    dados = orientacao.find('.//DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS')
+    if dados is None:
+        return None
+    return {
+        'TITULO': clean_value(dados.get('TITULO')),
+        'ANO': clean_value(dados.get('ANO')),
+        'NATUREZA': clean_value(dados.get('NATUREZA')),
+        'ORIENTANDO': clean_value(orientacao.find('.//DETALHAMENTO-DE-OUTRAS-ORIENTACOES-CONCLUIDAS').get('NOME-DO-ORIENTANDO'))
+    }
+
+# Registros cuja subárvore precisa estar completa: processados no evento 'end'
+EXTRATORES_SUBARVORE = {
+    'ARTIGO-PUBLICADO': ('ARTIGOS-PUBLICADOS', _extrair_artigo),
+    'LIVRO-PUBLICADO-OU-ORGANIZADO': ('LIVROS-PUBLICADOS', _extrair_livro),
+    'CAPITULO-DE-LIVRO-PUBLICADO': ('CAPITULOS-LIVROS', _extrair_capitulo),
+    'TRABALHO-EM-EVENTOS': ('TRABALHOS-EVENTOS', _extrair_trabalho_evento),
+    'SOFTWARE': ('SOFTWARE', _extrair_software),
+    'PATENTE': ('PATENTES', _extrair_patente),
+    'PRODUTO-TECNOLOGICO': ('PRODUTOS-TECNOLOGICOS', _extrair_produto),
+    'TRABALHO-TECNICO': ('TRABALHOS-TECNICOS', _extrair_trabalho_tecnico),
+    'OUTRAS-ORIENTACOES-CONCLUIDAS': ('OUTRAS-ORIENTACOES', _extrair_outra_orientacao),
+}
+
+def _extratores_para(elem, parent, abertos):
+    """Retorna os extratores de subárvore aplicáveis a um elemento recém-aberto"""
+    extratores = []
+    if elem.tag in EXTRATORES_SUBARVORE:
+        extratores.append(EXTRATORES_SUBARVORE[elem.tag])
+    # Demais Produções Técnicas - filhos diretos, exceto TRABALHO-TECNICO (evita duplicação)
+    if (parent is not None and parent.tag == 'DEMAIS-TIPOS-DE-PRODUCAO-TECNICA'
+            and elem.tag != 'TRABALHO-TECNICO'):
+        extratores.append(('DEMAIS-PRODUCOES-TECNICAS', _extrair_demais_producao))
+    # Orientações concluídas por nível
+    if elem.tag in NIVEIS_ORIENTACAO and abertos['ORIENTACOES-CONCLUIDAS']:
+        extratores.append((f'ORIENTACOES-{elem.tag}', _extrair_orientacao))
+    return extratores
+
+def extract_curriculo_data(xml_file, ano_atual=None):
+    """Extrai os dados do currículo em uma única passada sobre o XML.
+
+    Usa iterparse com eventos 'start'/'end': registros definidos apenas por
+    atributos são lidos na abertura do elemento, os demais quando a subárvore
+    termina. Elementos já processados são descartados, de modo que o uso de
+    memória não cresce com o tamanho do arquivo. ano_atual (padrão: ano
+    corrente) define a janela de 5 anos dos artigos.
+    """
     curriculo_data = {
         'DADOS-GERAIS': [],
         'FORMACAO-ACADEMICA': [],
@@ -53,258 +252,140 @@ def extract_curriculo_data(xml_file):
         'PREMIOS-TITULOS': [],
         'PROJETOS-PESQUISA': []
     }
-    
-    def clean_value(value):
-        if not value or value.lower() in ['', 'nan', 'none', 'nao_informado', 'nao informado']:
-            return None
-        return value
-    
-    # Dados Gerais - apenas informações relevantes
-    dados_gerais = root.find('.//DADOS-GERAIS')
-    if (dados_gerais is not None):
-        dados_dict = {
-            'NOME-COMPLETO': clean_value(dados_gerais.get('NOME-COMPLETO')),
-            'CPF': clean_value(dados_gerais.get('NUMERO-DO-CPF')),
-            'PAIS-DE-NASCIMENTO': clean_value(dados_gerais.get('PAIS-DE-NASCIMENTO')),
-            'EMAIL': clean_value(dados_gerais.get('E-MAIL')),
-        }
-        
-        # Endereço profissional relevante
-        endereco = dados_gerais.find('.//ENDERECO-PROFISSIONAL')
-        if endereco is not None:
-            dados_dict.update({
-                'INSTITUICAO': clean_value(endereco.get('NOME-INSTITUICAO-EMPRESA')),
-                'CIDADE': clean_value(endereco.get('CIDADE')),
-                'UF': clean_value(endereco.get('UF'))
-            })
-        
-        curriculo_data['DADOS-GERAIS'].append(dados_dict)
-    
-    # Formação Acadêmica - apenas concluídos e em andamento
-    for nivel in ['GRADUACAO', 'ESPECIALIZACAO', 'MESTRADO', 'DOUTORADO', 'POS-DOUTORADO']:
-        for formacao in root.findall(f'.//FORMACAO-ACADEMICA-TITULACAO//{nivel}'):
-            status = clean_value(formacao.get('STATUS-DO-CURSO'))
-            if status in ['CONCLUIDO', 'EM_ANDAMENTO']:
-                form_dict = {
-                    'NIVEL': nivel,
-                    'CURSO': clean_value(formacao.get('NOME-CURSO')),
-                    'INSTITUICAO': clean_value(formacao.get('NOME-INSTITUICAO')),
-                    'ANO-INICIO': clean_value(formacao.get('ANO-DE-INICIO')),
-                    'ANO-CONCLUSAO': clean_value(formacao.get('ANO-DE-CONCLUSAO')),
-                    'STATUS': 'Concluído' if status == 'CONCLUIDO' else 'Em Andamento'
-                }
-                curriculo_data['FORMACAO-ACADEMICA'].append(form_dict)
-    
-    # Atuações Profissionais - apenas vínculos ativos
-    for atuacao in root.findall('.//ATUACAO-PROFISSIONAL'):
-        vinculos = atuacao.findall('.//VINCULO-PROFISSIONAL')
-        vinculos_ativos = []
-        
-        for vinculo in vinculos:
-            ano_fim = clean_value(vinculo.get('ANO-FIM'))
-            if not ano_fim:  # Vínculo atual
-                vinc_dict = {
-                    'INSTITUICAO': clean_value(atuacao.get('NOME-INSTITUICAO')),
-                    'TIPO-VINCULO': clean_value(vinculo.get('TIPO-DE-VINCULO')),
-                    'ANO-INICIO': clean_value(vinculo.get('ANO-INICIO')),
-                    'ENQUADRAMENTO': clean_value(vinculo.get('ENQUADRAMENTO-FUNCIONAL'))
-                }
-                vinculos_ativos.append(vinc_dict)
-        
-        if vinculos_ativos:
-            curriculo_data['ATUACOES-PROFISSIONAIS'].extend(vinculos_ativos)
-    
-    # Artigos Publicados - últimos 5 anos
-    ano_atual = pd.Timestamp.now().year
-    for artigo in root.findall('.//ARTIGO-PUBLICADO'):
-        dados = artigo.find('.//DADOS-BASICOS-DO-ARTIGO')
-        if dados is not None:
-            ano = clean_value(dados.get('ANO-DO-ARTIGO'))
-            if ano and int(ano) >= (ano_atual - 5):
-                detalhes = artigo.find('.//DETALHAMENTO-DO-ARTIGO')
-                art_dict = {
-                    'TITULO': clean_value(dados.get('TITULO-DO-ARTIGO')),
-                    'ANO': ano,
-                    'REVISTA': clean_value(detalhes.get('TITULO-DO-PERIODICO-OU-REVISTA')) if detalhes is not None else None,
-                    'ISSN': clean_value(detalhes.get('ISSN')) if detalhes is not None else None,
-                    'DOI': clean_value(dados.get('DOI')),
-                    'IDIOMA': clean_value(dados.get('IDIOMA'))
-                }
-                curriculo_data['ARTIGOS-PUBLICADOS'].append(art_dict)
-    
-    # Livros Publicados
-    for livro in root.findall('.//LIVRO-PUBLICADO-OU-ORGANIZADO'):
-        dados = livro.find('.//DADOS-BASICOS-DO-LIVRO')
-        if dados is not None:
-            ano = clean_value(dados.get('ANO'))
-            if ano:
-                detalhes = livro.find('.//DETALHAMENTO-DO-LIVRO')
-                livro_dict = {
-                    'TITULO': clean_value(dados.get('TITULO-DO-LIVRO')),
-                    'ANO': ano,
-                    'EDITORA': clean_value(detalhes.get('NOME-DA-EDITORA')) if detalhes is not None else None,
-                    'ISBN': clean_value(detalhes.get('ISBN')) if detalhes is not None else None,
-                    'TIPO': clean_value(dados.get('TIPO'))
-                }
-                curriculo_data['LIVROS-PUBLICADOS'].append(livro_dict)
-
-    # Capítulos de Livros
-    for capitulo in root.findall('.//CAPITULO-DE-LIVRO-PUBLICADO'):
-        dados = capitulo.find('.//DADOS-BASICOS-DO-CAPITULO')
-        if dados is not None:
-            ano = clean_value(dados.get('ANO'))
-            if ano:
-                detalhes = capitulo.find('.//DETALHAMENTO-DO-CAPITULO')
-                cap_dict = {
-                    'TITULO-CAPITULO': clean_value(dados.get('TITULO-DO-CAPITULO-DO-LIVRO')),
-                    'TITULO-LIVRO': clean_value(detalhes.get('TITULO-DO-LIVRO')) if detalhes is not None else None,
-                    'ANO': ano,
-                    'EDITORA': clean_value(detalhes.get('NOME-DA-EDITORA')) if detalhes is not None else None,
-                    'ISBN': clean_value(detalhes.get('ISBN')) if detalhes is not None else None
-                }
-                curriculo_data['CAPITULOS-LIVROS'].append(cap_dict)
-
-    # Trabalhos em Eventos
-    for trabalho in root.findall('.//TRABALHO-EM-EVENTOS'):
-        dados = trabalho.find('.//DADOS-BASICOS-DO-TRABALHO')
-        if dados is not None:
-            ano = clean_value(dados.get('ANO-DO-TRABALHO'))
-            if ano:
-                detalhes = trabalho.find('.//DETALHAMENTO-DO-TRABALHO')
-                trab_dict = {
-                    'TITULO': clean_value(dados.get('TITULO-DO-TRABALHO')),
-                    'ANO': ano,
-                    'EVENTO': clean_value(detalhes.get('NOME-DO-EVENTO')) if detalhes is not None else None,
-                    'TIPO': clean_value(dados.get('NATUREZA')),
-                    'PAIS': clean_value(dados.get('PAIS-DO-EVENTO'))
-                }
-                curriculo_data['TRABALHOS-EVENTOS'].append(trab_dict)
-
-    # Áreas de Atuação - apenas com área definida
-    for area in root.findall('.//AREA-DE-ATUACAO'):
-        if clean_value(area.get('NOME-DA-AREA')):
-            area_dict = {
-                'GRANDE-AREA': clean_value(area.get('NOME-GRANDE-AREA')),
-                'AREA': clean_value(area.get('NOME-DA-AREA')),
-                'SUBAREA': clean_value(area.get('NOME-DA-SUB-AREA')),
-                'ESPECIALIDADE': clean_value(area.get('NOME-DA-ESPECIALIDADE'))
-            }
-            curriculo_data['AREAS-DE-ATUACAO'].append(area_dict)
-    
-    # Extrair palavras-chaves
-    palavras = root.findall('.//PALAVRA-CHAVE')
-    for palavra in palavras:
-        palavra_dict = {
-            'PALAVRA': clean_value(palavra.get('TEXTO')),
-            'SETOR': clean_value(palavra.find('../..').get('SETOR-DE-APLICACAO'))
-        }
-        curriculo_data['PALAVRAS-CHAVES'].append(palavra_dict)
-
-    # Software
-    for software in root.findall('.//SOFTWARE'):
-        dados = software.find('.//DADOS-BASICOS-DO-SOFTWARE')
-        if dados is not None:
-            soft_dict = {
-                'TITULO': clean_value(dados.get('TITULO-DO-SOFTWARE')),
-                'ANO': clean_value(dados.get('ANO')),
-                'SITUACAO': clean_value(software.find('.//DETALHAMENTO-DO-SOFTWARE').get('SITUACAO')),
-                'NATUREZA': clean_value(dados.get('NATUREZA'))
-            }
-            curriculo_data['SOFTWARE'].append(soft_dict)
-
-    # Patentes
-    for patente in root.findall('.//PATENTE'):
-        dados = patente.find('.//DADOS-BASICOS-DA-PATENTE')
-        if dados is not None:
-            pat_dict = {
-                'TITULO': clean_value(dados.get('TITULO')),
-                'ANO': clean_value(dados.get('ANO-DESENVOLVIMENTO')),
-                'SITUACAO': clean_value(patente.find('.//DETALHAMENTO-DA-PATENTE').get('STATUS')),
-                'TIPO': clean_value(dados.get('TIPO'))
-            }
-            curriculo_data['PATENTES'].append(pat_dict)
-
-    # Produtos Tecnológicos
-    for produto in root.findall('.//PRODUTO-TECNOLOGICO'):
-        dados = produto.find('.//DADOS-BASICOS-DO-PRODUTO-TECNOLOGICO')
-        if dados is not None:
-            prod_dict = {
-                'TITULO': clean_value(dados.get('TITULO-DO-PRODUTO')),
-                'ANO': clean_value(dados.get('ANO')),
-                'TIPO': clean_value(dados.get('TIPO')),
-                'SITUACAO': clean_value(produto.find('.//DETALHAMENTO-DO-PRODUTO-TECNOLOGICO').get('FINALIDADE'))
-            }
-            curriculo_data['PRODUTOS-TECNOLOGICOS'].append(prod_dict)
-
-    # Trabalhos Técnicos
-    for trabalho in root.findall('.//TRABALHO-TECNICO'):
-        dados = trabalho.find('.//DADOS-BASICOS-DO-TRABALHO-TECNICO')
-        if dados is not None:
-            tec_dict = {
-                'TITULO': clean_value(dados.get('TITULO-DO-TRABALHO-TECNICO')),
-                'ANO': clean_value(dados.get('ANO')),
-                'TIPO': clean_value(dados.get('NATUREZA')),
-                'INSTITUICAO': clean_value(trabalho.find('.//DETALHAMENTO-DO-TRABALHO-TECNICO').get('INSTITUICAO'))
-            }
-            curriculo_data['TRABALHOS-TECNICOS'].append(tec_dict)
-
-    # Demais Produções Técnicas
-    for producao in root.findall('.//DEMAIS-TIPOS-DE-PRODUCAO-TECNICA/*'):
-        if producao.tag != 'TRABALHO-TECNICO':  # Evitar duplicação
-            dados = producao.find('.//DADOS-BASICOS-DE-OUTRA-PRODUCAO')
-            if dados is not None:
-                prod_dict = {
-                    'TITULO': clean_value(dados.get('TITULO')),
-                    'ANO': clean_value(dados.get('ANO')),
-                    'NATUREZA': clean_value(dados.get('NATUREZA')),
-                    'TIPO': producao.tag
-                }
-                curriculo_data['DEMAIS-PRODUCOES-TECNICAS'].append(prod_dict)
-
-    # Orientações
-    for nivel in ['MESTRADO', 'DOUTORADO', 'POS-DOUTORADO']:
-        for orientacao in root.findall(f'.//ORIENTACOES-CONCLUIDAS//{nivel}'):
-            dados = orientacao.find(f'.//DADOS-BASICOS-DE-ORIENTACOES-CONCLUIDAS-PARA-{nivel}')
-            if dados is not None:
-                ori_dict = {
-                    'TITULO': clean_value(dados.get('TITULO')),
-                    'ANO': clean_value(dados.get('ANO')),
-                    'TIPO': clean_value(dados.get('NATUREZA')),
-                    'ORIENTANDO': clean_value(orientacao.find(f'.//DETALHAMENTO-DE-ORIENTACOES-CONCLUIDAS-PARA-{nivel}').get('NOME-DO-ORIENTANDO'))
+
+    # Formação é agrupada por nível, na ordem de NIVEIS_FORMACAO
+    formacoes = {nivel: [] for nivel in NIVEIS_FORMACAO}
+    ano_atual = ano_atual or pd.Timestamp.now().year
+
+    pilha = []            # Elementos abertos (ancestrais do elemento atual)
+    pilha_extratores = [] # Extratores pendentes de cada elemento aberto
+    pendentes = 0         # Registros abertos que ainda precisam da subárvore
+    abertos = Counter()   # Contagem de tags abertas, para testes de ancestralidade
+    atuacoes = []         # ATUACAO-PROFISSIONAL abertas
+    dados_gerais = None
+    dados_gerais_aberto = False
+    endereco_lido = False
+
+    for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+        tag = elem.tag
+
+        if event == 'start':
+            parent = pilha[-1] if pilha else None
+            extratores = _extratores_para(elem, parent, abertos)
+            pilha.append(elem)
+            pilha_extratores.append(extratores)
+            abertos[tag] += 1
+            if extratores:
+                pendentes += 1
+
+            # Dados Gerais - apenas informações relevantes (primeira ocorrência)
+            if tag == 'DADOS-GERAIS' and dados_gerais is None:
+                dados_gerais = {
+                    'NOME-COMPLETO': clean_value(elem.get('NOME-COMPLETO')),
+                    'CPF': clean_value(elem.get('NUMERO-DO-CPF')),
+                    'PAIS-DE-NASCIMENTO': clean_value(elem.get('PAIS-DE-NASCIMENTO')),
+                    'EMAIL': clean_value(elem.get('E-MAIL')),
                 }
-                curriculo_data[f'ORIENTACOES-{nivel}'].append(ori_dict)
-
-    # Outras Orientações
-    for orientacao in root.findall('.//OUTRAS-ORIENTACOES-CONCLUIDAS'):
-        dados = orientacao.find('.//DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS')
-        if dados is not None:
-            ori_dict = {
-                'TITULO': clean_value(dados.get('TITULO')),
-                'ANO': clean_value(dados.get('ANO')),
-                'NATUREZA': clean_value(dados.get('NATUREZA')),
-                'ORIENTANDO': clean_value(orientacao.find('.//DETALHAMENTO-DE-OUTRAS-ORIENTACOES-CONCLUIDAS').get('NOME-DO-ORIENTANDO'))
-            }
-            curriculo_data['OUTRAS-ORIENTACOES'].append(ori_dict)
-
-    # Prêmios e Títulos
-    for premio in root.findall('.//PREMIO-TITULO'):
-        premio_dict = {
-            'TITULO': clean_value(premio.get('NOME-DO-PREMIO-OU-TITULO')),
-            'ANO': clean_value(premio.get('ANO-DA-PREMIACAO')),
-            'ENTIDADE': clean_value(premio.get('NOME-DA-ENTIDADE-PROMOTORA'))
-        }
-        curriculo_data['PREMIOS-TITULOS'].append(premio_dict)
-
-    # Projetos de Pesquisa
-    for projeto in root.findall('.//PROJETO-DE-PESQUISA'):
-        proj_dict = {
-            'TITULO': clean_value(projeto.get('NOME-DO-PROJETO')),
-            'ANO-INICIO': clean_value(projeto.get('ANO-INICIO')),
-            'ANO-FIM': clean_value(projeto.get('ANO-FIM')),
-            'SITUACAO': clean_value(projeto.get('SITUACAO')),
-            'NATUREZA': clean_value(projeto.get('NATUREZA'))
-        }
-        curriculo_data['PROJETOS-PESQUISA'].append(proj_dict)
+                curriculo_data['DADOS-GERAIS'].append(dados_gerais)
+                dados_gerais_aberto = True
+
+            # Endereço profissional relevante
+            elif tag == 'ENDERECO-PROFISSIONAL' and dados_gerais_aberto and not endereco_lido:
+                dados_gerais.update({
+                    'INSTITUICAO': clean_value(elem.get('NOME-INSTITUICAO-EMPRESA')),
+                    'CIDADE': clean_value(elem.get('CIDADE')),
+                    'UF': clean_value(elem.get('UF'))
+                })
+                endereco_lido = True
+
+            # Formação Acadêmica - apenas concluídos e em andamento
+            elif tag in formacoes and abertos['FORMACAO-ACADEMICA-TITULACAO']:
+                status = clean_value(elem.get('STATUS-DO-CURSO'))
+                if status in ['CONCLUIDO', 'EM_ANDAMENTO']:
+                    formacoes[tag].append({
+                        'NIVEL': tag,
+                        'CURSO': clean_value(elem.get('NOME-CURSO')),
+                        'INSTITUICAO': clean_value(elem.get('NOME-INSTITUICAO')),
+                        'ANO-INICIO': clean_value(elem.get('ANO-DE-INICIO')),
+                        'ANO-CONCLUSAO': clean_value(elem.get('ANO-DE-CONCLUSAO')),
+                        'STATUS': 'Concluído' if status == 'CONCLUIDO' else 'Em Andamento'
+                    })
+
+            elif tag == 'ATUACAO-PROFISSIONAL':
+                atuacoes.append(elem)
+
+            # Atuações Profissionais - apenas vínculos ativos
+            elif tag == 'VINCULO-PROFISSIONAL' and atuacoes:
+                if not clean_value(elem.get('ANO-FIM')):  # Vínculo atual
+                    curriculo_data['ATUACOES-PROFISSIONAIS'].append({
+                        'INSTITUICAO': clean_value(atuacoes[-1].get('NOME-INSTITUICAO')),
+                        'TIPO-VINCULO': clean_value(elem.get('TIPO-DE-VINCULO')),
+                        'ANO-INICIO': clean_value(elem.get('ANO-INICIO')),
+                        'ENQUADRAMENTO': clean_value(elem.get('ENQUADRAMENTO-FUNCIONAL'))
+                    })
+
+            # Áreas de Atuação - apenas com área definida
+            elif tag == 'AREA-DE-ATUACAO':
+                if clean_value(elem.get('NOME-DA-AREA')):
+                    curriculo_data['AREAS-DE-ATUACAO'].append({
+                        'GRANDE-AREA': clean_value(elem.get('NOME-GRANDE-AREA')),
+                        'AREA': clean_value(elem.get('NOME-DA-AREA')),
+                        'SUBAREA': clean_value(elem.get('NOME-DA-SUB-AREA')),
+                        'ESPECIALIDADE': clean_value(elem.get('NOME-DA-ESPECIALIDADE'))
+                    })
+
+            # Palavras-chave - setor vem do avô do elemento
+            elif tag == 'PALAVRA-CHAVE':
+                avo = pilha[-3] if len(pilha) >= 3 else None
+                curriculo_data['PALAVRAS-CHAVES'].append({
+                    'PALAVRA': clean_value(elem.get('TEXTO')),
+                    'SETOR': clean_value(avo.get('SETOR-DE-APLICACAO')) if avo is not None else None
+                })
+
+            # Prêmios e Títulos
+            elif tag == 'PREMIO-TITULO':
+                curriculo_data['PREMIOS-TITULOS'].append({
+                    'TITULO': clean_value(elem.get('NOME-DO-PREMIO-OU-TITULO')),
+                    'ANO': clean_value(elem.get('ANO-DA-PREMIACAO')),
+                    'ENTIDADE': clean_value(elem.get('NOME-DA-ENTIDADE-PROMOTORA'))
+                })
+
+            # Projetos de Pesquisa
+            elif tag == 'PROJETO-DE-PESQUISA':
+                curriculo_data['PROJETOS-PESQUISA'].append({
+                    'TITULO': clean_value(elem.get('NOME-DO-PROJETO')),
+                    'ANO-INICIO': clean_value(elem.get('ANO-INICIO')),
+                    'ANO-FIM': clean_value(elem.get('ANO-FIM')),
+                    'SITUACAO': clean_value(elem.get('SITUACAO')),
+                    'NATUREZA': clean_value(elem.get('NATUREZA'))
+                })
+            continue
+
+        # Evento 'end': a subárvore do elemento está completa
+        pilha.pop()
+        extratores = pilha_extratores.pop()
+        abertos[tag] -= 1
+
+        if tag == 'DADOS-GERAIS':
+            dados_gerais_aberto = False
+        elif tag == 'ATUACAO-PROFISSIONAL' and atuacoes:
+            atuacoes.pop()
+
+        if extratores:
+            pendentes -= 1
+            for secao, extrator in extratores:
+                registro = extrator(elem, ano_atual)
+                if registro is not None:
+                    curriculo_data[secao].append(registro)
+
+        # Sem registro aberto dependendo desta subárvore: liberar memória
+        if not pendentes:
+            elem.clear()
+            if pilha:
+                del pilha[-1][:]
+
+    for nivel in NIVEIS_FORMACAO:
+        curriculo_data['FORMACAO-ACADEMICA'].extend(formacoes[nivel])
 
     return {k: v for k, v in curriculo_data.items() if v}  # Remove seções vazias
 
@@ -330,15 +411,28 @@ def verify_data_completeness(curriculo_data):
     
     return report
 
-def xml_to_csv(xml_file, output_dir):
+def convert_file(xml_file, output_dir, formato='csv'):
+    """Converte um XML e retorna o resultado estruturado.
+
+    No formato 'csv' grava um CSV por seção; no formato 'parquet' os registros
+    são devolvidos em resultado['dados'] para serem agregados por seção.
+    """
+    resultado = {
+        'arquivo': os.path.basename(xml_file),
+        'relatorio': [],
+        'secoes': {},
+        'erro': None
+    }
     try:
         curriculo_data = extract_curriculo_data(xml_file)
         
         # Verificar completude dos dados
-        report = verify_data_completeness(curriculo_data)
-        print(f"\nRelatório de completude para {os.path.basename(xml_file)}:")
-        for line in report:
-            print(line)
+        resultado['relatorio'] = verify_data_completeness(curriculo_data)
+        
+        if formato == 'parquet':
+            resultado['dados'] = curriculo_data
+            resultado['secoes'] = {section: f'{section}.parquet' for section in curriculo_data}
+            return resultado
         
         # Criar e salvar DataFrames
         filename = os.path.splitext(os.path.basename(xml_file))[0]
@@ -347,12 +441,222 @@ def xml_to_csv(xml_file, output_dir):
                 df = pd.DataFrame(items)
                 csv_file = os.path.join(output_dir, f'{filename}_{section}.csv')
                 df.to_csv(csv_file, index=False, encoding='utf-8')
-                print(f'Convertido: {section} -> {os.path.basename(csv_file)}')
+                resultado['secoes'][section] = os.path.basename(csv_file)
     
     except Exception as e:
-        print(f'Erro ao converter {xml_file}: {str(e)}')
+        resultado['erro'] = str(e)
+    
+    return resultado
+
+def print_file_result(resultado):
+    """Imprime o relatório de completude e os arquivos gerados para um XML"""
+    if resultado['erro']:
+        print(f"Erro ao converter {resultado['arquivo']}: {resultado['erro']}")
+        return
+    
+    print(f"\nRelatório de completude para {resultado['arquivo']}:")
+    for line in resultado['relatorio']:
+        print(line)
+    for section, csv_file in resultado['secoes'].items():
+        print(f'Convertido: {section} -> {csv_file}')
+
+def xml_to_csv(xml_file, output_dir):
+    resultado = convert_file(xml_file, output_dir)
+    print_file_result(resultado)
+    return resultado
+
+def file_hash(path):
+    """Calcula o hash SHA-256 do conteúdo de um arquivo"""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def load_manifest(output_dir):
+    """Carrega o manifesto de conversões (XML -> hash e seções geradas)"""
+    manifest_file = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_file):
+        return {}
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f'Manifesto inválido, reconvertendo tudo: {e}')
+        return {}
+
+def save_manifest(output_dir, manifest):
+    """Grava o manifesto de forma atômica"""
+    manifest_file = os.path.join(output_dir, MANIFEST_FILE)
+    tmp_file = manifest_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_file, manifest_file)
 
-def main():
+def _file_signature(xml_file):
+    stat = os.stat(xml_file)
+    return stat.st_size, stat.st_mtime_ns
+
+def _is_unchanged(xml_file, entry, output_dir):
+    """Verifica se o XML não mudou desde a última conversão registrada"""
+    if not entry:
+        return False
+    # Todos os CSVs registrados precisam continuar existindo
+    for csv_file in entry.get('secoes', {}).values():
+        if not os.path.exists(os.path.join(output_dir, csv_file)):
+            return False
+    tamanho, mtime = _file_signature(xml_file)
+    if entry.get('tamanho') == tamanho and entry.get('mtime') == mtime:
+        return True
+    # Tamanho/data diferentes: o conteúdo decide
+    if entry.get('hash') != file_hash(xml_file):
+        return False
+    # Mesmo conteúdo: registra a nova assinatura para a próxima execução não recalcular o hash
+    entry['tamanho'], entry['mtime'] = tamanho, mtime
+    return True
+
+def _remove_csvs(output_dir, csv_files):
+    for csv_file in csv_files:
+        try:
+            os.remove(os.path.join(output_dir, csv_file))
+        except FileNotFoundError:
+            pass
+
+def convert_batch(xml_files, output_dir, workers=None, ordenado=True, incremental=False,
+                  formato='csv'):
+    """Converte vários XMLs em paralelo usando um pool de processos.
+
+    workers define o número de processos (padrão: número de núcleos; 1 converte
+    no processo atual). Com ordenado=True os resultados seguem a ordem alfabética
+    dos arquivos, independente da ordem de conclusão, para manter saídas estáveis.
+    Com incremental=True, XMLs cujo conteúdo não mudou desde a última execução
+    (segundo o manifesto em output_dir) são ignorados; sem ele todos são
+    reconvertidos. Em ambos os casos (formato 'csv') o manifesto é atualizado
+    e CSVs de seções que deixaram de existir são removidos. Com
+    formato='parquet' é gravado um dataset por tipo de seção em output_dir
+    (sempre reconstruído por completo).
+    """
+    xml_files = sorted(xml_files) if ordenado else list(xml_files)
+    workers = workers or os.cpu_count() or 1
+    
+    usa_manifesto = formato == 'csv'
+    incremental = incremental and usa_manifesto
+    manifest = load_manifest(output_dir) if usa_manifesto else {}
+    ignorados = []
+    if incremental:
+        pendentes = []
+        for xml_file in xml_files:
+            if _is_unchanged(xml_file, manifest.get(os.path.basename(xml_file)), output_dir):
+                ignorados.append(os.path.basename(xml_file))
+            else:
+                pendentes.append(xml_file)
+        xml_files = pendentes
+    
+    if workers == 1 or len(xml_files) <= 1:
+        resultados = [convert_file(xml_file, output_dir, formato) for xml_file in xml_files]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(xml_files))) as executor:
+            if ordenado:
+                resultados = list(executor.map(
+                    convert_file, xml_files,
+                    [output_dir] * len(xml_files), [formato] * len(xml_files)
+                ))
+            else:
+                futures = [executor.submit(convert_file, xml_file, output_dir, formato)
+                           for xml_file in xml_files]
+                resultados = [future.result() for future in as_completed(futures)]
+    
+    if formato == 'parquet':
+        write_parquet_datasets(resultados, output_dir)
+    
+    removidos = []
+    if usa_manifesto:
+        caminhos = {os.path.basename(xml_file): xml_file for xml_file in xml_files}
+        for resultado in resultados:
+            if resultado['erro']:
+                continue
+            xml_file = caminhos[resultado['arquivo']]
+            anterior = manifest.get(resultado['arquivo'], {}).get('secoes', {})
+            orfaos = [csv for secao, csv in anterior.items() if secao not in resultado['secoes']]
+            _remove_csvs(output_dir, orfaos)
+            removidos.extend(orfaos)
+            tamanho, mtime = _file_signature(xml_file)
+            manifest[resultado['arquivo']] = {
+                'hash': file_hash(xml_file),
+                'tamanho': tamanho,
+                'mtime': mtime,
+                'secoes': resultado['secoes']
+            }
+        
+        # XMLs que saíram da pasta de entrada levam seus CSVs junto
+        atuais = set(ignorados) | set(caminhos)
+        for arquivo in [a for a in manifest if a not in atuais]:
+            orfaos = list(manifest.pop(arquivo).get('secoes', {}).values())
+            _remove_csvs(output_dir, orfaos)
+            removidos.extend(orfaos)
+        
+        save_manifest(output_dir, manifest)
+    
+    return {
+        'total': len(resultados) + len(ignorados),
+        'convertidos': sum(1 for r in resultados if not r['erro']),
+        'ignorados': ignorados,
+        'removidos': removidos,
+        'erros': {r['arquivo']: r['erro'] for r in resultados if r['erro']},
+        'resultados': resultados
+    }
+
+def write_parquet_datasets(resultados, output_dir):
+    """Agrega os registros de todos os currículos e grava um Parquet por seção"""
+    por_secao = defaultdict(list)
+    for resultado in resultados:
+        curriculo_id = os.path.splitext(resultado['arquivo'])[0]
+        for section, items in resultado.pop('dados', {}).items():
+            por_secao[section].extend({'CURRICULO_ID': curriculo_id, **item} for item in items)
+    
+    gravados = set()
+    for section, rows in por_secao.items():
+        # Tipos do registro de seções (section_schema)
+        df = apply_schema(pd.DataFrame(rows))
+        df.to_parquet(os.path.join(output_dir, f'{section}.parquet'), index=False)
+        gravados.add(f'{section}.parquet')
+    
+    # Seções que não aparecem mais em nenhum currículo
+    for parquet_file in glob.glob(os.path.join(output_dir, '*.parquet')):
+        if os.path.basename(parquet_file) not in gravados:
+            os.remove(parquet_file)
+
+def refresh_store(base_dir, output_dir):
+    """Reimporta os CSVs no banco SQLite do visualizador, se ele existir.
+
+    Retorna {arquivo: erro} com os CSVs que não puderam ser importados,
+    ou None se não houver banco.
+    """
+    db_file = os.path.join(base_dir, DB_FILE)
+    if not os.path.exists(db_file):
+        return None
+    store = CurriculoStore(db_file)
+    try:
+        return store.ingest_csv_dir(output_dir)
+    finally:
+        store.close()
+
+def print_batch_summary(resumo):
+    """Imprime o resumo de uma conversão em lote"""
+    for resultado in resumo['resultados']:
+        print_file_result(resultado)
+    
+    print(f"\nResumo: {resumo['convertidos']} de {resumo['total']} arquivos convertidos")
+    if resumo['ignorados']:
+        print(f"{len(resumo['ignorados'])} arquivo(s) sem alterações desde a última conversão")
+    if resumo['removidos']:
+        print(f"{len(resumo['removidos'])} CSV(s) órfão(s) removido(s)")
+    if resumo['erros']:
+        print(f"{len(resumo['erros'])} arquivo(s) com erro:")
+        for arquivo, erro in resumo['erros'].items():
+            print(f'  {arquivo}: {erro}')
+
+def main(workers=None, ordenado=True, incremental=True, formato='csv'):
     # Cria e obtém os diretórios
     base_dir, input_dir, output_dir = create_directories()
     
@@ -366,12 +670,40 @@ def main():
         print("Nenhum arquivo XML encontrado na pasta de entrada!")
         return
     
-    # Converte cada arquivo
-    for xml_file in xml_files:
-        try:
-            xml_to_csv(xml_file, output_dir)
-        except Exception as e:
-            print(f'Erro ao converter {os.path.basename(xml_file)}: {str(e)}')
+    if formato == 'parquet':
+        output_dir = parquet_output_dir(base_dir)
+    
+    # Converte os arquivos em paralelo
+    try:
+        resumo = convert_batch(xml_files, output_dir, workers=workers, ordenado=ordenado,
+                               incremental=incremental, formato=formato)
+    except ImportError as e:
+        print(f'Formato {formato} indisponível (instale pyarrow): {e}')
+        return
+    print_batch_summary(resumo)
+    
+    # O banco SQLite tem prioridade sobre os CSVs no visualizador: mantém em dia
+    if formato == 'csv' and (resumo['convertidos'] or resumo['removidos']):
+        erros = refresh_store(base_dir, output_dir)
+        if erros is not None:
+            print(f'Banco {DB_FILE} atualizado com os novos CSVs')
+            if erros:
+                print(f'{len(erros)} CSV(s) não importado(s):')
+                for arquivo, erro in erros.items():
+                    print(f'  {os.path.basename(arquivo)}: {erro}')
+    return resumo
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Converte currículos Lattes (XML) em CSV')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Número de processos (padrão: número de núcleos)')
+    parser.add_argument('--sem-ordem', action='store_true',
+                        help='Não ordenar os resultados por nome de arquivo')
+    parser.add_argument('--completo', action='store_true',
+                        help='Reconverter todos os arquivos, ignorando o manifesto')
+    parser.add_argument('-f', '--formato', choices=['csv', 'parquet'], default='csv',
+                        help='csv: um arquivo por seção e currículo em csv_output/; '
+                             'parquet: um dataset por seção em parquet_output/')
+    args = parser.parse_args()
+    main(workers=args.workers, ordenado=not args.sem_ordem, incremental=not args.completo,
+         formato=args.formato)